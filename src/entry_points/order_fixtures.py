@@ -13,12 +13,22 @@ directory. It recursively processes each .json file in the input directory and
 its subdirectories, and sorts lists and dictionaries alphabetically and
 writes the sorted output to .json files to the corresponding locations in the
 output directory.
+
+Fixture files compressed by `fill --output-compression` (.json.gz or .json.zst
+files) are read directly, with the compression dictionaries of the input
+directory, and written uncompressed.
 """
 
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Union, cast
+from typing import Any, Dict, List, Optional, Union, cast
+
+from pytest_plugins.test_filler.fixture_compression import (
+    FixtureFileReader,
+    is_fixture_file,
+    uncompressed_name,
+)
 
 
 def recursive_sort(item: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
@@ -50,7 +60,9 @@ def recursive_sort(item: Union[Dict[str, Any], List[Any]]) -> Union[Dict[str, An
         return item
 
 
-def order_fixture(input_path: Path, output_path: Path) -> None:
+def order_fixture(
+    input_path: Path, output_path: Path, reader: Optional[FixtureFileReader] = None
+) -> None:
     """
     Sorts a .json fixture.
 
@@ -58,20 +70,25 @@ def order_fixture(input_path: Path, output_path: Path) -> None:
     to the output path.
 
     Args:
-        input_path: The Path object of the input .json file.
+        input_path: The Path object of the input .json file, which may be compressed.
         output_path: The Path object of the output .json file.
+        reader: The reader of compressed fixture files; by default, one using the
+            dictionaries of the input file's directory.
 
     Returns:
         None.
     """
-    with input_path.open("r") as f:
-        data = json.load(f)
+    if reader is None:
+        reader = FixtureFileReader(input_path.parent)
+    data = json.loads(reader.read(input_path))
     data = recursive_sort(data)
     with output_path.open("w") as f:
         json.dump(data, f, indent=4)
 
 
-def process_directory(input_dir: Path, output_dir: Path):
+def process_directory(
+    input_dir: Path, output_dir: Path, reader: Optional[FixtureFileReader] = None
+):
     """
     Process a directory.
 
@@ -82,17 +99,21 @@ def process_directory(input_dir: Path, output_dir: Path):
     Args:
         input_dir: The Path object of the input directory.
         output_dir: The Path object of the output directory.
+        reader: The reader of compressed fixture files; by default, one using the
+            dictionaries of the input directory.
 
     Returns:
         None.
     """
+    if reader is None:
+        reader = FixtureFileReader(input_dir)
     if not output_dir.exists():
         output_dir.mkdir(parents=True)
     for child in input_dir.iterdir():
         if child.is_dir():
-            process_directory(child, output_dir / child.name)
-        elif child.suffix == ".json":
-            order_fixture(child, output_dir / child.name)
+            process_directory(child, output_dir / child.name, reader)
+        elif is_fixture_file(child):
+            order_fixture(child, output_dir / uncompressed_name(child), reader)
 
 
 def main():
@@ -0,0 +1,186 @@
+"""
+CLI interface to benchmark transition tools by replaying the calls dumped by `fill`.
+
+example: Usage
+    ```
+    fill --evm-dump-dir=/tmp/evm-dump tests/cancun
+    t8n_replay -i /tmp/evm-dump --evm-bin evm --evm-bin evmone-t8n -n 8
+    # compare with the report of a previous run
+    t8n_replay -i /tmp/evm-dump --evm-bin evm -o after.json --baseline before.json
+    ```
+
+Every call found in the dump directory (a directory containing a `t8n.sh` script) is
+replayed, in parallel, against each of the given transition tools, one tool after the
+other. For each tool, the throughput (calls/sec), latency percentiles and the calls
+that failed or whose output differs from the dumped output are reported.
+
+Each tool is compared with the tool of the same `--evm-bin` in the `--baseline` report
+if one is given, else with the first tool; the command exits with a non-zero status if
+a tool regressed by more than `--threshold`.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from evm_transition_tool import TransitionTool
+from evm_transition_tool.json_codec import decode, encode
+from evm_transition_tool.replay import (
+    LATENCY_PERCENTILES,
+    DumpedCall,
+    find_dumped_calls,
+    find_regressions,
+    load_dumped_call,
+    replay_calls,
+    summarize_replay,
+)
+
+
+def benchmark_tool(
+    evm_bin: str, calls: List[DumpedCall], args: argparse.Namespace
+) -> Dict[str, Any]:
+    """
+    Replays the calls with the given tool and returns its report as JSON data.
+    """
+    t8n = TransitionTool.from_binary_path(binary_path=Path(evm_bin))
+    try:
+        if args.t8n_workers > 0:
+            t8n.start_workers(args.t8n_workers)
+        elif args.t8n_prefork > 0:
+            t8n.start_spawner(args.t8n_prefork)
+        replayed, elapsed = replay_calls(t8n, calls, workers=args.workers, repeat=args.repeat)
+        version = t8n.version()
+    finally:
+        t8n.shutdown()
+    return {
+        "version": version,
+        "summary": summarize_replay(replayed, elapsed),
+        "failures": {
+            str(call.path): call.error or call.mismatch
+            for call in replayed
+            if call.error is not None or call.mismatch is not None
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Prints the summary of each tool as a table, followed by the failures and regressions.
+    """
+    headers = ["calls", "errors", "mismatches", "calls/sec", "mean"] + [
+        f"p{q}" for q in LATENCY_PERCENTILES
+    ]
+    width = max(len(evm_bin) for evm_bin in report["tools"])
+    print(" " * width + "".join(f"{header:>12}" for header in headers))
+    for evm_bin, tool_report in report["tools"].items():
+        summary = tool_report["summary"]
+        latencies = [summary["latency"]["mean"]] + [
+            summary["latency"][f"p{q}"] for q in LATENCY_PERCENTILES
+        ]
+        print(
+            f"{evm_bin:<{width}}"
+            f"{summary['calls']:>12}{summary['errors']:>12}{summary['mismatches']:>12}"
+            f"{summary['calls_per_second']:>12.1f}"
+            + "".join(f"{latency * 1000:>10.2f}ms" for latency in latencies)
+        )
+    for evm_bin, tool_report in report["tools"].items():
+        for path, failure in list(tool_report["failures"].items())[:10]:
+            print(f"{evm_bin}: {path}: {failure.splitlines()[0] if failure else ''}")
+        if len(tool_report["failures"]) > 10:
+            print(f"{evm_bin}: ... {len(tool_report['failures']) - 10} more failures")
+    for evm_bin, regressions in report["regressions"].items():
+        for regression in regressions:
+            print(f"{evm_bin}: regression: {regression}")
+
+
+def main():
+    """
+    Main function.
+    """
+    parser = argparse.ArgumentParser(description="Replay dumped t8n calls to benchmark tools.")
+    parser.add_argument(
+        "--input",
+        "-i",
+        dest="dump_dir",
+        type=Path,
+        required=True,
+        help="The dump directory written by `fill --evm-dump-dir`",
+    )
+    parser.add_argument(
+        "--evm-bin",
+        action="append",
+        dest="evm_bins",
+        default=None,
+        help="A transition tool to benchmark, can be repeated (default: evm)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-n",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of calls replayed at the same time (default: the number of CPUs)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of times each call is replayed"
+    )
+    parser.add_argument(
+        "--t8n-workers",
+        type=int,
+        default=0,
+        help="Number of resident t8n worker processes per tool (see `fill --t8n-workers`)",
+    )
+    parser.add_argument(
+        "--t8n-prefork",
+        type=int,
+        default=0,
+        help="Number of pre-started t8n processes per tool (see `fill --t8n-prefork`)",
+    )
+    parser.add_argument("--output", "-o", type=Path, help="Write the JSON report to this file")
+    parser.add_argument(
+        "--baseline", type=Path, help="A previous JSON report to compare the tools with"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="Percentage by which throughput or latency must worsen to be a regression",
+    )
+    args = parser.parse_args()
+
+    calls = [load_dumped_call(path) for path in find_dumped_calls(args.dump_dir)]
+    if not calls:
+        sys.exit(f"No t8n calls found in {args.dump_dir}")
+    print(f"Replaying {len(calls)} t8n calls from {args.dump_dir}")
+
+    evm_bins = args.evm_bins or ["evm"]
+    report: Dict[str, Any] = {"tools": {}, "regressions": {}}
+    for evm_bin in evm_bins:
+        report["tools"][evm_bin] = benchmark_tool(evm_bin, calls, args)
+
+    if args.baseline is not None:
+        baseline = {
+            evm_bin: tool_report["summary"]
+            for evm_bin, tool_report in decode(args.baseline.read_bytes())["tools"].items()
+        }
+    else:
+        baseline = {evm_bin: report["tools"][evm_bins[0]]["summary"] for evm_bin in evm_bins[1:]}
+    for evm_bin, tool_report in report["tools"].items():
+        if evm_bin not in baseline:
+            continue
+        regressions = find_regressions(
+            tool_report["summary"], baseline[evm_bin], args.threshold / 100
+        )
+        if regressions:
+            report["regressions"][evm_bin] = regressions
+
+    print_report(report)
+    if args.output is not None:
+        args.output.write_bytes(encode(report, indent=4))
+    if report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
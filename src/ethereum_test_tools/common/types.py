@@ -761,6 +761,63 @@ class Alloc(dict, Mapping[Address, Account], SupportsJSON):
 
         return Alloc(merged)
 
+    def normalize(self) -> "Alloc":
+        """
+        Returns the allocation as it is stored in the state, i.e. as returned
+        by the transition tool: storage slots with a zero value are removed.
+        """
+        normalized: Dict[FixedSizeBytesConvertible, Account] = {}
+        for address, account in self.items():
+            account = Account.from_dict(account)
+            if account.storage is not None:
+                storage = (
+                    account.storage
+                    if isinstance(account.storage, Storage)
+                    else Storage(account.storage)
+                )
+                non_zero_storage = {k: v for k, v in storage.data.items() if v != 0}
+                if len(non_zero_storage) != len(storage.data):
+                    account = replace(account, storage=non_zero_storage or None)
+            normalized[address] = account
+        return Alloc(normalized)
+
+    def state_root(self) -> bytes:
+        """
+        Returns the root of the secure state trie of the allocation, computed
+        in-process instead of with the transition tool.
+        """
+        state_trie = HexaryTrie(db={})
+        with state_trie.squash_changes() as state_trie_batch:
+            for address, account in self.items():
+                account = Account.from_dict(account)
+                storage_trie = HexaryTrie(db={})
+                if account.storage is not None:
+                    storage = (
+                        account.storage
+                        if isinstance(account.storage, Storage)
+                        else Storage(account.storage)
+                    )
+                    with storage_trie.squash_changes() as storage_trie_batch:
+                        for key, value in storage.data.items():
+                            if value == 0:
+                                continue
+                            storage_trie_batch.set(
+                                keccak256((key % 2**256).to_bytes(32, "big")),
+                                eth_rlp.encode(Uint(value % 2**256)),
+                            )
+                state_trie_batch.set(
+                    keccak256(Address(address)),
+                    eth_rlp.encode(
+                        [
+                            Uint(Number(account.nonce or 0)),
+                            Uint(Number(account.balance or 0)),
+                            storage_trie.root_hash,
+                            keccak256(Bytes(account.code or b"")),
+                        ]
+                    ),
+                )
+        return state_trie.root_hash
+
     def __json__(self, encoder: JSONEncoder) -> Mapping[str, Any]:
         """
         Returns the JSON representation of the allocation.
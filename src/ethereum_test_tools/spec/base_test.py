@@ -1,11 +1,13 @@
 """
 Base test class and helper functions for Ethereum state and blockchain tests.
 """
+import hashlib
+import json
 from abc import abstractmethod
 from dataclasses import dataclass, field
 from itertools import count
 from os import path
-from typing import Any, Callable, Dict, Generator, Iterator, List, Mapping, Optional
+from typing import Any, Callable, Dict, Generator, Iterator, List, Mapping, Optional, Tuple
 
 from ethereum_test_forks import Fork
 from evm_transition_tool import TransitionTool
@@ -13,10 +15,14 @@ from evm_transition_tool import TransitionTool
 from ..common import (
     Account,
     Address,
+    Alloc,
+    Bytes,
     Environment,
     Fixture,
+    FixtureHeader,
     HiveFixture,
     Transaction,
+    to_json,
     withdrawals_root,
 )
 from ..common.conversions import to_hex
@@ -87,6 +93,23 @@ class BaseTestConfig:
     """
     Enable any hive-related properties that the output could contain.
     """
+    native_state_root: bool = False
+    """
+    Compute the genesis state root in-process instead of with the transition tool.
+    """
+    native_state_root_check_interval: int = 0
+    """
+    When `native_state_root` is enabled, also compute every n-th genesis state root
+    with the transition tool and check that both results match (0 disables the check).
+    """
+    native_state_root_counter: Iterator[int] = field(init=False, default_factory=count)
+    genesis_cache: Optional[Dict[str, Tuple[Alloc, Bytes, FixtureHeader]]] = None
+    """
+    Cache of `(alloc, genesis_rlp, genesis_header)` tuples shared by all the tests that
+    use this configuration, indexed by `BaseTest.genesis_cache_key`. Set to a dictionary
+    to enable genesis caching. The cached objects are shared and must not be modified.
+    """
+    genesis_cache_max_entries: int = 1024
 
 
 @dataclass(kw_only=True)
@@ -137,6 +160,79 @@ class BaseTest:
         """
         pass
 
+    def genesis_cache_key(self, fork: Fork, alloc: Alloc, env: Environment) -> Optional[str]:
+        """
+        Returns the key that identifies the genesis of this test in the genesis cache,
+        or None if genesis caching is disabled.
+        """
+        # Calls to t8n must be reproduced for the debug output, don't use the cache
+        if self.base_test_config.genesis_cache is None or self.t8n_dump_dir:
+            return None
+        canonical_genesis = json.dumps(
+            [self.__class__.__name__, fork.name(), to_json(alloc), to_json(env)],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical_genesis.encode()).hexdigest()
+
+    def get_cached_genesis(
+        self, cache_key: Optional[str]
+    ) -> Optional[Tuple[Alloc, Bytes, FixtureHeader]]:
+        """
+        Returns the genesis stored in the genesis cache for the given key, if any.
+        """
+        if cache_key is None or self.base_test_config.genesis_cache is None:
+            return None
+        return self.base_test_config.genesis_cache.get(cache_key)
+
+    def cache_genesis(
+        self, cache_key: Optional[str], genesis: Tuple[Alloc, Bytes, FixtureHeader]
+    ) -> None:
+        """
+        Stores the genesis in the genesis cache.
+        """
+        genesis_cache = self.base_test_config.genesis_cache
+        if cache_key is None or genesis_cache is None:
+            return
+        if len(genesis_cache) >= self.base_test_config.genesis_cache_max_entries:
+            del genesis_cache[next(iter(genesis_cache))]  # evict the oldest entry
+        genesis_cache[cache_key] = genesis
+
+    def calc_genesis_state_root(
+        self, t8n: TransitionTool, fork: Fork, alloc: Alloc
+    ) -> Tuple[Alloc, bytes]:
+        """
+        Returns the normalized genesis allocation and its state root, either
+        computed in-process or with the transition tool.
+        """
+        # Always consume a debug output path so the numbering of the dump directories
+        # does not depend on how the state root is calculated.
+        debug_output_path = self.get_next_transition_tool_output_path()
+        config = self.base_test_config
+        if not config.native_state_root:
+            new_alloc, state_root = t8n.calc_state_root(
+                alloc=to_json(alloc), fork=fork, debug_output_path=debug_output_path
+            )
+            return Alloc(new_alloc), state_root
+
+        normalized_alloc = alloc.normalize()
+        state_root = normalized_alloc.state_root()
+        check_interval = config.native_state_root_check_interval
+        if check_interval > 0 and next(config.native_state_root_counter) % check_interval == 0:
+            t8n_alloc, t8n_state_root = t8n.calc_state_root(
+                alloc=to_json(alloc), fork=fork, debug_output_path=debug_output_path
+            )
+            if t8n_state_root != state_root:
+                raise Exception(
+                    f"in-process genesis state root 0x{state_root.hex()} does not match "
+                    f"the transition tool's state root 0x{t8n_state_root.hex()}"
+                )
+            if to_json(Alloc(t8n_alloc)) != to_json(normalized_alloc):
+                raise Exception(
+                    "in-process normalized genesis alloc does not match the transition tool's"
+                )
+        return normalized_alloc, state_root
+
     def get_next_transition_tool_output_path(self) -> str:
         """
         Returns the path to the next transition tool output file.
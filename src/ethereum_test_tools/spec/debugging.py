@@ -2,12 +2,16 @@
 Test spec debugging tools.
 """
 import pprint
-from typing import Dict, List
+from typing import List
 
+from evm_transition_tool import TransactionTrace
 
-def print_traces(traces: List[List[List[Dict]]] | None):
+
+def print_traces(traces: List[List[TransactionTrace]] | None):
     """
     Print the traces from the transition tool for debugging.
+
+    The steps of each transaction are read from the trace store one at a time.
     """
     if traces is None:
         print("Traces not collected. Use `--traces` to see detailed execution information.")
@@ -22,3 +26,6 @@ def print_traces(traces: List[List[List[Dict]]] | None):
                 print(f"Step {exec_step}:")
                 pp.pprint(trace)
                 print()
+            if tx.dropped_steps:
+                print(f"{tx.dropped_steps} steps not retained (see `--trace-max-steps`).")
+                print()
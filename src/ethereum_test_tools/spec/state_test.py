@@ -80,11 +80,12 @@ class StateTest(BaseTest):
                 block_number=genesis_env.number, timestamp=Number(genesis_env.timestamp)
             )
         )
-        new_alloc, state_root = t8n.calc_state_root(
-            alloc=to_json(Alloc.merge(pre_alloc, Alloc(self.pre))),
-            fork=fork,
-            debug_output_path=self.get_next_transition_tool_output_path(),
-        )
+        alloc = Alloc.merge(pre_alloc, Alloc(self.pre))
+        genesis_cache_key = self.genesis_cache_key(fork, alloc, genesis_env)
+        if (cached_genesis := self.get_cached_genesis(genesis_cache_key)) is not None:
+            return cached_genesis
+
+        new_alloc, state_root = self.calc_genesis_state_root(t8n, fork, alloc)
         genesis = FixtureHeader(
             parent_hash=Hash(0),
             ommers_hash=Hash(EmptyOmmersRoot),
@@ -118,7 +119,8 @@ class StateTest(BaseTest):
             withdrawals=genesis_env.withdrawals,
         )
 
-        return Alloc(new_alloc), genesis_rlp, genesis
+        self.cache_genesis(genesis_cache_key, (new_alloc, genesis_rlp, genesis))
+        return new_alloc, genesis_rlp, genesis
 
     def generate_fixture_data(
         self, t8n: TransitionTool, fork: Fork, eips: Optional[List[int]] = None
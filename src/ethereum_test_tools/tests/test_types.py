@@ -9,6 +9,7 @@ import pytest
 from ..common import (
     AccessList,
     Account,
+    EmptyTrieRoot,
     EngineAPIError,
     Environment,
     Storage,
@@ -1264,3 +1265,72 @@ def test_withdrawals_root(withdrawals: List[Withdrawal], expected_root: bytes):
     Test that withdrawals_root returns the expected hash.
     """
     assert withdrawals_root(withdrawals) == expected_root
+
+
+@pytest.mark.parametrize(
+    ["alloc", "expected_root"],
+    [
+        pytest.param(Alloc({}), EmptyTrieRoot, id="empty-alloc"),
+        pytest.param(
+            Alloc(
+                {0x1000000000000000000000000000000000000000: Account(balance=0x0BA1A9CE0BA1A9CE)}
+            ),
+            bytes.fromhex("51e7c7508e76dca07fd93291ff557a1448c9042bab26f470e6ca89361865a4d3"),
+            id="balance-only",
+        ),
+        pytest.param(
+            Alloc(
+                {
+                    0x1000000000000000000000000000000000000000: Account(
+                        balance=0x0BA1A9CE0BA1A9CE, nonce=1, code="0x", storage={}
+                    )
+                }
+            ),
+            bytes.fromhex("37c2dedbdea6b3afd2d08fc23f9e60ecb603a746a08f22306e7d784bd49101de"),
+            id="nonce",
+        ),
+        pytest.param(
+            Alloc({0x1000000000000000000000000000000000000000: Account(storage={0x01: 0x01})}),
+            bytes.fromhex("096122e88929baecbc581866218b888609b6eb3586b589e38917a2b34e3b2c92"),
+            id="storage",
+        ),
+        pytest.param(
+            Alloc(
+                {
+                    0x1000000000000000000000000000000000000000: Account(
+                        storage={0x01: 0x01, 0x02: 0x00}
+                    )
+                }
+            ),
+            bytes.fromhex("096122e88929baecbc581866218b888609b6eb3586b589e38917a2b34e3b2c92"),
+            id="storage-with-zero-value",
+        ),
+    ],
+)
+def test_alloc_state_root(alloc: Alloc, expected_root: bytes):
+    """
+    Test that the in-process state root matches the one calculated by the t8n tool.
+    """
+    assert alloc.state_root() == expected_root
+
+
+def test_alloc_normalize():
+    """
+    Test that zero-valued storage slots are removed when normalizing an allocation.
+    """
+    alloc = Alloc(
+        {
+            0x01: Account(balance=1, storage={0x01: 0x01, 0x02: 0x00}),
+            0x02: Account(balance=1, storage={0x01: 0x00}),
+            0x03: Account(balance=1),
+        }
+    )
+    assert to_json(alloc.normalize()) == to_json(
+        Alloc(
+            {
+                0x01: Account(balance=1, storage={0x01: 0x01}),
+                0x02: Account(balance=1),
+                0x03: Account(balance=1),
+            }
+        )
+    )
@@ -3,14 +3,22 @@ Library of Python wrappers for the different implementations of transition tools
 """
 
 from .besu import BesuTransitionTool
+from .cache import TransitionToolCache
+from .differential import DifferentialTransitionTool, TransitionToolDivergence
 from .evmone import EvmOneTransitionTool
-from .execution_specs import ExecutionSpecsTransitionTool
+from .execution_specs import ExecutionSpecsInProcessTransitionTool, ExecutionSpecsTransitionTool
+from .file_utils import DebugDumpBuffer
 from .geth import GethTransitionTool
 from .nimbus import NimbusTransitionTool
+from .timing import TransitionToolCallTiming, TransitionToolTimingReport
+from .traces import ColumnarTrace, TraceFilter, TransactionTrace
 from .transition_tool import (
     FixtureFormats,
     TransitionTool,
+    TransitionToolInput,
     TransitionToolNotFoundInPath,
+    TransitionToolOutput,
+    TransitionToolWorkersNotSupported,
     UnknownTransitionTool,
 )
 
@@ -18,12 +26,25 @@ TransitionTool.set_default_tool(GethTransitionTool)
 
 __all__ = (
     "BesuTransitionTool",
+    "ColumnarTrace",
+    "DebugDumpBuffer",
+    "DifferentialTransitionTool",
     "EvmOneTransitionTool",
+    "ExecutionSpecsInProcessTransitionTool",
     "ExecutionSpecsTransitionTool",
     "FixtureFormats",
     "GethTransitionTool",
     "NimbusTransitionTool",
+    "TraceFilter",
+    "TransactionTrace",
     "TransitionTool",
+    "TransitionToolCache",
+    "TransitionToolCallTiming",
+    "TransitionToolDivergence",
+    "TransitionToolInput",
     "TransitionToolNotFoundInPath",
+    "TransitionToolOutput",
+    "TransitionToolTimingReport",
+    "TransitionToolWorkersNotSupported",
     "UnknownTransitionTool",
 )
@@ -2,52 +2,49 @@
 Hyperledger Besu Transition tool frontend.
 """
 
-import json
+import asyncio
+import queue
 import re
+import socket
 import subprocess
 import textwrap
+import threading
+from collections import deque
+from functools import partial
 from pathlib import Path
 from re import compile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import requests
 
 from ethereum_test_forks import Fork
 
-from .transition_tool import TransitionTool, dump_files_to_directory
+from . import json_codec
+from .file_utils import DUMP_COMPRESSION_SUFFIXES, decompress_command
+from .timing import record_payload, timed_phase
+from .transition_tool import TransitionTool
 
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-class BesuTransitionTool(TransitionTool):
+
+class BesuTransitionServer:
     """
-    Besu EvmTool Transition tool frontend wrapper class.
+    A Besu `t8n-server` process and the kept-alive HTTP session used to post requests to it.
     """
 
-    default_binary = Path("evm")
-    detect_binary_pattern = compile(r"^Hyperledger Besu evm .*$")
-
     binary: Path
-    cached_version: Optional[str] = None
-    trace: bool
     process: Optional[subprocess.Popen] = None
+    port: int
     server_url: str
+    session: requests.Session
+    output_lines: Deque[str]
 
-    def __init__(
-        self,
-        *,
-        binary: Optional[Path] = None,
-        trace: bool = False,
-    ):
-        super().__init__(binary=binary, trace=trace)
-        args = [str(self.binary), "t8n", "--help"]
-        try:
-            result = subprocess.run(args, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
-        except Exception as e:
-            raise Exception(f"Unexpected exception calling evm tool: {e}.")
-        self.help_string = result.stdout
+    def __init__(self, binary: Path):
+        self.binary = binary
+        self.output_lines = deque(maxlen=100)
+        self.start()
 
-    def start_server(self):
+    def start(self):
         """
         Starts the t8n-server process, extracts the port, and leaves it running for future re-use.
         """
@@ -68,15 +65,152 @@ class BesuTransitionTool(TransitionTool):
                 raise Exception("Failed starting Besu subprocess\n" + line)
             if "Transition server listening on" in line:
                 port = re.search("Transition server listening on ([0-9]+)", line).group(1)
+                self.port = int(port)
                 self.server_url = f"http://localhost:{port}/"
                 break
 
-    def shutdown(self):
+        # Keep draining the server output, a full pipe would block the server
+        threading.Thread(target=self._drain_output, args=(self.process,), daemon=True).start()
+        self.session = requests.Session()
+
+    def _drain_output(self, process: subprocess.Popen):
+        """
+        Reads the output of the server process, keeping the last lines for error reports.
+        """
+        assert process.stdout is not None
+        for line in process.stdout:
+            self.output_lines.append(line.decode(errors="replace"))
+
+    def is_healthy(self) -> bool:
         """
-        Stops the t8n-server process if it was started
+        Returns True if the server process is running and accepting connections.
+        """
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("localhost", self.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def stop(self):
+        """
+        Stops the server process and closes the HTTP session.
         """
         if self.process:
             self.process.kill()
+            self.process.wait()
+            self.process = None
+        self.session.close()
+
+    def restart(self):
+        """
+        Restarts a crashed or unresponsive server.
+        """
+        self.stop()
+        self.start()
+
+    def post(self, body: bytes, timeout: float) -> requests.Response:
+        """
+        Posts an encoded request to the server, restarting it and retrying once if the
+        server crashed or did not respond in time.
+        """
+        if self.process is None or self.process.poll() is not None:
+            self.restart()
+        try:
+            return self.session.post(
+                self.server_url, data=body, headers=JSON_HEADERS, timeout=timeout
+            )
+        except requests.exceptions.Timeout:
+            # A hung server still accepts connections, so it is restarted even if healthy
+            reason = f"did not respond within {timeout}s"
+        except requests.exceptions.ConnectionError:
+            if self.is_healthy():
+                raise
+            reason = "crashed"
+        server_output = "".join(self.output_lines)
+        self.restart()
+        try:
+            return self.session.post(
+                self.server_url, data=body, headers=JSON_HEADERS, timeout=timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise Exception(f"Besu t8n-server {reason}, last output:\n{server_output}") from e
+
+
+class BesuTransitionTool(TransitionTool):
+    """
+    Besu EvmTool Transition tool frontend wrapper class.
+    """
+
+    default_binary = Path("evm")
+    detect_binary_pattern = compile(r"^Hyperledger Besu evm .*$")
+
+    binary: Path
+    cached_version: Optional[str] = None
+    trace: bool
+    server_count: int = 1
+    server_timeout: float = 5
+    servers: List[BesuTransitionServer]
+    idle_servers: "queue.Queue[BesuTransitionServer]"
+    servers_lock: threading.Lock
+
+    def __init__(
+        self,
+        *,
+        binary: Optional[Path] = None,
+        trace: bool = False,
+    ):
+        super().__init__(binary=binary, trace=trace)
+        self.help_string = self.get_help_string(["t8n", "--help"])
+        self.servers = []
+        self.idle_servers = queue.Queue()
+        self.servers_lock = threading.Lock()
+
+    def start_server(self):
+        """
+        Starts the pool of `server_count` t8n-server processes.
+        """
+        with self.servers_lock:
+            if self.servers:
+                return
+            for _ in range(self.server_count):
+                server = BesuTransitionServer(self.binary)
+                self.servers.append(server)
+                self.idle_servers.put(server)
+
+    def stop_servers(self):
+        """
+        Stops all the t8n-server processes of the pool.
+        """
+        with self.servers_lock:
+            for server in self.servers:
+                server.stop()
+            self.servers = []
+            self.idle_servers = queue.Queue()
+
+    def shutdown(self):
+        """
+        Stops the t8n-server processes if they were started
+        """
+        self.stop_servers()
+        super().shutdown()
+
+    def start_workers(self, count: int = 1):
+        """
+        Besu is always evaluated via its resident `t8n-server`: start a pool of `count`
+        servers that serve concurrent requests.
+        """
+        self.stop_servers()
+        self.server_count = count
+        self.start_server()
+
+    def start_spawner(self, count: int = 1):
+        """
+        Besu is always evaluated via its resident `t8n-server`: there are no processes to
+        start ahead of the calls.
+        """
+        pass
 
     def evaluate(
         self,
@@ -90,9 +224,49 @@ class BesuTransitionTool(TransitionTool):
         debug_output_path: str = "",
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Executes `evm t8n` with the specified arguments.
+        Executes `evm t8n` with the specified arguments, using the results cache like the
+        other tools.
+        """
+        t8n_data = TransitionTool.TransitionToolData(
+            alloc=alloc,
+            txs=txs,
+            env=env,
+            fork_name="+".join([fork_name] + [str(eip) for eip in eips or []]),
+            chain_id=chain_id,
+            reward=reward,
+        )
+        return self._evaluate_cached(
+            t8n_data,
+            debug_output_path,
+            partial(
+                self._evaluate_server,
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                eips=eips,
+                debug_output_path=debug_output_path,
+            ),
+        )
+
+    def _evaluate_server(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        eips: Optional[List[int]],
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Posts the transition to one of the `t8n-server` processes.
         """
-        if not self.process:
+        if not self.servers:
             self.start_server()
 
         if eips is not None:
@@ -101,21 +275,39 @@ class BesuTransitionTool(TransitionTool):
         if self.trace:
             raise Exception("Besu `t8n-server` does not support tracing.")
 
-        input_json = {
-            "alloc": alloc,
-            "txs": txs,
-            "env": env,
-        }
-        state_json = {
-            "fork": fork_name,
-            "chainid": chain_id,
-            "reward": reward,
-        }
-
-        post_data = {"state": state_json, "input": input_json}
+        with timed_phase("serialize"):
+            input_json = {
+                "alloc": alloc,
+                "txs": txs,
+                "env": env,
+            }
+            state_json = {
+                "fork": fork_name,
+                "chainid": chain_id,
+                "reward": reward,
+            }
+            post_data = {"state": state_json, "input": input_json}
+            body = json_codec.encode(post_data)
+        record_payload(input_size=len(body))
 
-        if debug_output_path:
-            post_data_string = json.dumps(post_data, indent=4)
+        if debug_output_path and self.debug_dump_compression is not None:
+            suffix = DUMP_COMPRESSION_SUFFIXES[self.debug_dump_compression]
+            t8n_script = textwrap.dedent(
+                f"""\
+                #!/bin/bash
+                # Use $1 as t8n-server port if provided, else default to 3000
+                PORT=${{1:-3000}}
+                {decompress_command(self.debug_dump_compression)} \\
+                    {debug_output_path}/request.json{suffix} | \\
+                    curl http://localhost:${{PORT}}/ -X POST -H "Content-Type: application/json" \\
+                    --data-binary @-
+                """
+            )
+            self.dump_debug_files(
+                debug_output_path, {"request.json": post_data, "t8n.sh+x": t8n_script}
+            )
+        elif debug_output_path:
+            post_data_string = json_codec.encode(post_data, indent=4).decode()
             additional_indent = " " * 16  # for pretty indentation in t8n.sh
             indented_post_data_string = "{\n" + "\n".join(
                 additional_indent + line for line in post_data_string[1:].splitlines()
@@ -129,7 +321,7 @@ class BesuTransitionTool(TransitionTool):
                 --data '{indented_post_data_string}'
                 """  # noqa: E221
             )
-            dump_files_to_directory(
+            self.dump_debug_files(
                 debug_output_path,
                 {
                     "state.json": state_json,
@@ -140,19 +332,27 @@ class BesuTransitionTool(TransitionTool):
                 },
             )
 
-        response = requests.post(self.server_url, json=post_data, timeout=5)
+        with timed_phase("run"):
+            server = self.idle_servers.get()
+            try:
+                response = server.post(body, timeout=self.server_timeout)
+            finally:
+                self.idle_servers.put(server)
         response.raise_for_status()  # exception visible in pytest failure output
-        output = response.json()
+        record_payload(output_size=len(response.content))
+        with timed_phase("parse"):
+            output = json_codec.decode(response.content)
 
         if debug_output_path:
-            dump_files_to_directory(
-                debug_output_path,
-                {
-                    "response.txt": response.text,
-                    "status_code.txt": response.status_code,
-                    "time_elapsed_seconds.txt": response.elapsed.total_seconds(),
-                },
-            )
+            response_files: Dict[str, Any] = {
+                "status_code.txt": response.status_code,
+                "time_elapsed_seconds.txt": response.elapsed.total_seconds(),
+            }
+            if self.debug_dump_compression is None:
+                response_files["response.txt"] = response.text
+            else:
+                response_files["response.json"] = response.content
+            self.dump_debug_files(debug_output_path, response_files)
 
         if response.status_code != 200:
             raise Exception(
@@ -165,8 +365,9 @@ class BesuTransitionTool(TransitionTool):
                 f"{response.text}"
             )
 
-        if debug_output_path:
-            dump_files_to_directory(
+        # With compression, the output is only dumped as received from the server
+        if debug_output_path and self.debug_dump_compression is None:
+            self.dump_debug_files(
                 debug_output_path,
                 {
                     "output/alloc.json": output["alloc"],
@@ -177,6 +378,35 @@ class BesuTransitionTool(TransitionTool):
 
         return output["alloc"], output["result"]
 
+    async def evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Asynchronous variant of `evaluate`: posts the request to the `t8n-server` from
+        a thread.
+        """
+        async with self.async_semaphore():
+            return await asyncio.to_thread(
+                self.evaluate,
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                eips=eips,
+                debug_output_path=debug_output_path,
+            )
+
     def is_fork_supported(self, fork: Fork) -> bool:
         """
         Returns True if the fork is supported by the tool
@@ -0,0 +1,155 @@
+"""
+Content-addressed on-disk cache for transition tool results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from . import json_codec
+
+if TYPE_CHECKING:
+    from .transition_tool import TransitionTool
+
+DEFAULT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+"""
+Default maximum size of the cache directory in bytes (1 GiB).
+"""
+
+EVICTION_INTERVAL = 256
+"""
+Number of entries stored by a process between two size checks of the cache directory.
+"""
+
+
+class TransitionToolCache:
+    """
+    Stores the `(alloc, result)` output of `TransitionTool.evaluate` calls on disk,
+    keyed by a canonical hash of the evaluation inputs and the identity of the tool.
+
+    Entries are written atomically (temporary file + rename) so the same cache
+    directory can safely be shared by concurrent processes, e.g. xdist workers.
+    When the directory grows beyond `max_size` bytes, the least recently used
+    entries are evicted.
+    """
+
+    directory: Path
+    max_size: int
+    hits: int
+    misses: int
+    _tool_ids: Dict[int, str]
+    _puts_since_eviction: int
+
+    def __init__(self, directory: Path | str, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._tool_ids = {}
+        self._puts_since_eviction = 0
+
+    def tool_id(self, tool: "TransitionTool") -> str:
+        """
+        Returns a string identifying the tool: its class, version and binary contents.
+        """
+        if id(tool) not in self._tool_ids:
+            binary_hash = hashlib.sha256()
+            with open(tool.binary, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    binary_hash.update(chunk)
+            self._tool_ids[id(tool)] = "\n".join(
+                [tool.__class__.__name__, tool.version(), binary_hash.hexdigest()]
+            )
+        return self._tool_ids[id(tool)]
+
+    @staticmethod
+    def key(tool_id: str, **inputs: Any) -> str:
+        """
+        Returns the cache key of the given tool identity and evaluation inputs.
+        """
+        canonical_inputs = json_codec.encode(inputs, sort_keys=True, ensure_ascii=True)
+        return hashlib.sha256(f"{tool_id}\n".encode() + canonical_inputs).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        """
+        Returns the path of the cache entry for the given key.
+        """
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Returns the cached `(alloc, result)` for the given key, if any.
+        """
+        entry_path = self.entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = json_codec.decode(f.read())
+            os.utime(entry_path)  # mark as recently used
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing, evicted concurrently or (unexpectedly) corrupted.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["alloc"], entry["result"]
+
+    def put(self, key: str, alloc: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Stores the `(alloc, result)` for the given key.
+        """
+        entry_path = self.entry_path(key)
+        entry_path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.encode({"alloc": alloc, "result": result}))
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._puts_since_eviction += 1
+        if self._puts_since_eviction >= EVICTION_INTERVAL:
+            self.evict()
+
+    def size(self) -> int:
+        """
+        Returns the total size in bytes of the entries in the cache.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Returns `(last_use, size, path)` of all the entries in the cache.
+        """
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits in `max_size`.
+        """
+        self._puts_since_eviction = 0
+        entries = sorted(self._entries())
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # removed by another process
+            total_size -= size
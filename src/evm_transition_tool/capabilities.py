@@ -0,0 +1,100 @@
+"""
+Cache of the capabilities of transition tool binaries.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def binary_key(binary: Path | str) -> Optional[str]:
+    """
+    Returns the key identifying the current build of a binary: its resolved path,
+    modification time and size, or None if the binary cannot be inspected.
+    """
+    path = os.path.realpath(binary)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class TransitionToolCapabilityCache:
+    """
+    Stores what is learned by probing a transition tool binary, so the binary is
+    probed once instead of every time a tool is instantiated:
+
+    - `tool_class`: the name of the `TransitionTool` subclass detected for the binary.
+    - `version`: the output of `TransitionTool.version`.
+    - `help`: the output of the tool's help commands (from which the supported forks
+      are determined), keyed by the command-line arguments.
+
+    Entries are keyed by `binary_key`, so a rebuilt binary is probed again. The cache
+    contents are plain JSON data (see `dump` and `load`), e.g. to persist them in the
+    pytest cache or to send them to xdist workers.
+    """
+
+    entries: Dict[str, Dict[str, Any]]
+    lock: threading.Lock
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, binary: Path | str, capability: str) -> Any:
+        """
+        Returns the cached capability of the binary, or None.
+        """
+        key = binary_key(binary)
+        if key is None:
+            return None
+        with self.lock:
+            return self.entries.get(key, {}).get(capability)
+
+    def put(self, binary: Path | str, capability: str, value: Any) -> None:
+        """
+        Stores a capability of the binary.
+        """
+        key = binary_key(binary)
+        if key is None:
+            return
+        with self.lock:
+            self.entries.setdefault(key, {})[capability] = value
+
+    def get_help(self, binary: Path | str, args: str) -> Optional[str]:
+        """
+        Returns the cached output of the help command with the given arguments.
+        """
+        help_outputs = self.get(binary, "help")
+        return help_outputs.get(args) if help_outputs is not None else None
+
+    def put_help(self, binary: Path | str, args: str, output: str) -> None:
+        """
+        Stores the output of the help command with the given arguments.
+        """
+        key = binary_key(binary)
+        if key is None:
+            return
+        with self.lock:
+            self.entries.setdefault(key, {}).setdefault("help", {})[args] = output
+
+    def dump(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the contents of the cache as JSON data.
+        """
+        with self.lock:
+            return {key: dict(entry) for key, entry in self.entries.items()}
+
+    def load(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Adds the entries previously returned by `dump` to the cache.
+
+        Entries of binaries that no longer exist or have been rebuilt are dropped.
+        """
+        with self.lock:
+            for key, entry in entries.items():
+                path = key.rsplit(":", 2)[0]
+                if binary_key(path) == key:
+                    self.entries.setdefault(key, {}).update(entry)
@@ -0,0 +1,461 @@
+"""
+Differential evaluation of state transitions by several transition tools.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ethereum_test_forks import Fork
+
+from . import json_codec
+from .timing import timed_call
+from .traces import TransactionTrace
+from .transition_tool import FixtureFormats, TransitionTool, TransitionToolInput
+
+DIFFERENTIAL_RESULT_FIELDS = (
+    "stateRoot",
+    "txRoot",
+    "receiptsRoot",
+    "logsHash",
+    "logsBloom",
+    "currentDifficulty",
+    "gasUsed",
+    "currentBaseFee",
+    "withdrawalsRoot",
+    "blobGasUsed",
+    "currentExcessBlobGas",
+    "rejected",
+    "receipts",
+)
+"""
+Fields of the `result` output compared between tools: the fields used to build the
+fixtures, plus the rejected transactions and the receipts to locate the divergence.
+"""
+
+DIFFERENTIAL_RECEIPT_FIELDS = ("transactionHash", "status", "cumulativeGasUsed", "gasUsed")
+"""
+Fields of each receipt compared between tools.
+"""
+
+QUANTITY_FIELDS = frozenset(
+    [
+        "balance",
+        "nonce",
+        "storage",
+        "currentDifficulty",
+        "gasUsed",
+        "currentBaseFee",
+        "blobGasUsed",
+        "currentExcessBlobGas",
+        "status",
+        "cumulativeGasUsed",
+    ]
+)
+"""
+Fields whose hex values are numbers: leading zeros are not significant and zero is
+equivalent to the field being absent. The values of the other fields (code, hashes,
+bloom filters) are byte strings.
+"""
+
+
+class TransitionToolDivergence(Exception):
+    """
+    Raised when the outputs of two transition tools differ for the same inputs.
+    """
+
+    path: str
+    reference_tool: str
+    reference_value: Any
+    tool: str
+    value: Any
+    inputs: TransitionToolInput
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        reference_tool: str,
+        reference_value: Any,
+        tool: str,
+        value: Any,
+        inputs: TransitionToolInput,
+    ):
+        self.path = path
+        self.reference_tool = reference_tool
+        self.reference_value = reference_value
+        self.tool = tool
+        self.value = value
+        self.inputs = inputs
+        super().__init__(self.message())
+
+    def message(self) -> str:
+        """
+        Returns the description of the divergence, including the inputs that caused it.
+        """
+        inputs = {"alloc": self.inputs.alloc, "txs": self.inputs.txs, "env": self.inputs.env}
+        return (
+            f"Transition tools diverge at `{self.path}` (fork {self.inputs.fork_name}):\n"
+            f"  {self.reference_tool}: {self.reference_value!r}\n"
+            f"  {self.tool}: {self.value!r}\n"
+            f"Inputs:\n{json_codec.encode(inputs, indent=4).decode()}"
+        )
+
+
+def _is_empty(value: Any) -> bool:
+    """
+    Returns True if the value is equivalent to the field being absent.
+    """
+    if value is None or value == [] or value == {} or value == "":
+        return True
+    if isinstance(value, str) and value.startswith("0x"):
+        try:
+            return value == "0x" or int(value, 16) == 0
+        except ValueError:
+            return False
+    return value == 0
+
+
+def _normalize_bytes(value: Any) -> Any:
+    """
+    Returns the bytes of a hex byte string, an absent value being an empty byte string.
+    """
+    if value is None:
+        return b""
+    if isinstance(value, str) and value[:2].lower() == "0x":
+        try:
+            return bytes.fromhex(value[2:])
+        except ValueError:
+            pass
+    return value
+
+
+def _values_equal(key: str, a: Any, b: Any) -> bool:
+    """
+    Compares two leaf values, ignoring the differences in the encoding of numbers
+    between tools (hex case, leading zeros, integers instead of hex strings).
+
+    Only the values of `QUANTITY_FIELDS` are numbers, byte strings are compared exactly,
+    only ignoring the hex case: e.g. a `0x00` code differs from an empty code.
+    """
+    if key not in QUANTITY_FIELDS:
+        return _normalize_bytes(a) == _normalize_bytes(b)
+    if _is_empty(a) and _is_empty(b):
+        return True
+    if isinstance(a, str) and isinstance(b, str) and a.lower() == b.lower():
+        return True
+    try:
+        return (int(a, 16) if isinstance(a, str) else a) == (
+            int(b, 16) if isinstance(b, str) else b
+        )
+    except ValueError:
+        return a == b
+
+
+def _normalize_storage(storage: Optional[Dict[str, Any]]) -> Dict[int, Any]:
+    """
+    Returns the non-zero storage slots, keyed by their integer value.
+    """
+    return {int(k, 16): v for k, v in (storage or {}).items() if not _is_empty(v)}
+
+
+def _compare_fields(
+    path: str, a: Dict[str, Any], b: Dict[str, Any], keys: Optional[Tuple[str, ...]] = None
+) -> Optional[Tuple[str, Any, Any]]:
+    """
+    Returns the first differing field of two dictionaries as `(path, a_value, b_value)`.
+    """
+    if keys is None:
+        keys = tuple(sorted(set(a) | set(b)))
+    for key in keys:
+        a_value, b_value = a.get(key), b.get(key)
+        if isinstance(a_value, dict) and isinstance(b_value, dict):
+            divergence = _compare_fields(f"{path}.{key}", a_value, b_value)
+            if divergence is not None:
+                return divergence
+        elif not _values_equal(key, a_value, b_value):
+            return f"{path}.{key}", a_value, b_value
+    return None
+
+
+def compare_alloc(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[Tuple[str, Any, Any]]:
+    """
+    Returns the first difference between two post-states as `(path, a_value, b_value)`,
+    or None if they are equivalent.
+
+    Addresses and storage slots are compared case-insensitively, and absent fields,
+    accounts and storage slots are equivalent to zero or empty ones.
+    """
+    a = {address.lower(): account for address, account in a.items()}
+    b = {address.lower(): account for address, account in b.items()}
+    for address in sorted(set(a) | set(b)):
+        a_account, b_account = a.get(address) or {}, b.get(address) or {}
+        divergence = _compare_fields(
+            f"alloc.{address}",
+            {k: v for k, v in a_account.items() if k != "storage"},
+            {k: v for k, v in b_account.items() if k != "storage"},
+        )
+        if divergence is not None:
+            return divergence
+        a_storage = _normalize_storage(a_account.get("storage"))
+        b_storage = _normalize_storage(b_account.get("storage"))
+        for slot in sorted(set(a_storage) | set(b_storage)):
+            a_value, b_value = a_storage.get(slot), b_storage.get(slot)
+            if not _values_equal("storage", a_value, b_value):
+                return f"alloc.{address}.storage.{slot:#x}", a_value, b_value
+    return None
+
+
+def compare_result(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[Tuple[str, Any, Any]]:
+    """
+    Returns the first difference between two `result` outputs as `(path, a_value,
+    b_value)`, or None if they are equivalent.
+
+    Only the `DIFFERENTIAL_RESULT_FIELDS` are compared. Rejected transactions are
+    compared by index only, since the error messages are tool-specific.
+    """
+    for key in DIFFERENTIAL_RESULT_FIELDS:
+        a_value, b_value = a.get(key), b.get(key)
+        if key == "rejected":
+            a_rejected = sorted(r["index"] for r in a_value or [])
+            b_rejected = sorted(r["index"] for r in b_value or [])
+            if a_rejected != b_rejected:
+                return "result.rejected", a_rejected, b_rejected
+        elif key == "receipts":
+            a_receipts, b_receipts = a_value or [], b_value or []
+            if len(a_receipts) != len(b_receipts):
+                return "result.receipts", a_receipts, b_receipts
+            for i, (a_receipt, b_receipt) in enumerate(zip(a_receipts, b_receipts)):
+                divergence = _compare_fields(
+                    f"result.receipts.{i}", a_receipt, b_receipt, DIFFERENTIAL_RECEIPT_FIELDS
+                )
+                if divergence is not None:
+                    return divergence
+        elif not _values_equal(key, a_value, b_value):
+            return f"result.{key}", a_value, b_value
+    return None
+
+
+class DifferentialTransitionTool(TransitionTool):
+    """
+    Transition tool that evaluates each state transition with several tools and
+    verifies that their outputs are equivalent.
+
+    The output of the reference tool is returned (and used to build the fixtures); the
+    other tools run concurrently with it, and the first field of `alloc` or `result`
+    where one of them differs from the reference raises a `TransitionToolDivergence`
+    with the inputs of the transition. Filling once with all the tools replaces one
+    run per tool.
+
+    Traces, result caching and timings are those of the reference tool. The debug
+    output of the other tools is written to a subdirectory named after each tool.
+
+    This tool is never detected by `TransitionTool.from_binary_path`, it must be
+    instantiated explicitly (`fill --t8n-diff-bin`).
+    """
+
+    reference: TransitionTool
+    others: List[TransitionTool]
+    executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, *, reference: TransitionTool, others: List[TransitionTool]):
+        super().__init__(binary=reference.binary, trace=reference.trace)
+        self.reference = reference
+        self.others = others
+        self.executor = None
+
+    @classmethod
+    def detect_binary(cls, binary_output: str) -> bool:
+        """
+        The differential tool is only used when explicitly requested.
+        """
+        return False
+
+    @staticmethod
+    def tool_name(tool: TransitionTool, index: int) -> str:
+        """
+        Returns the name identifying a tool in divergence reports and debug output.
+        """
+        return f"{index}-{tool.__class__.__name__}"
+
+    def version(self) -> str:
+        """
+        Returns the versions of all the tools, reference first.
+        """
+        return "; ".join(tool.version() for tool in [self.reference] + self.others)
+
+    def is_fork_supported(self, fork: Fork) -> bool:
+        """
+        Returns True if the fork is supported by all the tools.
+        """
+        return all(tool.is_fork_supported(fork) for tool in [self.reference] + self.others)
+
+    def start_workers(self, count: int = 1):
+        """
+        Starts resident t8n workers for each of the tools.
+        """
+        for tool in [self.reference] + self.others:
+            tool.start_workers(count)
+
+    def start_spawner(self, count: int = 1):
+        """
+        Keeps pre-started processes for each of the tools.
+        """
+        for tool in [self.reference] + self.others:
+            tool.start_spawner(count)
+
+    def shutdown(self):
+        """
+        Shuts down all the tools.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        for tool in [self.reference] + self.others:
+            tool.shutdown()
+        super().shutdown()
+
+    def reset_traces(self):
+        """
+        Resets the traces of the reference tool.
+        """
+        self.reference.reset_traces()
+
+    def get_traces(self) -> List[List[TransactionTrace]] | None:
+        """
+        Returns the traces of the reference tool.
+        """
+        return self.reference.get_traces()
+
+    def evaluate(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Evaluates the state transition with all the tools and returns the output of the
+        reference tool, raising `TransitionToolDivergence` if another tool disagrees.
+        """
+        t8n_input = TransitionToolInput(
+            alloc=alloc,
+            txs=txs,
+            env=env,
+            fork_name=fork_name,
+            chain_id=chain_id,
+            reward=reward,
+            eips=eips,
+            debug_output_path=debug_output_path,
+        )
+        # Settings applied to this tool by the framework are those of the reference
+        self.reference.trace_filter = self.trace_filter
+        self.reference.trace_max_steps = self.trace_max_steps
+        self.reference.cache = self.cache
+        for tool in [self.reference] + self.others:
+            tool.debug_dump_compression = self.debug_dump_compression
+            tool.debug_dump_buffer = self.debug_dump_buffer
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=len(self.others), thread_name_prefix="t8n-differential"
+            )
+
+        with timed_call(self.timings, fork_name):
+            futures = []
+            for index, tool in enumerate(self.others, start=1):
+                tool_debug_output_path = ""
+                if debug_output_path:
+                    tool_debug_output_path = os.path.join(
+                        debug_output_path, self.tool_name(tool, index)
+                    )
+                    os.makedirs(tool_debug_output_path, exist_ok=True)
+                futures.append(
+                    self.executor.submit(
+                        tool.evaluate,
+                        alloc=alloc,
+                        txs=txs,
+                        env=env,
+                        fork_name=fork_name,
+                        chain_id=chain_id,
+                        reward=reward,
+                        eips=eips,
+                        debug_output_path=tool_debug_output_path,
+                    )
+                )
+            try:
+                output = self.reference.evaluate(
+                    alloc=alloc,
+                    txs=txs,
+                    env=env,
+                    fork_name=fork_name,
+                    chain_id=chain_id,
+                    reward=reward,
+                    eips=eips,
+                    debug_output_path=debug_output_path,
+                )
+            finally:
+                other_outputs = [future.exception() or future.result() for future in futures]
+
+        for index, (tool, other_output) in enumerate(zip(self.others, other_outputs), start=1):
+            if isinstance(other_output, BaseException):
+                raise Exception(
+                    f"Transition tool {self.tool_name(tool, index)} failed where "
+                    f"{self.tool_name(self.reference, 0)} succeeded: {other_output}"
+                ) from other_output
+            divergence = compare_alloc(output[0], other_output[0]) or compare_result(
+                output[1], other_output[1]
+            )
+            if divergence is not None:
+                path, reference_value, value = divergence
+                raise TransitionToolDivergence(
+                    path=path,
+                    reference_tool=self.tool_name(self.reference, 0),
+                    reference_value=reference_value,
+                    tool=self.tool_name(tool, index),
+                    value=value,
+                    inputs=t8n_input,
+                )
+        return output
+
+    async def evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Asynchronous variant of `evaluate`: runs the differential evaluation from a thread.
+        """
+        async with self.async_semaphore():
+            return await asyncio.to_thread(
+                self.evaluate,
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                eips=eips,
+                debug_output_path=debug_output_path,
+            )
+
+    def verify_fixture(
+        self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
+    ):
+        """
+        Verifies the fixture with the reference tool.
+        """
+        self.reference.verify_fixture(fixture_format, fixture_path, debug_output_path)
@@ -4,13 +4,23 @@ Ethereum Specs EVM Transition tool interface.
 https://github.com/ethereum/execution-specs
 """
 
+import asyncio
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
 from pathlib import Path
 from re import compile
-from typing import Optional
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
 
 from ethereum_test_forks import Constantinople, ConstantinopleFix, Fork
 
+from . import json_codec, worker
 from .geth import GethTransitionTool
+from .timing import record_payload, timed_phase
+from .transition_tool import TransitionToolWorkersNotSupported
 
 UNSUPPORTED_FORKS = (
     Constantinople,
@@ -99,3 +109,167 @@ class ExecutionSpecsTransitionTool(GethTransitionTool):
         Currently, ethereum-spec-evm provides no way to determine supported forks.
         """
         return fork not in UNSUPPORTED_FORKS
+
+    def interpreter_command(self) -> List[str]:
+        """
+        Returns the command of the Python interpreter that runs `ethereum-spec-evm`, read
+        from the shebang of the script, or the current interpreter if it has none.
+        """
+        with open(self.binary, "rb") as f:
+            first_line = f.readline(4096)
+        if first_line.startswith(b"#!"):
+            return shlex.split(first_line[2:].decode(errors="replace"))
+        return [sys.executable]
+
+    def t8n_worker_command(self) -> Optional[List[str]]:
+        """
+        The worker imports `ethereum_spec_tools` once, in the interpreter of
+        `ethereum-spec-evm`, and calls its t8n for each request (see
+        `evm_transition_tool.worker`). The module is run by path as it only depends on
+        the standard library.
+        """
+        return self.interpreter_command() + [worker.__file__, worker.EXECUTION_SPECS_FLAG]
+
+
+class ExecutionSpecsInProcessTransitionTool(ExecutionSpecsTransitionTool):
+    """
+    Ethereum Specs transition tool that runs the `ethereum-spec-evm t8n` logic
+    in the current Python process instead of starting the tool for every call.
+
+    The `ethereum` package is already a requirement of `execution-spec-tests`, so the
+    spec's t8n entry point is imported once and called directly; the fork modules it
+    loads stay imported between calls, which avoids paying the interpreter startup
+    and the import of the specs on each state transition. Inputs and outputs are
+    exchanged through in-memory buffers.
+
+    The spec's t8n keeps global state (e.g. its tracing hooks), so calls are
+    serialized by a process-wide lock.
+
+    This tool is never detected by `TransitionTool.from_binary_path`, it must be
+    instantiated explicitly (`fill --t8n-in-process`). The `ethereum-spec-evm` binary
+    is still used to report the tool's version and to reproduce debug output.
+    """
+
+    lock = threading.Lock()
+    evm_tools: ModuleType
+
+    def __init__(
+        self,
+        *,
+        binary: Optional[Path] = None,
+        trace: bool = False,
+    ):
+        super().__init__(binary=binary, trace=trace)
+        try:
+            from ethereum_spec_tools import evm_tools
+        except ImportError as e:
+            raise Exception(
+                "The in-process execution specs transition tool requires the "
+                "`ethereum_spec_tools` package provided by ethereum/execution-specs."
+            ) from e
+        self.evm_tools = evm_tools
+
+    @classmethod
+    def detect_binary(cls, binary_output: str) -> bool:
+        """
+        The in-process tool is only used when explicitly requested.
+        """
+        return False
+
+    def start_workers(self, count: int = 1):
+        """
+        The in-process tool does not start any processes.
+        """
+        raise TransitionToolWorkersNotSupported(
+            f"{self.__class__.__name__} runs in-process and does not support t8n worker "
+            "processes."
+        )
+
+    def start_spawner(self, count: int = 1):
+        """
+        The in-process tool does not start any processes.
+        """
+        raise Exception(
+            f"{self.__class__.__name__} runs in-process and does not support pre-started t8n "
+            "processes."
+        )
+
+    def run_in_process(self, args: List[str], stdin_bytes: bytes) -> subprocess.CompletedProcess:
+        """
+        Runs the spec's t8n with the given command-line arguments (without the binary) and
+        encoded input, returns the result as if the tool had been executed as a subprocess.
+        """
+        with self.lock:
+            returncode, stdout, stderr = worker.run_execution_specs_t8n(
+                self.evm_tools.main, args, stdin_bytes.decode()
+            )
+        return subprocess.CompletedProcess(
+            args=args,
+            returncode=returncode,
+            stdout=stdout.encode(),
+            stderr=stderr.encode(),
+        )
+
+    def _evaluate_stream(
+        self,
+        *,
+        t8n_data: ExecutionSpecsTransitionTool.TransitionToolData,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Executes the spec's t8n in-process, with the same arguments and input as when
+        using stdin and stdout.
+        """
+        temp_dir = tempfile.TemporaryDirectory()
+        args = self.construct_args_stream(t8n_data, temp_dir)
+
+        stdin = {
+            "alloc": t8n_data.alloc,
+            "txs": t8n_data.txs,
+            "env": t8n_data.env,
+        }
+
+        with timed_phase("serialize"):
+            stdin_bytes = json_codec.encode(stdin)
+        record_payload(input_size=len(stdin_bytes))
+
+        with timed_phase("run"):
+            result = self.run_in_process(args[1:], stdin_bytes)
+        record_payload(output_size=len(result.stdout))
+
+        with timed_phase("parse"):
+            return self._process_stream_result(
+                temp_dir=temp_dir,
+                stdin=stdin,
+                args=args,
+                result=result,
+                debug_output_path=debug_output_path,
+            )
+
+    async def evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Asynchronous variant of `evaluate`: runs the spec's t8n from a thread.
+        """
+        async with self.async_semaphore():
+            return await asyncio.to_thread(
+                self.evaluate,
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                eips=eips,
+                debug_output_path=debug_output_path,
+            )
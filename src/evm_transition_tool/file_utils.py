@@ -2,43 +2,214 @@
 Methods to work with the filesystem and json
 """
 
-import json
+import gzip
 import os
 import stat
-from json import dump
-from typing import Any, Dict
+import threading
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple, cast
 
+from . import json_codec
 
-def write_json_file(data: Dict[str, Any], file_path: str) -> None:
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+DUMP_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+"""
+Suffix of the compressed debug files, per supported compression.
+"""
+
+
+def write_json_file(data: Dict[str, Any], file_path: str, indent: Optional[int] = 4) -> None:
     """
-    Write a JSON file to the given path.
+    Write a JSON file to the given path, without whitespace if `indent` is None.
     """
-    with open(file_path, "w") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    with open(file_path, "wb") as f:
+        f.write(json_codec.encode(data, indent=indent))
 
 
-def dump_files_to_directory(output_path: str, files: Dict[str, Any]) -> None:
+def compress(data: bytes, compression: str) -> bytes:
     """
-    Dump the files to the given directory.
+    Compresses the data with `gzip` or `zstd`, favoring speed over ratio.
     """
-    os.makedirs(output_path, exist_ok=True)
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=1, mtime=0)
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the `zstandard` package.")
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise Exception(f"Unsupported compression: {compression}")
+
+
+def decompress(data: bytes, compression: str, dictionary: Optional[bytes] = None) -> bytes:
+    """
+    Decompresses data compressed by `compress` or written by `open_compressed`, with the
+    zstd dictionary it was compressed with, if any.
+    """
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the `zstandard` package.")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        # Streamed frames do not record their size, which `decompress` requires
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompressobj().decompress(data)
+    raise Exception(f"Unsupported compression: {compression}")
+
+
+def open_compressed(
+    file_path: str, compression: str, level: int, dictionary: Optional[bytes] = None
+) -> BinaryIO:
+    """
+    Opens a file to write to it with `gzip` or `zstd` compression, at the given level,
+    optionally with a zstd dictionary. The compressed data is written as it is produced.
+
+    The output does not depend on when the file is written (gzip's modification time
+    is zero).
+    """
+    if compression == "gzip":
+        return cast(BinaryIO, gzip.GzipFile(file_path, "wb", compresslevel=level, mtime=0))
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception("zstd compression requires the `zstandard` package.")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+        return compressor.stream_writer(open(file_path, "wb"))
+    raise Exception(f"Unsupported compression: {compression}")
+
+
+def decompress_command(compression: str) -> str:
+    """
+    Returns the shell command that writes the decompressed contents of the files passed
+    as arguments to stdout.
+    """
+    return {"gzip": "gzip -dc", "zstd": "zstd -dcq"}[compression]
+
+
+DumpFile = Tuple[str, bytes, bool]
+"""
+A file of a debug dump: relative path, contents and whether it is executable.
+"""
+
+
+def prepare_dump_files(files: Dict[str, Any], compression: Optional[str] = None) -> List[DumpFile]:
+    """
+    Encodes the files passed to `dump_files_to_directory`.
+
+    Strings are written as text and bytes as is. Other contents are written as indented
+    JSON. With compression, bytes (raw payloads) and JSON objects and arrays (as compact
+    JSON) are compressed and their file name gets the suffix of the compression.
+    """
+    dump_files: List[DumpFile] = []
     for file_rel_path_flags, file_contents in files.items():
         file_rel_path, flags = (
             file_rel_path_flags.split("+")
             if "+" in file_rel_path_flags
             else (file_rel_path_flags, "")
         )
+        data: bytes
+        if isinstance(file_contents, str):
+            data = file_contents.encode()
+        elif compression is not None and isinstance(file_contents, (bytes, dict, list)):
+            if not isinstance(file_contents, bytes):
+                file_contents = json_codec.encode(file_contents, ensure_ascii=True)
+            data = compress(file_contents, compression)
+            file_rel_path += DUMP_COMPRESSION_SUFFIXES[compression]
+        elif isinstance(file_contents, bytes):
+            data = file_contents
+        else:
+            data = json_codec.encode(file_contents, indent=4, ensure_ascii=True)
+        dump_files.append((file_rel_path, data, "x" in flags))
+    return dump_files
+
+
+def write_dump_files(output_path: str, dump_files: List[DumpFile]) -> None:
+    """
+    Writes the files prepared by `prepare_dump_files` to the given directory.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    for file_rel_path, data, executable in dump_files:
         rel_path = os.path.dirname(file_rel_path)
         if rel_path:
             os.makedirs(os.path.join(output_path, rel_path), exist_ok=True)
         file_path = os.path.join(output_path, file_rel_path)
-        with open(file_path, "w") as f:
-            if isinstance(file_contents, str):
-                f.write(file_contents)
-            else:
-                dump(file_contents, f, ensure_ascii=True, indent=4)
-        if flags:
-            file_mode = os.stat(file_path).st_mode
-            if "x" in flags:
-                file_mode |= stat.S_IEXEC
-            os.chmod(file_path, file_mode)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        if executable:
+            os.chmod(file_path, os.stat(file_path).st_mode | stat.S_IEXEC)
+
+
+class DebugDumpBuffer:
+    """
+    Ring buffer holding the most recent debug dumps in memory instead of writing them
+    to disk, e.g. to only write the dumps of the failing tests.
+
+    When the size of the buffered files exceeds `max_size` bytes, the oldest dumps are
+    discarded. `flush` writes the buffered dumps, `clear` discards them.
+    """
+
+    max_size: int
+    dumps: Deque[Tuple[str, List[DumpFile]]]
+    size: int
+    dropped_dumps: int
+    lock: threading.Lock
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.dumps = deque()
+        self.size = 0
+        self.dropped_dumps = 0
+        self.lock = threading.Lock()
+
+    def add(self, output_path: str, dump_files: List[DumpFile]) -> None:
+        """
+        Buffers files to be written to the given directory.
+        """
+        with self.lock:
+            self.dumps.append((output_path, dump_files))
+            self.size += sum(len(data) for _, data, _ in dump_files)
+            while self.size > self.max_size and len(self.dumps) > 1:
+                _, dropped_files = self.dumps.popleft()
+                self.size -= sum(len(data) for _, data, _ in dropped_files)
+                self.dropped_dumps += 1
+
+    def flush(self) -> None:
+        """
+        Writes the buffered dumps, oldest first, and empties the buffer.
+        """
+        with self.lock:
+            dumps, self.dumps = self.dumps, deque()
+            self.size = 0
+            self.dropped_dumps = 0
+        for output_path, dump_files in dumps:
+            write_dump_files(output_path, dump_files)
+
+    def clear(self) -> None:
+        """
+        Discards the buffered dumps.
+        """
+        with self.lock:
+            self.dumps = deque()
+            self.size = 0
+            self.dropped_dumps = 0
+
+
+def dump_files_to_directory(
+    output_path: str,
+    files: Dict[str, Any],
+    compression: Optional[str] = None,
+    buffer: Optional[DebugDumpBuffer] = None,
+) -> None:
+    """
+    Dump the files to the given directory, or to the buffer if one is given.
+
+    A `+x` suffix in a file name makes the file executable. See `prepare_dump_files`
+    for how the contents are encoded.
+    """
+    dump_files = prepare_dump_files(files, compression)
+    if buffer is not None:
+        buffer.add(output_path, dump_files)
+    else:
+        write_dump_files(output_path, dump_files)
@@ -2,12 +2,14 @@
 Go-ethereum Transition tool interface.
 """
 
+import asyncio
+import json
 import shutil
 import subprocess
 import textwrap
 from pathlib import Path
 from re import compile
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from ethereum_test_forks import Fork
 
@@ -24,6 +26,7 @@ class GethTransitionTool(TransitionTool):
     t8n_subcommand: Optional[str] = "t8n"
     statetest_subcommand: Optional[str] = "statetest"
     blocktest_subcommand: Optional[str] = "blocktest"
+    verify_fixtures_batch_size: int = 64
 
     binary: Path
     cached_version: Optional[str] = None
@@ -36,14 +39,7 @@ class GethTransitionTool(TransitionTool):
         trace: bool = False,
     ):
         super().__init__(binary=binary, trace=trace)
-        args = [str(self.binary), str(self.t8n_subcommand), "--help"]
-        try:
-            result = subprocess.run(args, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
-        except Exception as e:
-            raise Exception(f"Unexpected exception calling evm tool: {e}.")
-        self.help_string = result.stdout
+        self.help_string = self.get_help_string([str(self.t8n_subcommand), "--help"])
 
     def is_fork_supported(self, fork: Fork) -> bool:
         """
@@ -53,11 +49,11 @@ class GethTransitionTool(TransitionTool):
         """
         return fork.fork() in self.help_string
 
-    def verify_fixture(
+    def _get_verify_fixture_command(
         self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
-    ):
+    ) -> List[str]:
         """
-        Executes `evm [state|block]test` to verify the fixture at `fixture_path`.
+        Returns the `evm [state|block]test` command used to verify the fixture at `fixture_path`.
         """
         command: list[str] = [str(self.binary)]
 
@@ -74,13 +70,18 @@ class GethTransitionTool(TransitionTool):
             raise Exception(f"Invalid test fixture format: {fixture_format}")
 
         command.append(str(fixture_path))
+        return command
 
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
+    def _process_verify_fixture_result(
+        self,
+        command: List[str],
+        fixture_path: Path,
+        result: subprocess.CompletedProcess,
+        debug_output_path: Optional[Path],
+    ):
+        """
+        Dumps the debug output of a fixture verification and raises on failure.
+        """
         if debug_output_path:
             debug_fixture_path = debug_output_path / "fixtures.json"
             shutil.copyfile(fixture_path, debug_fixture_path)
@@ -108,3 +109,111 @@ class GethTransitionTool(TransitionTool):
                 f"Failed to verify fixture via: '{' '.join(command)}'. "
                 f"Error: '{result.stderr.decode()}'"
             )
+
+    def verify_fixture(
+        self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
+    ):
+        """
+        Executes `evm [state|block]test` to verify the fixture at `fixture_path`.
+        """
+        command = self._get_verify_fixture_command(fixture_format, fixture_path, debug_output_path)
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._process_verify_fixture_result(command, fixture_path, result, debug_output_path)
+
+    async def verify_fixture_async(
+        self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
+    ):
+        """
+        Asynchronous variant of `verify_fixture`.
+        """
+        command = self._get_verify_fixture_command(fixture_format, fixture_path, debug_output_path)
+        async with self.async_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await process.communicate()
+        assert process.returncode is not None
+        self._process_verify_fixture_result(
+            command,
+            fixture_path,
+            subprocess.CompletedProcess(command, process.returncode, stdout, stderr),
+            debug_output_path,
+        )
+
+    def verify_fixtures(
+        self, fixture_format: FixtureFormats, fixture_paths: List[Path]
+    ) -> Dict[Path, str]:
+        """
+        Verifies many fixtures of the same format, without debug output.
+
+        State test fixtures are verified by a single `evm statetest` process, which reads
+        the fixture paths from stdin and outputs the results of each fixture; if the tool
+        stops at a fixture it cannot run, the verification resumes after that fixture. Raises
+        if the tool fails after reporting the results of all the fixtures.
+        Blockchain test fixtures are verified one per `evm blocktest` process.
+        """
+        if not FixtureFormats.is_state_test(fixture_format) or len(fixture_paths) == 1:
+            return super().verify_fixtures(fixture_format, fixture_paths)
+
+        assert self.statetest_subcommand, "statetest subcommand not set"
+        command = [str(self.binary), self.statetest_subcommand]
+        errors: Dict[Path, str] = {}
+        remaining = list(fixture_paths)
+        while remaining:
+            result = subprocess.run(
+                command,
+                input="".join(f"{fixture_path}\n" for fixture_path in remaining).encode(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            reports = split_json_documents(result.stdout.decode())
+            for fixture_path, report in zip(remaining, reports):
+                failed_tests = [
+                    f"{test.get('name')}: {test.get('error')}"
+                    for test in report
+                    if not test.get("pass")
+                ]
+                if failed_tests:
+                    errors[fixture_path] = "Failed tests: " + "; ".join(failed_tests)
+            if len(reports) < len(remaining):
+                failed_path = remaining[len(reports)]
+                errors[failed_path] = (
+                    f"Failed to verify fixture via: '{' '.join(command + [str(failed_path)])}'. "
+                    f"Error: '{result.stderr.decode()}'"
+                )
+                remaining = remaining[len(reports) + 1 :]
+            elif result.returncode != 0:
+                raise Exception(
+                    f"Failed to verify fixtures via: '{' '.join(command)}'. "
+                    f"Error: '{result.stderr.decode()}'"
+                )
+            else:
+                remaining = []
+        return errors
+
+
+def split_json_documents(text: str) -> List[Any]:
+    """
+    Returns the JSON documents output one after the other, stopping at the first text
+    that is not valid JSON.
+    """
+    decoder = json.JSONDecoder()
+    documents = []
+    position = 0
+    while True:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if position == len(text):
+            break
+        try:
+            document, position = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            break
+        documents.append(document)
+    return documents
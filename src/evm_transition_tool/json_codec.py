@@ -0,0 +1,100 @@
+"""
+JSON encoding and decoding of transition tool inputs, outputs and fixtures.
+
+A fast backend is used when one is installed, in order of preference:
+
+- [msgspec](https://jcristharif.com/msgspec/): encoding (compact and indented) and
+    decoding.
+- [orjson](https://github.com/ijl/orjson): compact encoding only; it is not used for
+    decoding as it converts integers larger than 64 bits to floats.
+
+Otherwise, and for any object a fast backend does not support (e.g. `str` subclasses
+or, for orjson, integers larger than 64 bits), the standard library's `json` is used.
+
+For the data handled by the framework (dicts, lists, strings, integers, booleans and
+None), the output of `encode` is byte-identical regardless of the backend, e.g.
+`encode(obj, indent=4, ensure_ascii=True)` is `json.dumps(obj, indent=4).encode()`.
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+BACKEND = "msgspec" if msgspec is not None else "orjson" if orjson is not None else "json"
+"""
+Name of the fast backend in use, `json` if none is installed.
+"""
+
+
+def _encode_stdlib(
+    obj: Any, *, indent: Optional[int], sort_keys: bool, ensure_ascii: bool
+) -> bytes:
+    """
+    Encodes the object with the standard library.
+    """
+    return json.dumps(
+        obj,
+        indent=indent,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        separators=(",", ":") if indent is None else (",", ": "),
+    ).encode()
+
+
+def _encode_fast(obj: Any, *, indent: Optional[int], sort_keys: bool) -> Optional[bytes]:
+    """
+    Encodes the object with the fast backend, returns None if it is not supported.
+    """
+    try:
+        if msgspec is not None:
+            encoded = msgspec.json.encode(obj, order="sorted" if sort_keys else None)
+            if indent is not None:
+                encoded = msgspec.json.format(encoded, indent=indent)
+            return encoded
+        if orjson is not None and indent is None:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    except TypeError:
+        pass
+    return None
+
+
+def encode(
+    obj: Any,
+    *,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+) -> bytes:
+    """
+    Encodes the object to UTF-8 JSON.
+
+    Without `indent`, the output is compact (no whitespace). With `ensure_ascii`, all
+    non-ASCII characters are escaped, as done by default by the standard library.
+    """
+    encoded = _encode_fast(obj, indent=indent, sort_keys=sort_keys)
+    if encoded is None or (ensure_ascii and not encoded.isascii()):
+        return _encode_stdlib(obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+    return encoded
+
+
+def decode(data: bytes | str) -> Any:
+    """
+    Decodes JSON data.
+
+    Raises `json.JSONDecodeError` if the data is not valid JSON, regardless of the backend.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            pass  # let the standard library raise the error (or accept e.g. NaN)
+    return json.loads(data)
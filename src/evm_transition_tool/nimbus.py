@@ -3,7 +3,6 @@ Go-ethereum Transition tool interface.
 """
 
 import re
-import subprocess
 from pathlib import Path
 from re import compile
 from typing import Optional
@@ -33,14 +32,7 @@ class NimbusTransitionTool(TransitionTool):
         trace: bool = False,
     ):
         super().__init__(binary=binary, trace=trace)
-        args = [str(self.binary), "--help"]
-        try:
-            result = subprocess.run(args, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
-        except Exception as e:
-            raise Exception(f"Unexpected exception calling evm tool: {e}.")
-        self.help_string = result.stdout
+        self.help_string = self.get_help_string(["--help"])
 
     def version(self) -> str:
         """
@@ -0,0 +1,256 @@
+"""
+Replay of the transition tool calls dumped with `--evm-dump-dir`, to benchmark tools.
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import json_codec
+from .differential import compare_alloc, compare_result
+from .file_utils import DUMP_COMPRESSION_SUFFIXES, decompress
+from .transition_tool import TransitionTool, TransitionToolInput
+
+LATENCY_PERCENTILES = (50, 90, 99)
+"""
+Percentiles of the call latencies reported for each tool.
+"""
+
+
+@dataclass(kw_only=True)
+class DumpedCall:
+    """
+    A transition tool call read from its debug dump directory.
+
+    `expected_alloc` and `expected_result` are the outputs of the tool that was dumped,
+    if the call succeeded.
+    """
+
+    path: Path
+    input: TransitionToolInput
+    expected_alloc: Optional[Dict[str, Any]] = None
+    expected_result: Optional[Dict[str, Any]] = None
+
+
+@dataclass(kw_only=True)
+class ReplayedCall:
+    """
+    Outcome of replaying a dumped call: latency in seconds and, if the call failed or its
+    output differs from the dumped output, the error.
+    """
+
+    path: Path
+    latency: float
+    error: Optional[str] = None
+    mismatch: Optional[str] = None
+
+
+def read_dump_file(directory: Path, name: str) -> Optional[bytes]:
+    """
+    Returns the contents of a dump file, decompressed if it was dumped with compression,
+    or None if the file does not exist.
+    """
+    if (directory / name).is_file():
+        return (directory / name).read_bytes()
+    for compression, suffix in DUMP_COMPRESSION_SUFFIXES.items():
+        if (directory / f"{name}{suffix}").is_file():
+            return decompress((directory / f"{name}{suffix}").read_bytes(), compression)
+    return None
+
+
+def find_dumped_calls(root: Path) -> List[Path]:
+    """
+    Returns the dump directories of the transition tool calls under `root`, i.e. the
+    directories that contain a `t8n.sh` script, in a stable order.
+    """
+    return sorted(Path(directory) for directory, _, files in os.walk(root) if "t8n.sh" in files)
+
+
+def parse_state_args(args: List[str]) -> Dict[str, str]:
+    """
+    Returns the `--state.*` arguments of a dumped tool command line (`args.py`), which
+    are passed either as `--state.fork=Cancun` or as `--state.fork Cancun`.
+    """
+    state: Dict[str, str] = {}
+    for i, arg in enumerate(args):
+        if not arg.startswith("--state."):
+            continue
+        if "=" in arg:
+            key, value = arg.split("=", 1)
+        elif i + 1 < len(args):
+            key, value = arg, args[i + 1]
+        else:
+            continue
+        state[key[len("--state.") :]] = value
+    return state
+
+
+def load_dumped_call(directory: Path) -> DumpedCall:
+    """
+    Reads the inputs and outputs of a transition tool call from its dump directory.
+
+    Supports the dumps of the tools that use stdin and stdout, the filesystem or
+    Besu's `t8n-server`, with or without compression.
+    """
+    inputs: Dict[str, Any] = {}
+    state: Dict[str, Any] = {}
+    outputs: Dict[str, Any] = {}
+
+    request = read_dump_file(directory, "request.json")
+    stdin = read_dump_file(directory, "stdin.json")
+    if request is not None:  # Besu `t8n-server`, compressed
+        request_json = json_codec.decode(request)
+        inputs, state = request_json["input"], request_json["state"]
+    elif stdin is not None:  # stdin and stdout, compressed
+        inputs = json_codec.decode(stdin)
+    else:
+        for key in ("alloc", "env", "txs"):
+            contents = read_dump_file(directory, f"input/{key}.json")
+            if contents is None:
+                raise Exception(f"{directory} does not contain the inputs of a t8n call")
+            inputs[key] = json_codec.decode(contents)
+
+    if not state:
+        state_file = read_dump_file(directory, "state.json")
+        args_file = read_dump_file(directory, "args.py")
+        if state_file is not None:  # Besu `t8n-server`
+            state = json_codec.decode(state_file)
+        elif args_file is not None:
+            state = parse_state_args(json_codec.decode(args_file))
+    if "fork" not in state:
+        raise Exception(f"{directory} does not contain the fork of the t8n call")
+
+    returncode = read_dump_file(directory, "returncode.txt")
+    status_code = read_dump_file(directory, "status_code.txt")
+    stdout = read_dump_file(directory, "stdout.json")
+    response = read_dump_file(directory, "response.json")
+    if (returncode is not None and int(returncode) != 0) or (
+        status_code is not None and int(status_code) != 200
+    ):
+        pass  # the dumped call failed, there is no output to compare with
+    elif stdout is not None or response is not None:
+        output = json_codec.decode(stdout if stdout is not None else response)  # type: ignore
+        outputs = {key: output.get(key) for key in ("alloc", "result")}
+    else:
+        for key in ("alloc", "result"):
+            contents = read_dump_file(directory, f"output/{key}.json")
+            if contents is not None:
+                outputs[key] = json_codec.decode(contents)
+
+    return DumpedCall(
+        path=directory,
+        input=TransitionToolInput(
+            alloc=inputs["alloc"],
+            txs=inputs["txs"],
+            env=inputs["env"],
+            fork_name=state["fork"],
+            chain_id=int(state.get("chainid", 1)),
+            reward=int(state.get("reward", 0)),
+        ),
+        expected_alloc=outputs.get("alloc"),
+        expected_result=outputs.get("result"),
+    )
+
+
+def replay_call(t8n: TransitionTool, call: DumpedCall) -> ReplayedCall:
+    """
+    Evaluates a dumped call with the given tool, and compares its output with the
+    dumped output.
+    """
+    start = time.perf_counter()
+    try:
+        alloc, result = t8n.evaluate(
+            alloc=call.input.alloc,
+            txs=call.input.txs,
+            env=call.input.env,
+            fork_name=call.input.fork_name,
+            chain_id=call.input.chain_id,
+            reward=call.input.reward,
+        )
+    except Exception as e:
+        return ReplayedCall(path=call.path, latency=time.perf_counter() - start, error=str(e))
+    latency = time.perf_counter() - start
+
+    divergence: Optional[Tuple[str, Any, Any]] = None
+    if call.expected_alloc is not None:
+        divergence = compare_alloc(call.expected_alloc, alloc)
+    if divergence is None and call.expected_result is not None:
+        divergence = compare_result(call.expected_result, result)
+    mismatch = None
+    if divergence is not None:
+        path, expected, actual = divergence
+        mismatch = f"{path}: dumped {expected!r}, got {actual!r}"
+    return ReplayedCall(path=call.path, latency=latency, mismatch=mismatch)
+
+
+def replay_calls(
+    t8n: TransitionTool, calls: List[DumpedCall], workers: int = 1, repeat: int = 1
+) -> Tuple[List[ReplayedCall], float]:
+    """
+    Replays the calls `repeat` times with the given tool, running up to `workers` calls
+    at the same time. Returns the replayed calls and the elapsed wall-clock time.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        replayed = list(executor.map(lambda call: replay_call(t8n, call), calls * repeat))
+    return replayed, time.perf_counter() - start
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Returns the `q`-th percentile of the values (nearest-rank method).
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize_replay(replayed: List[ReplayedCall], elapsed: float) -> Dict[str, Any]:
+    """
+    Returns the throughput and latency statistics of replayed calls as JSON data.
+
+    Latencies are in seconds, and only include the calls that succeeded.
+    """
+    latencies = [call.latency for call in replayed if call.error is None]
+    return {
+        "calls": len(replayed),
+        "errors": sum(1 for call in replayed if call.error is not None),
+        "mismatches": sum(1 for call in replayed if call.mismatch is not None),
+        "elapsed": elapsed,
+        "calls_per_second": len(replayed) / elapsed if elapsed > 0 else 0,
+        "latency": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0,
+            **{f"p{q}": percentile(latencies, q) for q in LATENCY_PERCENTILES},
+            "max": max(latencies, default=0),
+        },
+    }
+
+
+def find_regressions(
+    summary: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Returns the descriptions of the regressions of a replay summary with respect to a
+    baseline summary: throughput or latency percentiles worse by more than `threshold`
+    (a fraction), or more errors or mismatches.
+    """
+    regressions = []
+    if summary["calls_per_second"] < baseline["calls_per_second"] * (1 - threshold):
+        regressions.append(
+            f"calls/sec {summary['calls_per_second']:.1f} < " f"{baseline['calls_per_second']:.1f}"
+        )
+    for q in LATENCY_PERCENTILES:
+        latency, baseline_latency = summary["latency"][f"p{q}"], baseline["latency"][f"p{q}"]
+        if latency > baseline_latency * (1 + threshold):
+            regressions.append(
+                f"p{q} latency {latency * 1000:.2f}ms > {baseline_latency * 1000:.2f}ms"
+            )
+    for key in ("errors", "mismatches"):
+        if summary[key] > baseline[key]:
+            regressions.append(f"{key} {summary[key]} > {baseline[key]}")
+    return regressions
@@ -0,0 +1,126 @@
+"""
+Pre-started transition tool processes that hide the startup latency of the tool.
+"""
+
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+MAX_STANDBY = 32
+"""
+Default upper bound on the number of processes kept on standby by a spawner.
+"""
+
+
+class TransitionToolSpawner:
+    """
+    Keeps tool processes started ahead of time, blocked reading their stdin, so that a
+    one-shot t8n call only has to write its input and read the output.
+
+    A process can only serve a call with the exact command-line arguments it was started
+    with (e.g. the fork and the block reward), so `count` standby processes are kept for
+    each of the distinct arguments of the calls: each call takes a standby process
+    started with its arguments (or starts one if there is none), and the standby
+    processes of its arguments are replenished in the background. When more than
+    `max_standby` processes are on standby, the processes of the least recently used
+    arguments are stopped.
+    """
+
+    count: int
+    max_standby: int
+    standby: "OrderedDict[Tuple[str, ...], List[subprocess.Popen]]"
+    executor: ThreadPoolExecutor
+    lock: threading.Lock
+    closed: bool
+
+    def __init__(self, count: int, max_standby: int = MAX_STANDBY):
+        self.count = count
+        self.max_standby = max(max_standby, count)
+        self.standby = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="t8n-spawner")
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @staticmethod
+    def spawn(args: List[str]) -> subprocess.Popen:
+        """
+        Starts a tool process with the given command-line arguments.
+        """
+        return subprocess.Popen(
+            args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    @staticmethod
+    def stop(process: subprocess.Popen) -> None:
+        """
+        Stops a standby process that was not used.
+        """
+        process.kill()
+        process.communicate()
+
+    def standby_count(self) -> int:
+        """
+        Returns the number of processes on standby.
+        """
+        return sum(len(processes) for processes in self.standby.values())
+
+    def replenish(self, key: Tuple[str, ...]) -> None:
+        """
+        Starts standby processes with the given arguments until there are `count` of them,
+        stopping the processes of the least recently used arguments if there are too many.
+        """
+        with self.lock:
+            missing = 0 if self.closed else self.count - len(self.standby.get(key, []))
+        processes = [self.spawn(list(key)) for _ in range(missing)]
+        stopped: List[subprocess.Popen] = []
+        with self.lock:
+            if self.closed:
+                stopped.extend(processes)
+            else:
+                self.standby.setdefault(key, []).extend(processes)
+                self.standby.move_to_end(key)
+                while self.standby_count() > self.max_standby:
+                    oldest_key, oldest_processes = next(iter(self.standby.items()))
+                    stopped.append(oldest_processes.pop(0))
+                    if not oldest_processes:
+                        del self.standby[oldest_key]
+        for process in stopped:
+            self.stop(process)
+
+    def run(self, args: List[str], stdin: bytes) -> subprocess.CompletedProcess:
+        """
+        Runs the tool with the given arguments and input, on a standby process if one was
+        started with the same arguments.
+        """
+        key = tuple(args)
+        process = None
+        with self.lock:
+            processes = self.standby.get(key)
+            while processes and process is None:
+                process = processes.pop()
+                if process.poll() is not None:  # exited while on standby, e.g. killed
+                    process.communicate()
+                    process = None
+            if key in self.standby and not self.standby[key]:
+                del self.standby[key]
+            if not self.closed:
+                self.executor.submit(self.replenish, key)
+        if process is None:
+            process = self.spawn(args)
+        stdout, stderr = process.communicate(stdin)
+        return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+    def shutdown(self) -> None:
+        """
+        Stops all the standby processes.
+        """
+        with self.lock:
+            self.closed = True
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            standby, self.standby = self.standby, OrderedDict()
+        for processes in standby.values():
+            for process in processes:
+                self.stop(process)
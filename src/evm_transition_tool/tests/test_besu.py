@@ -0,0 +1,90 @@
+"""
+Test the restart of Besu t8n-server processes.
+"""
+
+import sys
+import textwrap
+from pathlib import Path
+
+from evm_transition_tool import BesuTransitionTool
+from evm_transition_tool.besu import BesuTransitionServer
+
+FAKE_SERVER = textwrap.dedent(
+    """\
+    #!{python}
+    import os
+    import sys
+    import time
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    HANG_MARKER = {hang_marker!r}
+
+    if sys.argv[1:] == ["t8n", "--help"]:
+        print("t8n --help: London")
+        sys.exit(0)
+
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            if not os.path.exists(HANG_MARKER):
+                open(HANG_MARKER, "w").close()
+                time.sleep(60)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(
+                b'{{"alloc": {{}}, "result": {{}}, "body": "0x", "pid": %d}}' % os.getpid()
+            )
+
+
+    server = HTTPServer(("localhost", 0), Handler)
+    print(f"Transition server listening on {{server.server_port}}", flush=True)
+    server.serve_forever()
+    """
+)
+
+
+def write_fake_besu(tmp_path: Path) -> Path:
+    """
+    Writes a fake Besu binary whose t8n-server hangs on the first request.
+    """
+    binary = tmp_path / "besu-evm"
+    binary.write_text(
+        FAKE_SERVER.format(python=sys.executable, hang_marker=str(tmp_path / "hung"))
+    )
+    binary.chmod(0o755)
+    return binary
+
+
+def test_restart_hung_server(tmp_path: Path):
+    """
+    Test that a server that does not respond in time is restarted and the request
+    retried on the new server.
+    """
+    server = BesuTransitionServer(write_fake_besu(tmp_path))
+    try:
+        assert server.process is not None
+        hung_pid = server.process.pid
+        response = server.post(b'{"state": {}, "input": {}}', timeout=1)
+        assert server.process is not None
+        assert response.json()["pid"] == server.process.pid
+        assert server.process.pid != hung_pid
+    finally:
+        server.stop()
+
+
+def test_timings(tmp_path: Path):
+    """
+    Test that the phases and payload sizes of the calls to the server are timed.
+    """
+    (tmp_path / "hung").touch()
+    t8n = BesuTransitionTool(binary=write_fake_besu(tmp_path))
+    t8n.timings = []
+    try:
+        t8n.evaluate(alloc={}, txs=[], env={"currentNumber": "0x1"}, fork_name="London")
+    finally:
+        t8n.shutdown()
+    assert set(t8n.timings[0].phases) == {"serialize", "run", "parse"}
+    assert t8n.timings[0].input_size > 0
+    assert t8n.timings[0].output_size > 0
@@ -0,0 +1,53 @@
+"""
+Test the content-addressed transition tool cache.
+"""
+
+import os
+from pathlib import Path
+
+from evm_transition_tool import TransitionToolCache
+
+
+def test_key_is_canonical():
+    """
+    Test that the cache key does not depend on the order of the inputs.
+    """
+    key_1 = TransitionToolCache.key("tool", alloc={"a": 1, "b": 2}, txs=[], fork_name="London")
+    key_2 = TransitionToolCache.key("tool", fork_name="London", txs=[], alloc={"b": 2, "a": 1})
+    assert key_1 == key_2
+    assert key_1 != TransitionToolCache.key("tool", alloc={"a": 1}, txs=[], fork_name="Paris")
+    assert key_1 != TransitionToolCache.key(
+        "other tool", alloc={"a": 1, "b": 2}, txs=[], fork_name="London"
+    )
+
+
+def test_get_put(tmp_path: Path):
+    """
+    Test storing and retrieving an entry.
+    """
+    cache = TransitionToolCache(tmp_path)
+    key = TransitionToolCache.key("tool", alloc={})
+    assert cache.get(key) is None
+    cache.put(key, {"0x01": {"balance": "0x1"}}, {"stateRoot": "0x00"})
+    assert cache.get(key) == ({"0x01": {"balance": "0x1"}}, {"stateRoot": "0x00"})
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A second cache instance sharing the directory, e.g. another xdist worker
+    assert TransitionToolCache(tmp_path).get(key) is not None
+
+
+def test_lru_eviction(tmp_path: Path):
+    """
+    Test that the least recently used entries are evicted first.
+    """
+    cache = TransitionToolCache(tmp_path)
+    keys = [TransitionToolCache.key("tool", i=i) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {}, {"padding": "0" * 100})
+        os.utime(cache.entry_path(key), (i, i))
+    entry_size = cache.size() // 3
+    cache.get(keys[0])  # most recently used now
+    cache.max_size = entry_size * 2
+    cache.evict()
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
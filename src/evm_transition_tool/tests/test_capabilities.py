@@ -0,0 +1,60 @@
+"""
+Test the transition tool capability cache.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+from evm_transition_tool import GethTransitionTool, TransitionTool
+from evm_transition_tool.capabilities import TransitionToolCapabilityCache
+
+
+def test_rebuilt_binary_is_not_cached(tmp_path: Path):
+    """
+    Test that the cache entries are invalidated when the binary changes.
+    """
+    binary = tmp_path / "evm"
+    binary.write_text("build 1")
+    cache = TransitionToolCapabilityCache()
+    cache.put(binary, "version", "evm version 1")
+    cache.put_help(binary, "t8n --help", "London")
+    assert cache.get(binary, "version") == "evm version 1"
+    assert cache.get_help(binary, "t8n --help") == "London"
+
+    other_cache = TransitionToolCapabilityCache()
+    other_cache.load(cache.dump())
+    assert other_cache.get(binary, "version") == "evm version 1"
+
+    binary.write_text("build 2, larger")
+    assert cache.get(binary, "version") is None
+    other_cache = TransitionToolCapabilityCache()
+    other_cache.load(cache.dump())
+    assert other_cache.entries == {}
+
+
+def test_from_binary_path_probes_once(monkeypatch, tmp_path: Path):
+    """
+    Test that a binary is only probed the first time a tool is instantiated from it.
+    """
+    binary = tmp_path / "evm"
+    binary.write_text("")
+    os.chmod(binary, 0o755)
+    calls = []
+
+    def mock_run(args, **kwargs):
+        calls.append(args)
+        stdout = "evm version 1.13.5" if args[-1] == "-v" else "London, Paris"
+        return subprocess.CompletedProcess(
+            args, 0, stdout if kwargs.get("text") else stdout.encode(), b""
+        )
+
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    monkeypatch.setattr(TransitionTool, "capability_cache", TransitionToolCapabilityCache())
+
+    for _ in range(3):
+        t8n = TransitionTool.from_binary_path(binary_path=binary)
+        assert isinstance(t8n, GethTransitionTool)
+        assert t8n.version() == "evm version 1.13.5"
+        assert t8n.help_string == "London, Paris"
+    assert len(calls) == 2  # version flag and t8n --help
@@ -0,0 +1,157 @@
+"""
+Test the differential evaluation of state transitions by several tools.
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from evm_transition_tool import DifferentialTransitionTool, TransitionToolDivergence
+from evm_transition_tool.differential import compare_alloc, compare_result
+
+ADDRESS = "0x1000000000000000000000000000000000000000"
+ALLOC = {
+    ADDRESS: {
+        "balance": "0x0de0b6b3a7640000",
+        "nonce": "0x1",
+        "storage": {"0x01": "0x02"},
+    }
+}
+RESULT = {
+    "stateRoot": "0x" + "ab" * 32,
+    "gasUsed": "0x5208",
+    "rejected": [{"index": 1, "error": "nonce too low"}],
+    "receipts": [{"transactionHash": "0x" + "cd" * 32, "status": "0x1", "gasUsed": "0x5208"}],
+}
+
+
+class StubTool:
+    """
+    Stand-in for a transition tool that returns a fixed output.
+    """
+
+    binary = Path(sys.executable)
+    trace = False
+
+    def __init__(self, output: Tuple[Dict[str, Any], Dict[str, Any]]):
+        self.output = output
+        self.calls = 0
+
+    def evaluate(self, **kwargs) -> Tuple[Dict[str, Any], Dict[str, Any]]:  # noqa: D102
+        self.calls += 1
+        return self.output
+
+    def shutdown(self):  # noqa: D102
+        pass
+
+    def reset_traces(self):  # noqa: D102
+        pass
+
+
+def test_compare_equivalent_encodings():
+    """
+    Test that differences in the encoding of the same values are not divergences.
+    """
+    other_alloc = {
+        ADDRESS.upper().replace("0X", "0x"): {
+            "balance": "0xde0b6b3a7640000",
+            "nonce": 1,
+            "code": "0x",
+            "storage": {"0x" + "00" * 31 + "01": "0x2"},
+        },
+        "0x2000000000000000000000000000000000000000": {"balance": "0x0", "storage": {}},
+    }
+    assert compare_alloc(ALLOC, other_alloc) is None
+    other_result = dict(
+        RESULT,
+        stateRoot=RESULT["stateRoot"].upper().replace("0X", "0x"),  # type: ignore
+        rejected=[{"index": 1, "error": "nonce too low: address 0x10.., tx: 0 state: 1"}],
+        currentDifficulty=None,
+    )
+    assert compare_result(RESULT, other_result) is None
+
+
+def test_compare_byte_strings():
+    """
+    Test that byte strings and hashes are compared exactly, ignoring the hex case only.
+    """
+    assert compare_alloc({"0xAa": {"code": "0x00"}}, {"0xaa": {"code": "0x"}}) == (
+        "alloc.0xaa.code",
+        "0x00",
+        "0x",
+    )
+    assert compare_alloc({"0xAa": {"code": "0xAB"}}, {"0xaa": {"code": "0xab"}}) is None
+    assert compare_alloc({"0xaa": {"code": "0x"}}, {"0xaa": {"nonce": "0x0"}}) is None
+    assert compare_result(
+        dict(RESULT, logsBloom="0x" + "00" * 256), dict(RESULT, logsBloom="0x")
+    ) == ("result.logsBloom", "0x" + "00" * 256, "0x")
+    assert compare_result(RESULT, dict(RESULT, withdrawalsRoot="0x" + "00" * 32)) == (
+        "result.withdrawalsRoot",
+        None,
+        "0x" + "00" * 32,
+    )
+
+
+@pytest.mark.parametrize(
+    "other_alloc,other_result,expected_path",
+    [
+        (
+            {ADDRESS: dict(ALLOC[ADDRESS], nonce=2)},
+            RESULT,
+            f"alloc.{ADDRESS}.nonce",
+        ),
+        (
+            {ADDRESS: dict(ALLOC[ADDRESS], storage={})},
+            RESULT,
+            f"alloc.{ADDRESS}.storage.0x1",
+        ),
+        (
+            {ADDRESS.upper().replace("0X", "0x"): dict(ALLOC[ADDRESS], code="0x00")},
+            RESULT,
+            f"alloc.{ADDRESS}.code",
+        ),
+        (ALLOC, dict(RESULT, stateRoot="0x" + "00" * 32), "result.stateRoot"),
+        (ALLOC, dict(RESULT, rejected=[]), "result.rejected"),
+        (
+            ALLOC,
+            dict(RESULT, receipts=[dict(RESULT["receipts"][0], status="0x0")]),  # type: ignore
+            "result.receipts.0.status",
+        ),
+    ],
+)
+def test_divergence(other_alloc: Dict, other_result: Dict, expected_path: str):
+    """
+    Test that the first divergence is reported with the inputs that caused it, and that
+    the output of the reference tool is returned otherwise.
+    """
+    reference = StubTool((ALLOC, RESULT))
+    other = StubTool((other_alloc, other_result))
+    t8n = DifferentialTransitionTool(
+        reference=reference, others=[StubTool((ALLOC, RESULT)), other]  # type: ignore
+    )
+    try:
+        t8n.evaluate(alloc={}, txs=[], env={"currentNumber": "0x1"}, fork_name="Shanghai")
+    except TransitionToolDivergence as e:
+        divergence = e
+    else:
+        pytest.fail("divergence not detected")
+    finally:
+        t8n.shutdown()
+    assert divergence.path == expected_path
+    assert divergence.tool == "2-StubTool"
+    assert divergence.inputs.fork_name == "Shanghai"
+    assert '"currentNumber": "0x1"' in str(divergence)
+    assert reference.calls == other.calls == 1
+
+
+def test_no_divergence():
+    """
+    Test that the output of the reference tool is returned when all tools agree.
+    """
+    t8n = DifferentialTransitionTool(
+        reference=StubTool((ALLOC, RESULT)), others=[StubTool((ALLOC, RESULT))]  # type: ignore
+    )
+    assert t8n.evaluate(alloc={}, txs=[], env={}, fork_name="Shanghai") == (ALLOC, RESULT)
+    t8n.shutdown()
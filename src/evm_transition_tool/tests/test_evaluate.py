@@ -1,5 +1,7 @@
-import json  # noqa: D100
+import asyncio  # noqa: D100
+import json
 import os
+from dataclasses import replace
 from pathlib import Path
 from shutil import which
 from typing import Dict
@@ -7,7 +9,7 @@ from typing import Dict
 import pytest
 
 from ethereum_test_forks import Berlin, Fork, Istanbul, London
-from evm_transition_tool import GethTransitionTool, TransitionTool
+from evm_transition_tool import GethTransitionTool, TransitionTool, TransitionToolInput
 
 FIXTURES_ROOT = Path(os.path.join("src", "evm_transition_tool", "tests", "fixtures"))
 
@@ -128,3 +130,59 @@ def test_evm_t8n(t8n: TransitionTool, test_dir: str) -> None:  # noqa: D103
         print(expected.get("result"))
         assert result_alloc == expected.get("alloc")
         assert result == expected.get("result")
+
+
+@pytest.mark.parametrize("t8n", [GethTransitionTool()])
+def test_evm_t8n_batch(t8n: TransitionTool) -> None:  # noqa: D103
+    test_dirs = sorted(os.listdir(path=FIXTURES_ROOT))
+    inputs = []
+    expected_outputs = []
+    for test_dir in test_dirs:
+        input_data = {}
+        for key in ["alloc", "txs", "env"]:
+            with open(Path(FIXTURES_ROOT, test_dir, f"{key}.json"), "r") as f:
+                input_data[key] = json.load(f)
+        with open(Path(FIXTURES_ROOT, test_dir, "exp.json"), "r") as f:
+            expected_outputs.append(json.load(f))
+        env_json = input_data["env"]
+        inputs.append(
+            TransitionToolInput(
+                alloc=input_data["alloc"],
+                txs=input_data["txs"],
+                env=env_json,
+                fork_name=Berlin.fork(
+                    block_number=int(env_json["currentNumber"], 0),
+                    timestamp=int(env_json["currentTimestamp"], 0),
+                ),
+            )
+        )
+    # An invalid fork name must only fail its own transition
+    inputs.append(replace(inputs[0], fork_name="Unknown"))
+
+    outputs = t8n.evaluate_batch(inputs, max_workers=2)
+
+    assert len(outputs) == len(inputs)
+    for output, expected in zip(outputs, expected_outputs):
+        assert output.error is None
+        assert output.alloc == expected.get("alloc")
+        assert output.result == expected.get("result")
+    assert outputs[-1].error is not None
+
+
+@pytest.mark.parametrize("t8n", [GethTransitionTool()])
+def test_calc_state_root_async(t8n: TransitionTool) -> None:  # noqa: D103
+    allocs = [
+        {"0x1000000000000000000000000000000000000000": {"balance": hex(balance)}}
+        for balance in range(1, 9)
+    ]
+
+    async def calc_state_roots():
+        return await asyncio.gather(
+            *[t8n.calc_state_root_async(alloc=alloc, fork=London) for alloc in allocs]
+        )
+
+    t8n.set_async_concurrency(2)
+    async_results = asyncio.run(calc_state_roots())
+    assert [state_root for _, state_root in async_results] == [
+        t8n.calc_state_root(alloc=alloc, fork=London)[1] for alloc in allocs
+    ]
@@ -0,0 +1,73 @@
+"""
+Test the dump of the transition tool debug output.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from evm_transition_tool import DebugDumpBuffer
+from evm_transition_tool.file_utils import decompress, dump_files_to_directory
+
+FILES = {
+    "args.py": ["evm", "t8n"],
+    "input/alloc.json": {"0x1000000000000000000000000000000000000000": {"balance": "0x1"}},
+    "stdout.json": b'{"alloc":{}}',
+    "stderr.txt": "",
+    "t8n.sh+x": "#!/bin/bash\n",
+}
+
+
+def test_dump_uncompressed(tmp_path: Path):
+    """
+    Test that without compression, data is dumped as indented JSON.
+    """
+    dump_files_to_directory(str(tmp_path), FILES)
+    assert (tmp_path / "input" / "alloc.json").read_text() == json.dumps(
+        FILES["input/alloc.json"], indent=4
+    )
+    assert (tmp_path / "stdout.json").read_bytes() == FILES["stdout.json"]
+    assert os.access(tmp_path / "t8n.sh", os.X_OK)
+
+
+@pytest.mark.parametrize("compression,suffix", [("gzip", ".gz"), ("zstd", ".zst")])
+def test_dump_compressed(tmp_path: Path, compression: str, suffix: str):
+    """
+    Test that with compression, data is dumped as compressed compact JSON and text is
+    left as is.
+    """
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    dump_files_to_directory(str(tmp_path), FILES, compression=compression)
+    assert sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*.*")) == [
+        f"args.py{suffix}",
+        f"input/alloc.json{suffix}",
+        "stderr.txt",
+        f"stdout.json{suffix}",
+        "t8n.sh",
+    ]
+    alloc = decompress((tmp_path / f"input/alloc.json{suffix}").read_bytes(), compression)
+    assert json.loads(alloc) == FILES["input/alloc.json"]
+    stdout = decompress((tmp_path / f"stdout.json{suffix}").read_bytes(), compression)
+    assert stdout == FILES["stdout.json"]
+
+
+def test_dump_buffer(tmp_path: Path):
+    """
+    Test that buffered dumps are only written when flushed, and that the oldest dumps
+    are discarded when the buffer is full.
+    """
+    buffer = DebugDumpBuffer(max_size=10)
+    for i in range(3):
+        dump_files_to_directory(str(tmp_path / str(i)), {"data.txt": "12345"}, buffer=buffer)
+    assert buffer.dropped_dumps == 1
+    assert not any(tmp_path.iterdir())
+    buffer.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["1", "2"]
+
+    dump_files_to_directory(str(tmp_path / "3"), {"data.txt": "12345"}, buffer=buffer)
+    buffer.clear()
+    buffer.flush()
+    assert not (tmp_path / "3").exists()
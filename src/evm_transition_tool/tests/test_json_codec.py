@@ -0,0 +1,79 @@
+"""
+Test the JSON codec used for the transition tool inputs, outputs and fixtures.
+"""
+
+import json
+from typing import Any
+
+import pytest
+
+from evm_transition_tool import json_codec
+
+DATA = {
+    "alloc": {
+        "0x1000000000000000000000000000000000000000": {
+            "balance": "0x0de0b6b3a7640000",
+            "storage": {},
+            "nonce": 1,
+        }
+    },
+    "txs": [],
+    "big": 2**256 - 1,
+    "negative": -1,
+    "flags": [True, False, None],
+    "text": "non-ascii: é, control: \x01",
+}
+
+
+class StrSubclass(str):
+    """
+    A string type not supported by all the fast backends.
+    """
+
+    pass
+
+
+@pytest.fixture(params=["msgspec", "orjson", "json"])
+def backend(request, monkeypatch) -> str:
+    """
+    Restricts the codec to a single backend.
+    """
+    if request.param != "json":
+        pytest.importorskip(request.param)
+    for module in ("msgspec", "orjson"):
+        if module != request.param:
+            monkeypatch.setattr(json_codec, module, None)
+    return request.param
+
+
+@pytest.mark.parametrize("obj", [DATA, {"key": StrSubclass("value")}, [], {}])
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("sort_keys", [False, True])
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_encode_matches_stdlib(
+    backend: str, obj: Any, indent: Any, sort_keys: bool, ensure_ascii: bool
+):
+    """
+    Test that the output does not depend on the backend.
+    """
+    expected = json.dumps(
+        obj,
+        indent=indent,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        separators=(",", ":") if indent is None else (",", ": "),
+    ).encode()
+    assert (
+        json_codec.encode(obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii)
+        == expected
+    )
+
+
+def test_decode(backend: str):
+    """
+    Test that decoding is exact and that invalid data raises the standard library error.
+    """
+    assert json_codec.decode(json.dumps(DATA).encode()) == DATA
+    assert json_codec.decode(json.dumps(DATA)) == DATA
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.decode(b'{"alloc": ')
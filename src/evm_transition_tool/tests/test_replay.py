@@ -0,0 +1,124 @@
+"""
+Test the replay of dumped transition tool calls.
+"""
+
+import stat
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from evm_transition_tool import GethTransitionTool
+from evm_transition_tool.replay import (
+    find_dumped_calls,
+    find_regressions,
+    load_dumped_call,
+    parse_state_args,
+    percentile,
+    replay_calls,
+    summarize_replay,
+)
+
+FAKE_EVM = """\
+import json
+import sys
+
+if sys.argv[1:] == ["t8n", "--help"]:
+    print("Shanghai Cancun")
+    sys.exit(0)
+if sys.argv[1:] == ["-v"]:
+    print("evm version 1.13.0-unstable")
+    sys.exit(0)
+stdin = json.load(sys.stdin)
+state_root = "0x" + ("01" if "--state.chainid=1" in sys.argv else "02") * 32
+print(json.dumps({"alloc": stdin["alloc"], "result": {"stateRoot": state_root}, "body": "0x"}))
+"""
+
+ALLOC = {"0x1000000000000000000000000000000000000000": {"balance": "0x1"}}
+ENV = {"currentNumber": "0x1", "currentCoinbase": "0x" + "00" * 20}
+
+
+@pytest.fixture
+def geth(tmp_path: Path) -> GethTransitionTool:
+    """
+    Returns a geth tool backed by a script that outputs its input allocation.
+    """
+    script = tmp_path / "evm"
+    script.write_text(f"#!{sys.executable}\n{FAKE_EVM}")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return GethTransitionTool(binary=script)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_replay_dumped_calls(tmp_path: Path, geth: GethTransitionTool, compression: Optional[str]):
+    """
+    Test that dumped calls are read back with their inputs and outputs, and that calls
+    whose output differs from the dumped output are reported.
+    """
+    geth.debug_dump_compression = compression
+    for i, chain_id in enumerate([1, 2]):
+        geth.evaluate(
+            alloc=ALLOC,
+            txs=[],
+            env=ENV,
+            fork_name="Cancun",
+            chain_id=chain_id,
+            reward=2,
+            debug_output_path=str(tmp_path / "dump" / "test_a" / str(i)),
+        )
+    geth.debug_dump_compression = None
+
+    paths = find_dumped_calls(tmp_path / "dump")
+    assert paths == [tmp_path / "dump" / "test_a" / "0", tmp_path / "dump" / "test_a" / "1"]
+    calls = [load_dumped_call(path) for path in paths]
+    assert calls[0].input.alloc == ALLOC
+    assert calls[0].input.env == ENV
+    assert (calls[1].input.fork_name, calls[1].input.chain_id, calls[1].input.reward) == (
+        "Cancun",
+        2,
+        2,
+    )
+    assert calls[1].expected_result == {"stateRoot": "0x" + "02" * 32}
+
+    calls[1].expected_result = {"stateRoot": "0x" + "03" * 32}
+    replayed, elapsed = replay_calls(geth, calls, workers=2, repeat=2)
+    assert len(replayed) == 4
+    summary = summarize_replay(replayed, elapsed)
+    assert (summary["calls"], summary["errors"], summary["mismatches"]) == (4, 0, 2)
+    assert all(str(call.mismatch).startswith("result.stateRoot") for call in replayed[1::2])
+
+
+def test_parse_state_args():
+    """
+    Test that both forms of the `--state.*` arguments are parsed.
+    """
+    assert parse_state_args(
+        ["evmone-t8n", "--state.fork", "Cancun", "--input.alloc", "a.json", "--state.chainid=1"]
+    ) == {"fork": "Cancun", "chainid": "1"}
+
+
+def test_find_regressions():
+    """
+    Test the detection of throughput, latency and correctness regressions.
+    """
+    assert percentile([0.4, 0.1, 0.3, 0.2], 50) == 0.2
+    assert percentile([0.4, 0.1, 0.3, 0.2], 99) == 0.4
+    baseline = {
+        "calls_per_second": 100,
+        "errors": 0,
+        "mismatches": 0,
+        "latency": {"p50": 0.010, "p90": 0.020, "p99": 0.030},
+    }
+    assert find_regressions(baseline, baseline, threshold=0.1) == []
+    regressed = {
+        **baseline,
+        "calls_per_second": 85,
+        "mismatches": 1,
+        "latency": {"p50": 0.0105, "p90": 0.025, "p99": 0.030},
+    }
+    assert find_regressions(regressed, baseline, threshold=0.1) == [
+        "calls/sec 85.0 < 100.0",
+        "p90 latency 25.00ms > 20.00ms",
+        "mismatches 1 > 0",
+    ]
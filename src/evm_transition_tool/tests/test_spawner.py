@@ -0,0 +1,78 @@
+"""
+Test the pre-started transition tool processes.
+"""
+
+import sys
+import time
+from typing import List
+
+from evm_transition_tool.spawner import TransitionToolSpawner
+
+ECHO = "import sys; sys.stdout.write(sys.argv[1] + sys.stdin.read())"
+
+
+def echo_args(prefix: str) -> List[str]:
+    """
+    Returns the command of a process that outputs the prefix followed by its input.
+    """
+    return [sys.executable, "-c", ECHO, prefix]
+
+
+def wait_for_standby(spawner: TransitionToolSpawner, count: int) -> None:
+    """
+    Waits until the given number of processes are on standby.
+    """
+    for _ in range(500):
+        with spawner.lock:
+            if spawner.standby_count() == count:
+                return
+        time.sleep(0.01)
+    raise AssertionError(f"expected {count} processes on standby")
+
+
+def test_spawner():
+    """
+    Test that processes are replaced after use and only serve calls with their arguments.
+    """
+    spawner = TransitionToolSpawner(count=1, max_standby=2)
+    try:
+        result = spawner.run(echo_args("a:"), b"1")
+        assert (result.returncode, result.stdout) == (0, b"a:1")
+        wait_for_standby(spawner, 1)
+        standby_process = spawner.standby[tuple(echo_args("a:"))][0]
+
+        result = spawner.run(echo_args("a:"), b"2")
+        assert result.stdout == b"a:2"
+        assert standby_process.returncode == 0  # the standby process served the call
+        wait_for_standby(spawner, 1)
+
+        assert spawner.run(echo_args("b:"), b"3").stdout == b"b:3"
+        assert spawner.run(echo_args("c:"), b"4").stdout == b"c:4"
+        wait_for_standby(spawner, 2)
+        # The processes of the least recently used arguments were stopped
+        assert list(spawner.standby) == [tuple(echo_args("b:")), tuple(echo_args("c:"))]
+    finally:
+        spawner.shutdown()
+    assert spawner.standby_count() == 0
+
+
+def test_spawner_alternating_args():
+    """
+    Test that standby processes are kept for each of the arguments of alternating calls,
+    e.g. genesis and block calls, and serve them.
+    """
+    spawner = TransitionToolSpawner(count=1)
+    try:
+        spawner.run(echo_args("genesis:"), b"")
+        spawner.run(echo_args("block:"), b"")
+        for i in range(3):
+            for prefix in ("genesis:", "block:"):
+                wait_for_standby(spawner, 2)
+                with spawner.lock:
+                    standby_process = spawner.standby[tuple(echo_args(prefix))][0]
+                result = spawner.run(echo_args(prefix), str(i).encode())
+                assert result.stdout == f"{prefix}{i}".encode()
+                assert standby_process.returncode == 0  # the standby process served the call
+    finally:
+        spawner.shutdown()
+    assert spawner.standby_count() == 0
@@ -0,0 +1,49 @@
+"""
+Test the transition tool call timing instrumentation.
+"""
+
+from typing import List
+
+from evm_transition_tool import TransitionToolCallTiming, TransitionToolTimingReport
+from evm_transition_tool.timing import record_payload, timed_call, timed_phase
+
+
+def test_timed_call():
+    """
+    Test that phases and payloads are attributed to the call being timed.
+    """
+    timings: List[TransitionToolCallTiming] = []
+    with timed_call(timings, "London"):
+        with timed_phase("serialize"):
+            record_payload(input_size=10)
+        with timed_phase("run"):
+            record_payload(output_size=20)
+    with timed_phase("run"):  # outside of a call: ignored
+        record_payload(input_size=1)
+    with timed_call(None, "London") as call:
+        assert call is None
+
+    assert len(timings) == 1
+    assert timings[0].fork_name == "London"
+    assert set(timings[0].phases) == {"serialize", "run"}
+    assert timings[0].total >= sum(timings[0].phases.values())
+    assert (timings[0].input_size, timings[0].output_size) == (10, 20)
+
+
+def test_timing_report():
+    """
+    Test the aggregation of the timings of several tests.
+    """
+    report = TransitionToolTimingReport()
+
+    def call(fork_name: str, total: float, **phases: float):
+        return TransitionToolCallTiming(fork_name=fork_name, total=total, phases=phases).to_json()
+
+    report.add_test("test_a", [call("London", 1.0, run=0.5), call("Paris", 2.0, run=1.5)])
+    report.add_test("test_b", [call("London", 4.0, run=3.0, parse=0.5)])
+    summary = report.summary()
+    assert summary["calls"] == 3
+    assert summary["total"] == 7.0
+    assert summary["time_per_fork"] == {"London": 5.0, "Paris": 2.0}
+    assert summary["time_per_phase"] == {"run": 5.0, "parse": 0.5, "other": 1.5}
+    assert [test["nodeid"] for test in summary["slowest_tests"]] == ["test_b", "test_a"]
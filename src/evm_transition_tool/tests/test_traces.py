@@ -0,0 +1,83 @@
+"""
+Test the transition tool trace store.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from evm_transition_tool import ColumnarTrace, TraceFilter, TransactionTrace
+
+TRACE: List[Dict[str, Any]] = [
+    {"pc": 0, "op": 96, "depth": 1, "opName": "PUSH1"},
+    {"pc": 2, "op": 85, "depth": 1, "opName": "SSTORE"},
+    {"pc": 0, "op": 96, "depth": 2, "opName": "PUSH1"},
+    {"pc": 3, "op": 0, "depth": 1, "opName": "STOP"},
+    {"output": "", "gasUsed": "0x5208"},
+]
+
+
+@pytest.mark.parametrize(
+    "trace_filter,max_steps,expected_steps,expected_dropped_steps",
+    [
+        (None, None, TRACE, 0),
+        (None, 2, [TRACE[0], TRACE[1], TRACE[4]], 2),
+        (TraceFilter(opcodes=frozenset(["PUSH1"])), None, [TRACE[0], TRACE[2], TRACE[4]], 0),
+        (TraceFilter(depth=(2, 2)), None, [TRACE[2], TRACE[4]], 0),
+        (TraceFilter(pc=(1, 3)), None, [TRACE[1], TRACE[3], TRACE[4]], 0),
+        (TraceFilter(depth=(1, 1)), 1, [TRACE[0], TRACE[4]], 2),
+    ],
+)
+def test_spill(
+    tmp_path: Path,
+    trace_filter: Optional[TraceFilter],
+    max_steps: Optional[int],
+    expected_steps,
+    expected_dropped_steps: int,
+):
+    """
+    Test that spilled traces retain the filtered steps, up to the limit, and the lines
+    that are not execution steps.
+    """
+    source_path = tmp_path / "trace-0-0x01.jsonl"
+    source_path.write_text("".join(json.dumps(step) + "\n" for step in TRACE))
+    trace = TransactionTrace.spill(
+        str(source_path),
+        str(tmp_path / "spilled.jsonl"),
+        "0x01",
+        trace_filter=trace_filter,
+        max_steps=max_steps,
+    )
+    assert not source_path.exists()
+    assert list(trace) == expected_steps
+    assert list(trace) == expected_steps  # can be iterated more than once
+    assert trace.dropped_steps == expected_dropped_steps
+
+
+def test_columnar_trace(tmp_path: Path):
+    """
+    Test the queries and the on-disk format of columnar traces.
+    """
+    steps: List[Dict[str, Any]] = [
+        {**TRACE[0], "gas": "0x10", "gasCost": "0x3", "stack": []},
+        {**TRACE[1], "gas": "0xd", "gasCost": "0x4e20", "stack": ["0x1", "0x" + "ff" * 32]},
+        {**TRACE[2], "gas": 9, "gasCost": 3, "stack": ["0x2"]},
+        {**TRACE[3], "gas": "0x6", "gasCost": "0x0", "stack": []},
+        TRACE[4],
+    ]
+    trace = ColumnarTrace.from_steps(steps)
+    assert len(trace) == 4
+    assert trace.gas_per_opcode() == {"STOP": 0, "SSTORE": 0x4E20, "PUSH1": 6}
+    assert trace.max_depth() == 2
+    assert trace.stack(1) == [1, 2**256 - 1]
+    assert trace.stack(2) == [2]
+
+    trace.save(tmp_path / "trace.bin")
+    loaded = ColumnarTrace.load(tmp_path / "trace.bin")
+    assert loaded.pc == trace.pc
+    assert loaded.gas == trace.gas
+    assert loaded.stack_offsets == trace.stack_offsets
+    assert loaded.stack_buffer == trace.stack_buffer
+    assert loaded.gas_per_opcode() == trace.gas_per_opcode()
@@ -11,6 +11,8 @@ import pytest
 
 from evm_transition_tool import (
     EvmOneTransitionTool,
+    ExecutionSpecsInProcessTransitionTool,
+    ExecutionSpecsTransitionTool,
     GethTransitionTool,
     NimbusTransitionTool,
     TransitionTool,
@@ -52,6 +54,12 @@ def test_default_tool():
             "Nimbus-t8n 0.1.2\n\x1b[0m",
             NimbusTransitionTool,
         ),
+        (
+            Path("ethereum-spec-evm"),
+            "ethereum-spec-evm",
+            "ethereum-spec-evm 0.1.0",
+            ExecutionSpecsTransitionTool,
+        ),
     ],
 )
 def test_from_binary(
@@ -83,6 +91,14 @@ def test_from_binary(
     assert isinstance(TransitionTool.from_binary_path(binary_path=binary_path), expected_class)
 
 
+def test_in_process_tool_not_detected():
+    """
+    Test that the in-process execution specs tool is only used when explicitly requested.
+    """
+    assert ExecutionSpecsTransitionTool.detect_binary("ethereum-spec-evm 0.1.0")
+    assert not ExecutionSpecsInProcessTransitionTool.detect_binary("ethereum-spec-evm 0.1.0")
+
+
 def test_unknown_binary_path():
     """
     Test that `from_binary_path` raises `UnknownTransitionTool` for unknown
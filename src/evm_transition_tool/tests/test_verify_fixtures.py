@@ -0,0 +1,102 @@
+"""
+Test the verification of many fixtures per transition tool invocation.
+"""
+
+import json
+import stat
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+from evm_transition_tool import FixtureFormats, GethTransitionTool
+from evm_transition_tool.geth import split_json_documents
+
+FAKE_EVM = """\
+import json
+import sys
+
+if sys.argv[1:] == ["statetest"]:
+    for line in sys.stdin:
+        path = line.strip()
+        try:
+            tests = json.load(open(path))
+        except ValueError as e:
+            sys.exit(f"could not load {path}: {e}")
+        results = [
+            {"name": name, "pass": not name.startswith("fail"), "error": "post state mismatch"}
+            for name in tests
+        ]
+        print(json.dumps(results, indent=2))
+    if "crash_after_report" in path:
+        sys.exit("fatal error after the last report")
+elif sys.argv[1:] == ["t8n", "--help"]:
+    print("Shanghai")
+else:
+    print("evm version 1.13.0-unstable")
+"""
+
+
+@pytest.fixture
+def geth(tmp_path: Path) -> GethTransitionTool:
+    """
+    Returns a geth tool backed by a script that implements `evm statetest`.
+    """
+    script = tmp_path / "evm"
+    script.write_text(f"#!{sys.executable}\n{FAKE_EVM}")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return GethTransitionTool(binary=script)
+
+
+def test_split_json_documents():
+    """
+    Test the parsing of JSON documents output one after the other.
+    """
+    assert split_json_documents('[\n  1\n]\n{"a": []}\n[]\n') == [[1], {"a": []}, []]
+    assert split_json_documents("[1]\nFatal error\n[2]") == [[1]]
+    assert split_json_documents("") == []
+
+
+def test_verify_state_test_batch(tmp_path: Path, geth: GethTransitionTool):
+    """
+    Test that failures are attributed to the right fixture, and that verification
+    resumes after a fixture the tool cannot run.
+    """
+    fixtures: Dict[str, Optional[Dict[str, Any]]] = {
+        "passing": {"test_a": {}},
+        "failing": {"test_b": {}, "fail_test_c": {}},
+        "broken": None,
+        "passing_after_broken": {"test_d": {}},
+        "failing_after_broken": {"fail_test_e": {}},
+    }
+    fixture_paths = []
+    for name, contents in fixtures.items():
+        fixture_path = tmp_path / f"{name}.json"
+        fixture_path.write_text(json.dumps(contents) if contents is not None else "{")
+        fixture_paths.append(fixture_path)
+
+    errors = geth.verify_fixtures(FixtureFormats.STATE_TEST, fixture_paths)
+    assert set(errors) == {
+        tmp_path / "failing.json",
+        tmp_path / "broken.json",
+        tmp_path / "failing_after_broken.json",
+    }
+    assert "fail_test_c: post state mismatch" in errors[tmp_path / "failing.json"]
+    assert "test_b" not in errors[tmp_path / "failing.json"]
+    assert "could not load" in errors[tmp_path / "broken.json"]
+
+
+def test_verify_state_test_batch_exit_code(tmp_path: Path, geth: GethTransitionTool):
+    """
+    Test that a nonzero exit code raises even if the results of all the fixtures were
+    reported.
+    """
+    fixture_paths = []
+    for name in ("passing", "crash_after_report"):
+        fixture_path = tmp_path / f"{name}.json"
+        fixture_path.write_text(json.dumps({"test_a": {}}))
+        fixture_paths.append(fixture_path)
+
+    with pytest.raises(Exception, match="fatal error after the last report"):
+        geth.verify_fixtures(FixtureFormats.STATE_TEST, fixture_paths)
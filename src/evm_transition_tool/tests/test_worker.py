@@ -0,0 +1,150 @@
+"""
+Test the t8n worker protocol and worker pool.
+"""
+
+import io
+import json
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from evm_transition_tool import (
+    ExecutionSpecsTransitionTool,
+    GethTransitionTool,
+    TransitionToolWorkersNotSupported,
+    worker,
+)
+from evm_transition_tool.worker import (
+    TransitionToolWorkerError,
+    TransitionToolWorkerPool,
+    read_request,
+    read_response,
+    write_request,
+    write_response,
+)
+
+
+def test_request_framing():
+    """
+    Test that a request can be written and read back from a stream.
+    """
+    stream = io.BytesIO()
+    write_request(stream, ["--state.fork=London", "--trace"], b'{"alloc": {}}')
+    write_request(stream, [], b"")
+    stream.seek(0)
+    assert read_request(stream) == (["--state.fork=London", "--trace"], b'{"alloc": {}}')
+    assert read_request(stream) == ([], b"")
+    assert read_request(stream) is None
+
+
+def test_response_framing():
+    """
+    Test that a response can be written and read back from a stream.
+    """
+    stream = io.BytesIO()
+    write_response(stream, 1, b"out\nput", b"err")
+    stream.seek(0)
+    assert read_response(stream) == (1, b"out\nput", b"err")
+    assert read_response(stream) is None
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_reference_wrapper_pool(count: int):
+    """
+    Test the reference loop-wrapper using `cat` as one-shot tool.
+    """
+    pool = TransitionToolWorkerPool([sys.executable, worker.__file__, "cat"], count)
+    try:
+        inputs = [str(i).encode() * 1000 for i in range(20)]
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            results = list(executor.map(lambda x: pool.run([], x), inputs))
+        assert [r.stdout for r in results] == inputs
+        assert all(r.returncode == 0 for r in results)
+        failed = pool.run(["/non/existent/file"], b"")
+        assert failed.returncode != 0
+        assert failed.stderr
+    finally:
+        pool.shutdown()
+
+
+def test_worker_crash():
+    """
+    Test that a crashed worker raises an exception and is restarted.
+    """
+    pool = TransitionToolWorkerPool([sys.executable, "-c", "import sys; sys.exit(1)"])
+    try:
+        with pytest.raises(TransitionToolWorkerError):
+            pool.run([], b"")
+        with pytest.raises(TransitionToolWorkerError):
+            pool.run([], b"")
+    finally:
+        pool.shutdown()
+
+
+FAKE_EVM_TOOLS = textwrap.dedent(
+    """\
+    import json
+    import os
+
+
+    def main(args, out_file, in_file):
+        if "--fail" in args:
+            raise ValueError("invalid input")
+        print("not part of the output")
+        json.dump({"args": args, "input": in_file.read(), "pid": os.getpid()}, out_file)
+        return 0
+    """
+)
+
+
+def write_tool_binary(path: Path) -> Path:
+    """
+    Writes a Python script that prints the help of a t8n tool.
+    """
+    path.write_text(f"#!{sys.executable}\nprint('t8n --help: London')\n")
+    path.chmod(0o755)
+    return path
+
+
+def test_execution_specs_worker(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the execution-specs workers import the specs once and serve all the requests
+    with their t8n entry point.
+    """
+    specs_dir = tmp_path / "specs" / "ethereum_spec_tools"
+    specs_dir.mkdir(parents=True)
+    (specs_dir / "__init__.py").write_text("")
+    (specs_dir / "evm_tools.py").write_text(FAKE_EVM_TOOLS)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "specs"))
+    t8n = ExecutionSpecsTransitionTool(binary=write_tool_binary(tmp_path / "ethereum-spec-evm"))
+    assert t8n.t8n_worker_command() == [
+        sys.executable,
+        worker.__file__,
+        worker.EXECUTION_SPECS_FLAG,
+    ]
+    t8n.start_workers(1)
+    try:
+        assert t8n.worker_pool is not None
+        results = [t8n.worker_pool.run(["--state.fork=London"], b"{}") for _ in range(2)]
+        assert all(r.returncode == 0 for r in results)
+        outputs = [json.loads(r.stdout) for r in results]
+        assert outputs[0]["args"] == ["t8n", "--state.fork=London"]
+        assert outputs[0]["input"] == "{}"
+        assert outputs[0]["pid"] == outputs[1]["pid"]
+        failed = t8n.worker_pool.run(["--fail"], b"{}")
+        assert failed.returncode == 1
+        assert b"ValueError: invalid input" in failed.stderr
+    finally:
+        t8n.shutdown()
+
+
+def test_workers_not_supported(tmp_path: Path):
+    """
+    Test that tools without a worker mode can not be started as workers.
+    """
+    t8n = GethTransitionTool(binary=write_tool_binary(tmp_path / "evm"))
+    with pytest.raises(TransitionToolWorkersNotSupported):
+        t8n.start_workers(1)
@@ -0,0 +1,30 @@
+"""
+Test the reusable transition tool workspaces.
+"""
+
+import os
+from pathlib import Path
+
+from evm_transition_tool.workspace import TransitionToolWorkspacePool
+
+
+def test_workspace_reuse(tmp_path: Path):
+    """
+    Test that workspaces are reused, emptied between calls and removed on cleanup.
+    """
+    pool = TransitionToolWorkspacePool(str(tmp_path))
+    with pool.acquire() as workspace:
+        Path(workspace.name, "input", "alloc.json").write_text("{}")
+        Path(workspace.name, "output", "result.json").write_text("{}")
+        Path(workspace.name, "trace-0-0x01.jsonl").write_text("")
+        with pool.acquire() as concurrent_workspace:
+            assert concurrent_workspace.name != workspace.name
+    with pool.acquire() as reused_workspace:
+        assert reused_workspace.name in (workspace.name, concurrent_workspace.name)
+    assert len(pool.workspaces) == 2
+
+    assert sorted(os.listdir(workspace.name)) == ["input", "output"]
+    assert os.listdir(os.path.join(workspace.name, "output")) == []
+
+    pool.cleanup()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,172 @@
+"""
+Timing instrumentation of transition tool calls.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+@dataclass(kw_only=True)
+class TransitionToolCallTiming:
+    """
+    Timings (in seconds) and payload sizes (in bytes) of a single transition tool call.
+
+    The phases are:
+
+    - `serialize`: encoding and writing the inputs of the tool.
+    - `run`: starting the tool (or sending the request to a resident tool) and waiting
+        for its output.
+    - `parse`: reading and decoding the outputs of the tool, including debug dumps.
+    """
+
+    fork_name: str
+    total: float = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    input_size: int = 0
+    output_size: int = 0
+    cached: bool = False
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Returns the timing as JSON data.
+        """
+        return asdict(self)
+
+
+current_call: ContextVar[Optional[TransitionToolCallTiming]] = ContextVar(
+    "current_call", default=None
+)
+"""
+Timing of the transition tool call being executed in the current context, if timings
+are collected.
+"""
+
+
+@contextmanager
+def timed_call(
+    timings: Optional[List[TransitionToolCallTiming]], fork_name: str
+) -> Iterator[Optional[TransitionToolCallTiming]]:
+    """
+    Times a transition tool call and appends its timing to `timings`, unless `timings`
+    is None.
+    """
+    if timings is None:
+        yield None
+        return
+    call = TransitionToolCallTiming(fork_name=fork_name)
+    token = current_call.set(call)
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        call.total = time.perf_counter() - start
+        current_call.reset(token)
+        timings.append(call)
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """
+    Adds the time spent in the block to the given phase of the current call.
+    """
+    call = current_call.get()
+    if call is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        call.phases[name] = call.phases.get(name, 0) + time.perf_counter() - start
+
+
+def record_payload(*, input_size: int = 0, output_size: int = 0) -> None:
+    """
+    Adds to the payload sizes of the current call.
+    """
+    call = current_call.get()
+    if call is not None:
+        call.input_size += input_size
+        call.output_size += output_size
+
+
+class TransitionToolTimingReport:
+    """
+    Aggregates the transition tool call timings of the tests of a session.
+    """
+
+    tests: Dict[str, List[Dict[str, Any]]]
+
+    def __init__(self):
+        self.tests = {}
+
+    def add_test(self, nodeid: str, calls: List[Dict[str, Any]]) -> None:
+        """
+        Adds the timings (as returned by `TransitionToolCallTiming.to_json`) of the calls
+        made by a test.
+        """
+        self.tests.setdefault(nodeid, []).extend(calls)
+
+    def slowest_tests(self, count: int = 10) -> List[Tuple[str, float, int]]:
+        """
+        Returns `(nodeid, total time, number of calls)` of the tests that spent the most
+        time in the transition tool.
+        """
+        totals = [
+            (nodeid, sum(call["total"] for call in calls), len(calls))
+            for nodeid, calls in self.tests.items()
+        ]
+        return sorted(totals, key=lambda x: x[1], reverse=True)[:count]
+
+    def time_per_fork(self) -> Dict[str, float]:
+        """
+        Returns the time spent in the transition tool per fork.
+        """
+        totals: Dict[str, float] = {}
+        for calls in self.tests.values():
+            for call in calls:
+                totals[call["fork_name"]] = totals.get(call["fork_name"], 0) + call["total"]
+        return dict(sorted(totals.items(), key=lambda x: x[1], reverse=True))
+
+    def time_per_phase(self) -> Dict[str, float]:
+        """
+        Returns the time spent in each phase of the transition tool calls; `other` is the
+        time of the calls not attributed to any phase (e.g. cache lookups).
+        """
+        totals: Dict[str, float] = {}
+        for calls in self.tests.values():
+            for call in calls:
+                for phase, duration in call["phases"].items():
+                    totals[phase] = totals.get(phase, 0) + duration
+                totals["other"] = (
+                    totals.get("other", 0) + call["total"] - sum(call["phases"].values())
+                )
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns the aggregated timings as JSON data.
+        """
+        all_calls = [call for calls in self.tests.values() for call in calls]
+        return {
+            "calls": len(all_calls),
+            "cached_calls": sum(1 for call in all_calls if call["cached"]),
+            "total": sum(call["total"] for call in all_calls),
+            "input_size": sum(call["input_size"] for call in all_calls),
+            "output_size": sum(call["output_size"] for call in all_calls),
+            "time_per_phase": self.time_per_phase(),
+            "time_per_fork": self.time_per_fork(),
+            "slowest_tests": [
+                {"nodeid": nodeid, "total": total, "calls": calls}
+                for nodeid, total, calls in self.slowest_tests()
+            ],
+        }
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Returns the aggregated and per-test timings as JSON data.
+        """
+        return {"summary": self.summary(), "tests": self.tests}
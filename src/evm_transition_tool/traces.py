@@ -0,0 +1,274 @@
+"""
+Memory-bounded storage of the execution traces produced by transition tools.
+"""
+
+import os
+import shutil
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from . import json_codec
+
+COLUMNAR_TRACE_MAGIC = b"T8NTRACE"
+COLUMNAR_TRACE_VERSION = 1
+COLUMNAR_TRACE_HEADER = struct.Struct("<8sBQQI")
+"""
+Header of the columnar trace file format: magic, version, number of steps, number of
+stack words and length of the JSON-encoded opcode names.
+"""
+
+
+@dataclass(kw_only=True, frozen=True)
+class TraceFilter:
+    """
+    Selects the execution steps of a trace that are retained.
+
+    Ranges are inclusive. Lines of a trace that are not execution steps (e.g. the
+    final `{"output": ..., "gasUsed": ...}` summary) are always retained.
+    """
+
+    opcodes: Optional[FrozenSet[str]] = None
+    depth: Optional[Tuple[int, int]] = None
+    pc: Optional[Tuple[int, int]] = None
+
+    def matches(self, step: Dict[str, Any]) -> bool:
+        """
+        Returns True if the trace line must be retained.
+        """
+        if "pc" not in step:
+            return True
+        if self.opcodes is not None and step.get("opName") not in self.opcodes:
+            return False
+        if self.depth is not None and not self.depth[0] <= step["depth"] <= self.depth[1]:
+            return False
+        if self.pc is not None and not self.pc[0] <= step["pc"] <= self.pc[1]:
+            return False
+        return True
+
+
+class TransactionTrace:
+    """
+    Trace of a single transaction, stored in a JSON-lines file and read lazily.
+
+    Iterating over the trace yields one dictionary per retained line without loading
+    the whole trace into memory.
+    """
+
+    path: str
+    transaction_hash: str
+    dropped_steps: int
+
+    def __init__(self, path: str, transaction_hash: str, dropped_steps: int = 0):
+        self.path = path
+        self.transaction_hash = transaction_hash
+        self.dropped_steps = dropped_steps
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the retained lines of the trace.
+        """
+        with open(self.path, "r") as trace_file:
+            for trace_line in trace_file:
+                yield json_codec.decode(trace_line)
+
+    def columnar(self) -> "ColumnarTrace":
+        """
+        Returns the execution steps of the trace in columnar form.
+        """
+        return ColumnarTrace.from_steps(self)
+
+    @classmethod
+    def spill(
+        cls,
+        source_path: str,
+        destination_path: str,
+        transaction_hash: str,
+        trace_filter: Optional[TraceFilter] = None,
+        max_steps: Optional[int] = None,
+    ) -> "TransactionTrace":
+        """
+        Moves the trace file produced by the tool to `destination_path`, retaining at
+        most `max_steps` execution steps that match `trace_filter`. The other lines
+        are always retained.
+
+        The file is streamed line by line, so memory usage does not depend on the size
+        of the trace. Without filter nor limit, the file is simply moved.
+        """
+        if trace_filter is None and max_steps is None:
+            shutil.move(source_path, destination_path)
+            return cls(destination_path, transaction_hash)
+
+        retained_steps = 0
+        dropped_steps = 0
+        with open(source_path, "r") as source, open(destination_path, "w") as destination:
+            for trace_line in source:
+                step = json_codec.decode(trace_line)
+                if "pc" in step:
+                    if trace_filter is not None and not trace_filter.matches(step):
+                        continue
+                    if max_steps is not None and retained_steps >= max_steps:
+                        dropped_steps += 1
+                        continue
+                    retained_steps += 1
+                destination.write(trace_line)
+        os.unlink(source_path)
+        return cls(destination_path, transaction_hash, dropped_steps)
+
+
+def _to_int(value: int | str) -> int:
+    """
+    Converts a numeric trace field, which tools output either as an integer or as a
+    hex string, to an integer.
+    """
+    return value if isinstance(value, int) else int(value, 0)
+
+
+class ColumnarTrace:
+    """
+    Execution steps of a transaction trace stored column-wise in typed arrays.
+
+    Each step is a row across the `pc`, `op`, `gas`, `gas_cost` and `depth` arrays.
+    The stacks of all the steps are stored back to back in a single buffer of 32-byte
+    big-endian words, `stack_offsets[i]:stack_offsets[i + 1]` being the words of the
+    stack at step `i`. Lines of the trace that are not execution steps are skipped.
+    """
+
+    pc: array
+    op: array
+    gas: array
+    gas_cost: array
+    depth: array
+    stack_offsets: array
+    stack_buffer: bytearray
+    op_names: Dict[int, str]
+
+    def __init__(self):
+        self.pc = array("Q")
+        self.op = array("B")
+        self.gas = array("Q")
+        self.gas_cost = array("Q")
+        self.depth = array("H")
+        self.stack_offsets = array("Q", [0])
+        self.stack_buffer = bytearray()
+        self.op_names = {}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of steps in the trace.
+        """
+        return len(self.pc)
+
+    def append(self, step: Dict[str, Any]) -> None:
+        """
+        Appends an execution step, as output by the transition tool, to the trace.
+        """
+        self.pc.append(step["pc"])
+        self.op.append(step["op"])
+        self.gas.append(_to_int(step["gas"]))
+        self.gas_cost.append(_to_int(step["gasCost"]))
+        self.depth.append(step["depth"])
+        stack = step.get("stack") or []
+        for word in stack:
+            self.stack_buffer += _to_int(word).to_bytes(32, "big")
+        self.stack_offsets.append(self.stack_offsets[-1] + len(stack))
+        if "opName" in step and step["op"] not in self.op_names:
+            self.op_names[step["op"]] = step["opName"]
+
+    @classmethod
+    def from_steps(cls, steps: Iterable[Dict[str, Any]]) -> "ColumnarTrace":
+        """
+        Builds the columnar trace from the lines of a trace.
+        """
+        trace = cls()
+        for step in steps:
+            if "pc" in step:
+                trace.append(step)
+        return trace
+
+    def stack(self, index: int) -> List[int]:
+        """
+        Returns the stack at the given step, bottom first.
+        """
+        start, end = self.stack_offsets[index] * 32, self.stack_offsets[index + 1] * 32
+        return [
+            int.from_bytes(self.stack_buffer[offset : offset + 32], "big")
+            for offset in range(start, end, 32)
+        ]
+
+    def op_name(self, op: int) -> str:
+        """
+        Returns the name of the opcode, as reported by the tool.
+        """
+        return self.op_names.get(op, f"0x{op:02x}")
+
+    def gas_per_opcode(self) -> Dict[str, int]:
+        """
+        Returns the sum of the gas cost of the steps, per opcode name.
+        """
+        totals = [0] * 256
+        for op, gas_cost in zip(self.op, self.gas_cost):
+            totals[op] += gas_cost
+        return {self.op_name(op): totals[op] for op in sorted(set(self.op))}
+
+    def max_depth(self) -> int:
+        """
+        Returns the maximum call depth reached by the transaction.
+        """
+        return max(self.depth, default=0)
+
+    def _columns(self) -> List[array]:
+        """
+        Returns the typed arrays in the order they are stored on disk.
+        """
+        return [self.pc, self.op, self.gas, self.gas_cost, self.depth, self.stack_offsets]
+
+    def save(self, path: Path | str) -> None:
+        """
+        Writes the trace to a file in a compact binary format: a header followed by the
+        little-endian contents of each array and the stack buffer.
+        """
+        op_names = json_codec.encode({str(op): name for op, name in self.op_names.items()})
+        with open(path, "wb") as f:
+            f.write(
+                COLUMNAR_TRACE_HEADER.pack(
+                    COLUMNAR_TRACE_MAGIC,
+                    COLUMNAR_TRACE_VERSION,
+                    len(self),
+                    self.stack_offsets[-1],
+                    len(op_names),
+                )
+            )
+            f.write(op_names)
+            for column in self._columns():
+                if sys.byteorder == "big":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(f)
+            f.write(self.stack_buffer)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "ColumnarTrace":
+        """
+        Reads a trace written by `save`.
+        """
+        trace = cls()
+        with open(path, "rb") as f:
+            magic, version, steps, stack_words, op_names_length = COLUMNAR_TRACE_HEADER.unpack(
+                f.read(COLUMNAR_TRACE_HEADER.size)
+            )
+            if magic != COLUMNAR_TRACE_MAGIC or version != COLUMNAR_TRACE_VERSION:
+                raise Exception(f"Not a columnar trace file (version {COLUMNAR_TRACE_VERSION})")
+            trace.op_names = {
+                int(op): name for op, name in json_codec.decode(f.read(op_names_length)).items()
+            }
+            trace.stack_offsets = array("Q")
+            for column in trace._columns():
+                column.fromfile(f, steps + 1 if column is trace.stack_offsets else steps)
+                if sys.byteorder == "big":
+                    column.byteswap()
+            trace.stack_buffer = bytearray(f.read(stack_words * 32))
+        return trace
@@ -1,23 +1,40 @@
 """
 Transition tool abstract class.
 """
-import json
+import asyncio
 import os
 import shutil
 import subprocess
 import tempfile
 import textwrap
+import weakref
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import partial
 from itertools import groupby
 from pathlib import Path
 from re import Pattern
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from ethereum_test_forks import Fork
 
-from .file_utils import dump_files_to_directory, write_json_file
+from . import json_codec
+from .cache import TransitionToolCache
+from .capabilities import TransitionToolCapabilityCache
+from .file_utils import (
+    DUMP_COMPRESSION_SUFFIXES,
+    DebugDumpBuffer,
+    decompress_command,
+    dump_files_to_directory,
+    write_json_file,
+)
+from .spawner import TransitionToolSpawner
+from .timing import TransitionToolCallTiming, record_payload, timed_call, timed_phase
+from .traces import TraceFilter, TransactionTrace
+from .worker import TransitionToolWorkerPool
+from .workspace import TransitionToolWorkspace, TransitionToolWorkspacePool
 
 
 class UnknownTransitionTool(Exception):
@@ -35,6 +52,12 @@ class TransitionToolNotFoundInPath(Exception):
         super().__init__(message)
 
 
+class TransitionToolWorkersNotSupported(Exception):
+    """Exception raised if resident t8n workers are requested for a t8n that has none"""
+
+    pass
+
+
 class FixtureFormats(Enum):
     """
     Helper class to define fixture formats.
@@ -62,13 +85,48 @@ class FixtureFormats(Enum):
         return format in (cls.STATE_TEST, cls.BLOCKCHAIN_TEST)
 
 
+@dataclass(kw_only=True)
+class TransitionToolInput:
+    """
+    Inputs of a single state transition, as accepted by `TransitionTool.evaluate`.
+    """
+
+    alloc: Any
+    txs: Any
+    env: Any
+    fork_name: str
+    chain_id: int = 1
+    reward: int = 0
+    eips: Optional[List[int]] = None
+    debug_output_path: str = ""
+
+
+@dataclass(kw_only=True)
+class TransitionToolOutput:
+    """
+    Outputs of a single state transition evaluated by `TransitionTool.evaluate_batch`.
+
+    Exactly one of `error` or the pair `alloc`/`result` is set.
+    """
+
+    alloc: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+
 class TransitionTool:
     """
     Transition tool abstract base class which should be inherited by all transition tool
     implementations.
     """
 
-    traces: List[List[List[Dict]]] | None = None
+    traces: List[List[TransactionTrace]] | None = None
+    trace_dir: Optional[tempfile.TemporaryDirectory] = None
+    trace_filter: Optional[TraceFilter] = None
+    trace_max_steps: Optional[int] = None
+    """
+    Maximum number of steps retained per transaction trace.
+    """
 
     registered_tools: List[Type["TransitionTool"]] = []
     default_tool: Optional[Type["TransitionTool"]] = None
@@ -79,7 +137,44 @@ class TransitionTool:
     statetest_subcommand: Optional[str] = None
     blocktest_subcommand: Optional[str] = None
     cached_version: Optional[str] = None
+    capability_cache: TransitionToolCapabilityCache = TransitionToolCapabilityCache()
+    """
+    Process-wide cache of what is learned by probing tool binaries (detected tool class,
+    version and help output).
+    """
     t8n_use_stream: bool = True
+    t8n_worker_args: Optional[List[str]] = None
+    worker_pool: Optional[TransitionToolWorkerPool] = None
+    spawner: Optional[TransitionToolSpawner] = None
+    cache: Optional[TransitionToolCache] = None
+    workspaces: Optional[TransitionToolWorkspacePool] = None
+    workspace_root: Optional[str] = None
+    """
+    Directory where the workspaces of filesystem-mode tools are created (defaults to
+    `/dev/shm` when available).
+    """
+    timings: Optional[List[TransitionToolCallTiming]] = None
+    """
+    Timings of the calls made by the tool, collected only when set to a list.
+    """
+    async_concurrency: Optional[int] = None
+    """
+    Maximum number of concurrent asynchronous tool calls (defaults to the number of CPUs).
+    """
+    debug_dump_compression: Optional[str] = None
+    """
+    Compression (`gzip` or `zstd`) of the debug output. When set, each payload is dumped
+    once, compressed, instead of as several indented JSON files.
+    """
+    debug_dump_buffer: Optional[DebugDumpBuffer] = None
+    """
+    Buffer holding the debug output in memory until it is flushed, when set.
+    """
+    verify_fixtures_batch_size: int = 1
+    """
+    Maximum number of fixtures verified by a single invocation of the tool (see
+    `verify_fixtures`).
+    """
 
     # Abstract methods that each tool must implement
 
@@ -105,6 +200,9 @@ class TransitionTool:
             raise TransitionToolNotFoundInPath(binary=binary)
         self.binary = Path(binary)
         self.trace = trace
+        self._async_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
 
     def __init_subclass__(cls):
         """
@@ -147,6 +245,11 @@ class TransitionTool:
 
         binary = Path(binary)
 
+        tool_class_name = cls.capability_cache.get(binary, "tool_class")
+        for subclass in cls.registered_tools:
+            if subclass.__name__ == tool_class_name:
+                return subclass(binary=binary, **kwargs)
+
         # Group the tools by version flag, so we only have to call the tool once for all the
         # classes that share the same version flag
         for version_flag, subclasses in groupby(
@@ -171,6 +274,8 @@ class TransitionTool:
                 continue
             for subclass in subclasses:
                 if subclass.detect_binary(binary_output):
+                    cls.capability_cache.put(binary, "tool_class", subclass.__name__)
+                    cls.capability_cache.put(binary, "version", binary_output)
                     return subclass(binary=binary, **kwargs)
 
         raise UnknownTransitionTool(f"Unknown transition tool binary: {binary_path}")
@@ -188,6 +293,9 @@ class TransitionTool:
         """
         Return name and version of tool used to state transition
         """
+        if self.cached_version is None:
+            self.cached_version = self.capability_cache.get(self.binary, "version")
+
         if self.cached_version is None:
             result = subprocess.run(
                 [str(self.binary), self.version_flag],
@@ -198,9 +306,30 @@ class TransitionTool:
                 raise Exception("failed to evaluate: " + result.stderr.decode())
 
             self.cached_version = result.stdout.decode().strip()
+            self.capability_cache.put(self.binary, "version", self.cached_version)
 
         return self.cached_version
 
+    def get_help_string(self, args: List[str]) -> str:
+        """
+        Returns the output of the tool's help command with the given arguments (without
+        the binary), from which tools determine their supported forks.
+        """
+        help_args = " ".join(args)
+        help_string = self.capability_cache.get_help(self.binary, help_args)
+        if help_string is None:
+            try:
+                result = subprocess.run([str(self.binary)] + args, capture_output=True, text=True)
+            except subprocess.CalledProcessError as e:
+                raise Exception(
+                    "evm process unexpectedly returned a non-zero status code: " f"{e}."
+                )
+            except Exception as e:
+                raise Exception(f"Unexpected exception calling evm tool: {e}.")
+            help_string = result.stdout
+            self.capability_cache.put_help(self.binary, help_args, help_string)
+        return help_string
+
     @abstractmethod
     def is_fork_supported(self, fork: Fork) -> bool:
         """
@@ -212,15 +341,83 @@ class TransitionTool:
         """
         Perform any cleanup tasks related to the tested tool.
         """
-        pass
+        if self.cache is not None:
+            self.cache.evict()
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+        if self.spawner is not None:
+            self.spawner.shutdown()
+            self.spawner = None
+        if self.workspaces is not None:
+            self.workspaces.cleanup()
+            self.workspaces = None
+        self.reset_traces()
+
+    def t8n_command(self) -> List[str]:
+        """
+        Returns the command used to invoke the tool's t8n functionality.
+        """
+        command: List[str] = [str(self.binary)]
+        if self.t8n_subcommand:
+            command.append(self.t8n_subcommand)
+        return command
+
+    def t8n_worker_command(self) -> Optional[List[str]]:
+        """
+        Returns the command that starts a resident t8n worker process of the tool (see
+        `evm_transition_tool.worker`), or None if the tool has no worker mode.
+        """
+        if self.t8n_worker_args is None:
+            return None
+        return [str(self.binary)] + self.t8n_worker_args
+
+    def start_workers(self, count: int = 1):
+        """
+        Start a pool of resident t8n worker processes that serve all subsequent
+        `evaluate` calls.
+
+        Only tools with a native worker mode (see `t8n_worker_command`) can be started as
+        workers: serving the requests by starting a one-shot tool for each of them would
+        not save anything.
+        """
+        command = self.t8n_worker_command() if self.t8n_use_stream else None
+        if command is None:
+            raise TransitionToolWorkersNotSupported(
+                f"{self.__class__.__name__} does not support resident t8n worker processes."
+            )
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+        self.worker_pool = TransitionToolWorkerPool(command, count)
+
+    def start_spawner(self, count: int = 1):
+        """
+        Keep `count` tool processes per distinct t8n arguments started ahead of the
+        `evaluate` calls, blocked reading their stdin, to hide the startup latency of the
+        tool when each call must run in a new process (see `TransitionToolSpawner`).
+
+        Resident t8n workers (see `start_workers`) take precedence over the spawner, and
+        the spawner is not used when tracing, as the arguments of each call then differ.
+        """
+        if not self.t8n_use_stream:
+            raise Exception(
+                f"{self.__class__.__name__} does not support pre-started t8n processes as it "
+                "does not support stdin/stdout input and output."
+            )
+        if self.spawner is not None:
+            self.spawner.shutdown()
+        self.spawner = TransitionToolSpawner(count)
 
     def reset_traces(self):
         """
         Resets the internal trace storage for a new test to begin
         """
         self.traces = None
+        if self.trace_dir is not None:
+            self.trace_dir.cleanup()
+            self.trace_dir = None
 
-    def append_traces(self, new_traces: List[List[Dict]]):
+    def append_traces(self, new_traces: List[TransactionTrace]):
         """
         Appends a list of traces of a state transition to the current list
         """
@@ -228,34 +425,61 @@ class TransitionTool:
             self.traces = []
         self.traces.append(new_traces)
 
-    def get_traces(self) -> List[List[List[Dict]]] | None:
+    def get_traces(self) -> List[List[TransactionTrace]] | None:
         """
         Returns the accumulated traces
         """
         return self.traces
 
+    def dump_debug_files(self, debug_output_path: str, files: Dict[str, Any]) -> None:
+        """
+        Dumps debug output files with the tool's compression, to the debug dump buffer if
+        one is set.
+        """
+        dump_files_to_directory(
+            debug_output_path,
+            files,
+            compression=self.debug_dump_compression,
+            buffer=self.debug_dump_buffer,
+        )
+
     def collect_traces(
         self,
         receipts: List[Any],
-        temp_dir: tempfile.TemporaryDirectory,
+        temp_dir: tempfile.TemporaryDirectory | TransitionToolWorkspace,
         debug_output_path: str = "",
     ) -> None:
         """
         Collect the traces from the t8n tool output and store them in the traces list.
+
+        The trace files are moved to a directory that lives until the traces are reset,
+        applying `trace_filter` and `trace_max_steps`; their contents are only read
+        when the traces are iterated.
         """
-        traces: List[List[Dict]] = []
+        if self.trace_dir is None:
+            self.trace_dir = tempfile.TemporaryDirectory(prefix="t8n-traces-")
+        transition_number = len(self.traces) if self.traces is not None else 0
+        traces: List[TransactionTrace] = []
         for i, r in enumerate(receipts):
             trace_file_name = f"trace-{i}-{r['transactionHash']}.jsonl"
             if debug_output_path:
-                shutil.copy(
+                if self.debug_dump_compression is None and self.debug_dump_buffer is None:
+                    shutil.copy(
+                        os.path.join(temp_dir.name, trace_file_name),
+                        os.path.join(debug_output_path, trace_file_name),
+                    )
+                else:
+                    with open(os.path.join(temp_dir.name, trace_file_name), "rb") as f:
+                        self.dump_debug_files(debug_output_path, {trace_file_name: f.read()})
+            traces.append(
+                TransactionTrace.spill(
                     os.path.join(temp_dir.name, trace_file_name),
-                    os.path.join(debug_output_path, trace_file_name),
+                    os.path.join(self.trace_dir.name, f"{transition_number}-{trace_file_name}"),
+                    r["transactionHash"],
+                    trace_filter=self.trace_filter,
+                    max_steps=self.trace_max_steps,
                 )
-            with open(os.path.join(temp_dir.name, trace_file_name), "r") as trace_file:
-                tx_traces: List[Dict] = []
-                for trace_line in trace_file.readlines():
-                    tx_traces.append(json.loads(trace_line))
-                traces.append(tx_traces)
+            )
         self.append_traces(traces)
 
     @dataclass
@@ -279,11 +503,27 @@ class TransitionTool:
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Executes a transition tool using the filesystem for its inputs and outputs.
+
+        The inputs and outputs are written to a workspace that is reused by subsequent
+        calls (see `TransitionToolWorkspacePool`).
         """
-        temp_dir = tempfile.TemporaryDirectory()
-        os.mkdir(os.path.join(temp_dir.name, "input"))
-        os.mkdir(os.path.join(temp_dir.name, "output"))
+        if self.workspaces is None:
+            self.workspaces = TransitionToolWorkspacePool(self.workspace_root)
+        with self.workspaces.acquire() as workspace:
+            return self._evaluate_in_workspace(
+                workspace=workspace, t8n_data=t8n_data, debug_output_path=debug_output_path
+            )
 
+    def _evaluate_in_workspace(
+        self,
+        *,
+        workspace: TransitionToolWorkspace,
+        t8n_data: TransitionToolData,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Executes a transition tool with its inputs and outputs in the given workspace.
+        """
         input_contents = {
             "alloc": t8n_data.alloc,
             "env": t8n_data.env,
@@ -291,15 +531,16 @@ class TransitionTool:
         }
 
         input_paths = {
-            k: os.path.join(temp_dir.name, "input", f"{k}.json") for k in input_contents.keys()
+            k: os.path.join(workspace.name, "input", f"{k}.json") for k in input_contents.keys()
         }
-        for key, file_path in input_paths.items():
-            write_json_file(input_contents[key], file_path)
+        with timed_phase("serialize"):
+            for key, file_path in input_paths.items():
+                write_json_file(input_contents[key], file_path, indent=None)
+        record_payload(input_size=sum(os.path.getsize(path) for path in input_paths.values()))
 
         output_paths = {
             output: os.path.join("output", f"{output}.json") for output in ["alloc", "result"]
         }
-        output_paths["body"] = os.path.join("output", "txs.rlp")
 
         # Construct args for evmone-t8n binary
         args = [
@@ -313,13 +554,16 @@ class TransitionTool:
             "--input.txs",
             input_paths["txs"],
             "--output.basedir",
-            temp_dir.name,
+            workspace.name,
             "--output.result",
             output_paths["result"],
             "--output.alloc",
             output_paths["alloc"],
-            "--output.body",
-            output_paths["body"],
+        ]
+        if debug_output_path:
+            # The RLP of the transactions is not used, only output it for debugging
+            args += ["--output.body", os.path.join("output", "txs.rlp")]
+        args += [
             "--state.reward",
             str(t8n_data.reward),
             "--state.chainid",
@@ -329,65 +573,101 @@ class TransitionTool:
         if self.trace:
             args.append("--trace")
 
-        result = subprocess.run(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        with timed_phase("run"):
+            result = subprocess.run(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
 
         if debug_output_path:
-            if os.path.exists(debug_output_path):
-                shutil.rmtree(debug_output_path)
-            shutil.copytree(temp_dir.name, debug_output_path)
-            t8n_output_base_dir = os.path.join(debug_output_path, "t8n.sh.out")
-            t8n_call = " ".join(args)
-            for file_path in input_paths.values():  # update input paths
-                t8n_call = t8n_call.replace(
-                    os.path.dirname(file_path), os.path.join(debug_output_path, "input")
-                )
-            t8n_call = t8n_call.replace(  # use a new output path for basedir and outputs
-                temp_dir.name,
-                t8n_output_base_dir,
-            )
-            t8n_script = textwrap.dedent(
-                f"""\
-                #!/bin/bash
-                rm -rf {debug_output_path}/t8n.sh.out  # hard-coded to avoid surprises
-                mkdir -p {debug_output_path}/t8n.sh.out/output
-                {t8n_call}
-                """
-            )
-            dump_files_to_directory(
-                debug_output_path,
-                {
-                    "args.py": args,
-                    "returncode.txt": result.returncode,
-                    "stdout.txt": result.stdout.decode(),
-                    "stderr.txt": result.stderr.decode(),
-                    "t8n.sh+x": t8n_script,
-                },
-            )
+            self.dump_debug_workspace(debug_output_path, workspace, args, result)
 
         if result.returncode != 0:
             raise Exception("failed to evaluate: " + result.stderr.decode())
 
-        for key, file_path in output_paths.items():
-            output_paths[key] = os.path.join(temp_dir.name, file_path)
-
         output_contents = {}
-        for key, file_path in output_paths.items():
-            if "txs.rlp" in file_path:
-                continue
-            with open(file_path, "r+") as file:
-                output_contents[key] = json.load(file)
+        with timed_phase("parse"):
+            for key, file_path in output_paths.items():
+                with open(os.path.join(workspace.name, file_path), "rb") as file:
+                    output_contents[key] = json_codec.decode(file.read())
+        record_payload(
+            output_size=sum(
+                os.path.getsize(os.path.join(workspace.name, path))
+                for path in output_paths.values()
+            )
+        )
 
         if self.trace:
-            self.collect_traces(output_contents["result"]["receipts"], temp_dir, debug_output_path)
-
-        temp_dir.cleanup()
+            self.collect_traces(
+                output_contents["result"]["receipts"], workspace, debug_output_path
+            )
 
         return output_contents["alloc"], output_contents["result"]
 
+    def dump_debug_workspace(
+        self,
+        debug_output_path: str,
+        workspace: TransitionToolWorkspace,
+        args: List[str],
+        result: subprocess.CompletedProcess,
+    ):
+        """
+        Export debug files if requested when interacting with t8n via the filesystem.
+
+        With compression, the inputs are dumped compressed and decompressed by `t8n.sh`
+        to its output directory before running the tool.
+        """
+        t8n_output_base_dir = os.path.join(debug_output_path, "t8n.sh.out")
+        input_dir = os.path.join(debug_output_path, "input")
+        decompress_inputs = ""
+        files: Dict[str, Any] = {}
+        if self.debug_dump_compression is None and self.debug_dump_buffer is None:
+            if os.path.exists(debug_output_path):
+                shutil.rmtree(debug_output_path)
+            shutil.copytree(workspace.name, debug_output_path)
+        else:
+            for directory in ("input", "output"):
+                for entry in os.scandir(os.path.join(workspace.name, directory)):
+                    with open(entry.path, "rb") as f:
+                        files[f"{directory}/{entry.name}"] = f.read()
+        if self.debug_dump_compression is not None:
+            input_dir = os.path.join(t8n_output_base_dir, "input")
+            suffix = DUMP_COMPRESSION_SUFFIXES[self.debug_dump_compression]
+            decompress_inputs = (
+                f"mkdir -p {input_dir}\n"
+                f"for input in alloc env txs; do "
+                f"{decompress_command(self.debug_dump_compression)} "
+                f"{debug_output_path}/input/$input.json{suffix} > {input_dir}/$input.json; done"
+            )
+        t8n_call = " ".join(args)
+        # update input paths
+        t8n_call = t8n_call.replace(os.path.join(workspace.name, "input"), input_dir)
+        t8n_call = t8n_call.replace(  # use a new output path for basedir and outputs
+            workspace.name,
+            t8n_output_base_dir,
+        )
+        t8n_script = "\n".join(
+            [
+                "#!/bin/bash",
+                f"rm -rf {debug_output_path}/t8n.sh.out  # hard-coded to avoid surprises",
+                f"mkdir -p {debug_output_path}/t8n.sh.out/output",
+            ]
+            + ([decompress_inputs] if decompress_inputs else [])
+            + [t8n_call, ""]
+        )
+        self.dump_debug_files(
+            debug_output_path,
+            {
+                **files,
+                "args.py": args,
+                "returncode.txt": result.returncode,
+                "stdout.txt": result.stdout.decode(),
+                "stderr.txt": result.stderr.decode(),
+                "t8n.sh+x": t8n_script,
+            },
+        )
+
     def _evaluate_stream(
         self,
         *,
@@ -405,26 +685,59 @@ class TransitionTool:
             "txs": t8n_data.txs,
             "env": t8n_data.env,
         }
+        with timed_phase("serialize"):
+            stdin_bytes = json_codec.encode(stdin)
+        record_payload(input_size=len(stdin_bytes))
+
+        with timed_phase("run"):
+            if self.worker_pool is not None:
+                result = self.worker_pool.run(args[len(self.t8n_command()) :], stdin_bytes)
+            elif self.spawner is not None and not self.trace:
+                result = self.spawner.run(args, stdin_bytes)
+            else:
+                result = subprocess.run(
+                    args,
+                    input=stdin_bytes,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+        record_payload(output_size=len(result.stdout))
+
+        with timed_phase("parse"):
+            return self._process_stream_result(
+                temp_dir=temp_dir,
+                stdin=stdin,
+                args=args,
+                result=result,
+                debug_output_path=debug_output_path,
+            )
 
-        result = subprocess.run(
-            args,
-            input=str.encode(json.dumps(stdin)),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
+    def _process_stream_result(
+        self,
+        *,
+        temp_dir: tempfile.TemporaryDirectory,
+        stdin: Dict[str, Any],
+        args: List[str],
+        result: subprocess.CompletedProcess,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Processes the result of a transition tool that used stdin and stdout for its
+        inputs and outputs.
+        """
         self.dump_debug_stream(debug_output_path, temp_dir, stdin, args, result)
 
         if result.returncode != 0:
             raise Exception("failed to evaluate: " + result.stderr.decode())
 
-        output = json.loads(result.stdout)
+        output = json_codec.decode(result.stdout)
 
         if not all([x in output for x in ["alloc", "result", "body"]]):
             raise Exception("Malformed t8n output: missing 'alloc', 'result' or 'body'.")
 
-        if debug_output_path:
-            dump_files_to_directory(
+        # With compression, the output is already dumped once, as received from the tool
+        if debug_output_path and self.debug_dump_compression is None:
+            self.dump_debug_files(
                 debug_output_path,
                 {
                     "output/alloc.json": output["alloc"],
@@ -445,11 +758,7 @@ class TransitionTool:
         """
         Construct arguments for t8n interaction via streams
         """
-        command: list[str] = [str(self.binary)]
-        if self.t8n_subcommand:
-            command.append(self.t8n_subcommand)
-
-        args = command + [
+        args = self.t8n_command() + [
             "--input.alloc=stdin",
             "--input.txs=stdin",
             "--input.env=stdin",
@@ -476,6 +785,9 @@ class TransitionTool:
     ):
         """
         Export debug files if requested when interacting with t8n via streams
+
+        With compression, the input and the output of the tool are each dumped once,
+        compressed, and `t8n.sh` decompresses the input to the tool's stdin.
         """
         if not debug_output_path:
             return
@@ -484,6 +796,30 @@ class TransitionTool:
         t8n_output_base_dir = os.path.join(debug_output_path, "t8n.sh.out")
         if self.trace:
             t8n_call = t8n_call.replace(temp_dir.name, t8n_output_base_dir)
+        if self.debug_dump_compression is not None:
+            suffix = DUMP_COMPRESSION_SUFFIXES[self.debug_dump_compression]
+            t8n_script = textwrap.dedent(
+                f"""\
+                #!/bin/bash
+                rm -rf {debug_output_path}/t8n.sh.out  # hard-coded to avoid surprises
+                mkdir {debug_output_path}/t8n.sh.out  # unused if tracing is not enabled
+                {decompress_command(self.debug_dump_compression)} \\
+                    {debug_output_path}/stdin.json{suffix} | {t8n_call}
+                """
+            )
+            self.dump_debug_files(
+                debug_output_path,
+                {
+                    "args.py": args,
+                    "returncode.txt": result.returncode,
+                    "stdin.json": stdin,
+                    "stdout.json": result.stdout,
+                    "stderr.txt": result.stderr.decode(),
+                    "t8n.sh+x": t8n_script,
+                },
+            )
+            return
+
         t8n_script = textwrap.dedent(
             f"""\
             #!/bin/bash
@@ -492,7 +828,7 @@ class TransitionTool:
             {t8n_call} < {debug_output_path}/stdin.txt
             """
         )
-        dump_files_to_directory(
+        self.dump_debug_files(
             debug_output_path,
             {
                 "args.py": args,
@@ -507,6 +843,48 @@ class TransitionTool:
             },
         )
 
+    def _get_t8n_data(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        eips: Optional[List[int]],
+    ) -> TransitionToolData:
+        """
+        Returns the data passed to the tool for the given `evaluate` arguments.
+        """
+        if eips is not None:
+            fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
+        if int(env["currentNumber"], 0) == 0:
+            reward = -1
+        return TransitionTool.TransitionToolData(
+            alloc=alloc, txs=txs, env=env, fork_name=fork_name, chain_id=chain_id, reward=reward
+        )
+
+    def _get_cache_key(
+        self, t8n_data: TransitionToolData, debug_output_path: str
+    ) -> Optional[str]:
+        """
+        Returns the key of the evaluation in the results cache, or None if the cache
+        must not be used.
+        """
+        # Traces and debug output are side effects of running the tool, never use the cache
+        if self.cache is None or self.trace or debug_output_path:
+            return None
+        return self.cache.key(
+            self.cache.tool_id(self),
+            alloc=t8n_data.alloc,
+            txs=t8n_data.txs,
+            env=t8n_data.env,
+            fork_name=t8n_data.fork_name,
+            chain_id=t8n_data.chain_id,
+            reward=t8n_data.reward,
+        )
+
     def evaluate(
         self,
         *,
@@ -525,27 +903,231 @@ class TransitionTool:
         If a client's `t8n` tool varies from the default behavior, this method
         can be overridden.
         """
-        if eips is not None:
-            fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
-        if int(env["currentNumber"], 0) == 0:
-            reward = -1
-        t8n_data = TransitionTool.TransitionToolData(
-            alloc=alloc, txs=txs, env=env, fork_name=fork_name, chain_id=chain_id, reward=reward
+        t8n_data = self._get_t8n_data(
+            alloc=alloc,
+            txs=txs,
+            env=env,
+            fork_name=fork_name,
+            chain_id=chain_id,
+            reward=reward,
+            eips=eips,
         )
 
         if self.t8n_use_stream:
-            return self._evaluate_stream(t8n_data=t8n_data, debug_output_path=debug_output_path)
-        else:
-            return self._evaluate_filesystem(
-                t8n_data=t8n_data,
-                debug_output_path=debug_output_path,
+            return self._evaluate_cached(
+                t8n_data,
+                debug_output_path,
+                partial(
+                    self._evaluate_stream, t8n_data=t8n_data, debug_output_path=debug_output_path
+                ),
             )
+        return self._evaluate_cached(
+            t8n_data,
+            debug_output_path,
+            partial(
+                self._evaluate_filesystem, t8n_data=t8n_data, debug_output_path=debug_output_path
+            ),
+        )
 
-    def calc_state_root(
-        self, *, alloc: Any, fork: Fork, debug_output_path: str = ""
-    ) -> Tuple[Dict, bytes]:
+    def _evaluate_cached(
+        self,
+        t8n_data: TransitionToolData,
+        debug_output_path: str,
+        evaluate: Callable[[], Tuple[Dict[str, Any], Dict[str, Any]]],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Calculate the state root for the given `alloc`.
+        Times a call to the tool, returning the output of the evaluation from the results
+        cache if it is there, and storing it in the cache otherwise.
+        """
+        with timed_call(self.timings, t8n_data.fork_name) as call:
+            cache_key, cached_output = self._get_cached_output(t8n_data, debug_output_path, call)
+            if cached_output is not None:
+                return cached_output
+            output = evaluate()
+            self._put_cached_output(cache_key, output)
+            return output
+
+    def _get_cached_output(
+        self,
+        t8n_data: TransitionToolData,
+        debug_output_path: str,
+        call: Optional[TransitionToolCallTiming],
+    ) -> Tuple[Optional[str], Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        Returns the key of the evaluation in the results cache, or None if the cache must
+        not be used, and the cached output of the evaluation if it is there, in which case
+        the timed call is marked as cached.
+        """
+        cache_key = self._get_cache_key(t8n_data, debug_output_path)
+        if self.cache is None or cache_key is None:
+            return None, None
+        cached_output = self.cache.get(cache_key)
+        if cached_output is not None and call is not None:
+            call.cached = True
+        return cache_key, cached_output
+
+    def _put_cached_output(
+        self, cache_key: Optional[str], output: Tuple[Dict[str, Any], Dict[str, Any]]
+    ) -> None:
+        """
+        Stores the output of an evaluation in the results cache, unless the cache must not
+        be used for it.
+        """
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(cache_key, *output)
+
+    def evaluate_batch(
+        self, inputs: List[TransitionToolInput], max_workers: Optional[int] = None
+    ) -> List[TransitionToolOutput]:
+        """
+        Evaluates many independent state transitions.
+
+        The transitions are executed concurrently by a bounded pool of threads,
+        each of which calls `evaluate`. When resident t8n workers are running
+        (see `start_workers`), the transitions are distributed among them, so
+        many transitions are run per tool process; the default number of threads
+        then matches the number of workers.
+
+        The outputs are returned in the order of the inputs. An exception raised
+        while evaluating one transition is returned in its output's `error` field
+        and does not affect the other transitions.
+
+        Tracing relies on the order of the calls, so transitions are evaluated
+        sequentially when it is enabled.
+        """
+
+        def evaluate_one(t8n_input: TransitionToolInput) -> TransitionToolOutput:
+            try:
+                alloc, result = self.evaluate(
+                    alloc=t8n_input.alloc,
+                    txs=t8n_input.txs,
+                    env=t8n_input.env,
+                    fork_name=t8n_input.fork_name,
+                    chain_id=t8n_input.chain_id,
+                    reward=t8n_input.reward,
+                    eips=t8n_input.eips,
+                    debug_output_path=t8n_input.debug_output_path,
+                )
+            except Exception as e:
+                return TransitionToolOutput(error=e)
+            return TransitionToolOutput(alloc=alloc, result=result)
+
+        if self.trace:
+            return [evaluate_one(t8n_input) for t8n_input in inputs]
+
+        if max_workers is None:
+            max_workers = len(self.worker_pool) if self.worker_pool else os.cpu_count()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(evaluate_one, inputs))
+
+    def set_async_concurrency(self, limit: int):
+        """
+        Sets the maximum number of concurrent asynchronous tool calls.
+        """
+        self.async_concurrency = limit
+        self._async_semaphores.clear()
+
+    def async_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore that limits the concurrent asynchronous tool calls in
+        the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_semaphores:
+            self._async_semaphores[loop] = asyncio.Semaphore(
+                self.async_concurrency or os.cpu_count() or 1
+            )
+        return self._async_semaphores[loop]
+
+    async def evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Asynchronous variant of `evaluate`.
+
+        At most `async_concurrency` calls run at the same time. Tools that use
+        stdin and stdout are run with `asyncio.create_subprocess_exec`; other
+        tools (and resident t8n workers or pre-started processes) run the blocking
+        `evaluate` in a thread.
+        """
+        async with self.async_semaphore():
+            if not self.t8n_use_stream or self.worker_pool is not None or self.spawner is not None:
+                return await asyncio.to_thread(
+                    self.evaluate,
+                    alloc=alloc,
+                    txs=txs,
+                    env=env,
+                    fork_name=fork_name,
+                    chain_id=chain_id,
+                    reward=reward,
+                    eips=eips,
+                    debug_output_path=debug_output_path,
+                )
+
+            t8n_data = self._get_t8n_data(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                eips=eips,
+            )
+
+            with timed_call(self.timings, t8n_data.fork_name) as call:
+                cache_key, cached_output = self._get_cached_output(
+                    t8n_data, debug_output_path, call
+                )
+                if cached_output is not None:
+                    return cached_output
+
+                temp_dir = tempfile.TemporaryDirectory()
+                args = self.construct_args_stream(t8n_data, temp_dir)
+                stdin = {
+                    "alloc": t8n_data.alloc,
+                    "txs": t8n_data.txs,
+                    "env": t8n_data.env,
+                }
+                with timed_phase("serialize"):
+                    stdin_bytes = json_codec.encode(stdin)
+                record_payload(input_size=len(stdin_bytes))
+                with timed_phase("run"):
+                    process = await asyncio.create_subprocess_exec(
+                        *args,
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    stdout, stderr = await process.communicate(stdin_bytes)
+                assert process.returncode is not None
+                record_payload(output_size=len(stdout))
+                with timed_phase("parse"):
+                    output = self._process_stream_result(
+                        temp_dir=temp_dir,
+                        stdin=stdin,
+                        args=args,
+                        result=subprocess.CompletedProcess(
+                            args, process.returncode, stdout, stderr
+                        ),
+                        debug_output_path=debug_output_path,
+                    )
+
+                self._put_cached_output(cache_key, output)
+                return output
+
+    @staticmethod
+    def _get_state_root_env(fork: Fork) -> Dict[str, Any]:
+        """
+        Returns the environment used to calculate the state root of an allocation.
         """
         env: Dict[str, Any] = {
             "currentCoinbase": "0x0000000000000000000000000000000000000000",
@@ -572,17 +1154,47 @@ class TransitionTool:
                 "parentBeaconBlockRoot"
             ] = "0x0000000000000000000000000000000000000000000000000000000000000000"
 
+        return env
+
+    @staticmethod
+    def _get_state_root(result: Dict[str, Any]) -> bytes:
+        """
+        Returns the state root from the result of the transition tool.
+        """
+        state_root = result.get("stateRoot")
+        if state_root is None or not isinstance(state_root, str):
+            raise Exception("Unable to calculate state root")
+        return bytes.fromhex(state_root[2:])
+
+    def calc_state_root(
+        self, *, alloc: Any, fork: Fork, debug_output_path: str = ""
+    ) -> Tuple[Dict, bytes]:
+        """
+        Calculate the state root for the given `alloc`.
+        """
         new_alloc, result = self.evaluate(
             alloc=alloc,
             txs=[],
-            env=env,
+            env=self._get_state_root_env(fork),
             fork_name=fork.fork(block_number=0, timestamp=0),
             debug_output_path=debug_output_path,
         )
-        state_root = result.get("stateRoot")
-        if state_root is None or not isinstance(state_root, str):
-            raise Exception("Unable to calculate state root")
-        return new_alloc, bytes.fromhex(state_root[2:])
+        return new_alloc, self._get_state_root(result)
+
+    async def calc_state_root_async(
+        self, *, alloc: Any, fork: Fork, debug_output_path: str = ""
+    ) -> Tuple[Dict, bytes]:
+        """
+        Asynchronous variant of `calc_state_root`.
+        """
+        new_alloc, result = await self.evaluate_async(
+            alloc=alloc,
+            txs=[],
+            env=self._get_state_root_env(fork),
+            fork_name=fork.fork(block_number=0, timestamp=0),
+            debug_output_path=debug_output_path,
+        )
+        return new_alloc, self._get_state_root(result)
 
     def verify_fixture(
         self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
@@ -595,3 +1207,34 @@ class TransitionTool:
         raise Exception(
             "The `verify_fixture()` function is not supported by this tool. Use geth's evm tool."
         )
+
+    def verify_fixtures(
+        self, fixture_format: FixtureFormats, fixture_paths: List[Path]
+    ) -> Dict[Path, str]:
+        """
+        Verifies many fixtures of the same format, without debug output.
+
+        Returns the error of each fixture that failed verification; a failure does not
+        stop the verification of the other fixtures. At most `verify_fixtures_batch_size`
+        fixtures should be passed per call.
+        """
+        errors: Dict[Path, str] = {}
+        for fixture_path in fixture_paths:
+            try:
+                self.verify_fixture(fixture_format, fixture_path, None)
+            except Exception as e:
+                errors[fixture_path] = str(e)
+        return errors
+
+    async def verify_fixture_async(
+        self, fixture_format: FixtureFormats, fixture_path: Path, debug_output_path: Optional[Path]
+    ):
+        """
+        Asynchronous variant of `verify_fixture`.
+
+        Runs the blocking `verify_fixture` in a thread unless overridden by the tool.
+        """
+        async with self.async_semaphore():
+            await asyncio.to_thread(
+                self.verify_fixture, fixture_format, fixture_path, debug_output_path
+            )
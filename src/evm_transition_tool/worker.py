@@ -0,0 +1,304 @@
+r"""
+Long-lived t8n worker processes.
+
+A worker is a resident process that serves many t8n requests over a framed
+stdin/stdout protocol, so that the tool binary does not have to be started
+once per state transition.
+
+Protocol (all integers are ASCII decimal, the header line is terminated by `\n`):
+
+- Request: `<args_length> <input_length>\n`, followed by `args_length` bytes
+  containing a JSON list of the t8n command-line arguments and `input_length`
+  bytes containing the data that would be written to the tool's stdin.
+- Response: `<returncode> <stdout_length> <stderr_length>\n`, followed by
+  `stdout_length` bytes of the tool's stdout and `stderr_length` bytes of
+  the tool's stderr.
+
+Tools that natively support this protocol can declare the command-line
+arguments that start them in worker mode via
+`TransitionTool.t8n_worker_args`. This module also implements the worker mode
+of the execution-specs t8n, which imports `ethereum_spec_tools` once and calls
+its t8n entry point for each request:
+
+```console
+python -m evm_transition_tool.worker --execution-specs
+```
+
+Other arguments are the command of a one-shot tool, run once per request by
+a reference loop-wrapper. The wrapper only serves to exercise the protocol: as it
+still starts the tool for every request it is not faster than calling the tool
+directly, and tools without a native worker mode can not be started as workers.
+
+```console
+python -m evm_transition_tool.worker evm t8n
+```
+"""
+
+import json
+import queue
+import subprocess
+import sys
+import tempfile
+import traceback
+from io import StringIO
+from typing import IO, Callable, List, Optional, Tuple
+
+EXECUTION_SPECS_FLAG = "--execution-specs"
+
+
+def read_request(stream: IO[bytes]) -> Optional[Tuple[List[str], bytes]]:
+    """
+    Read a request frame from the stream, returns `None` when the stream is closed.
+    """
+    header = stream.readline()
+    if not header:
+        return None
+    args_length, input_length = (int(x) for x in header.split())
+    args = json.loads(stream.read(args_length))
+    return args, stream.read(input_length)
+
+
+def write_request(stream: IO[bytes], args: List[str], input: bytes) -> None:
+    """
+    Write a request frame to the stream.
+    """
+    args_bytes = json.dumps(args).encode()
+    stream.write(b"%d %d\n" % (len(args_bytes), len(input)))
+    stream.write(args_bytes)
+    stream.write(input)
+    stream.flush()
+
+
+def read_response(stream: IO[bytes]) -> Optional[Tuple[int, bytes, bytes]]:
+    """
+    Read a response frame from the stream, returns `None` when the stream is closed.
+    """
+    header = stream.readline()
+    if not header:
+        return None
+    returncode, stdout_length, stderr_length = (int(x) for x in header.split())
+    stdout = stream.read(stdout_length)
+    stderr = stream.read(stderr_length)
+    if len(stdout) != stdout_length or len(stderr) != stderr_length:
+        return None
+    return returncode, stdout, stderr
+
+
+def write_response(stream: IO[bytes], returncode: int, stdout: bytes, stderr: bytes) -> None:
+    """
+    Write a response frame to the stream.
+    """
+    stream.write(b"%d %d %d\n" % (returncode, len(stdout), len(stderr)))
+    stream.write(stdout)
+    stream.write(stderr)
+    stream.flush()
+
+
+class TransitionToolWorkerError(Exception):
+    """
+    Exception raised if a t8n worker process exits unexpectedly.
+    """
+
+    pass
+
+
+class TransitionToolWorker:
+    """
+    A single resident t8n worker process.
+    """
+
+    command: List[str]
+    process: subprocess.Popen
+    stderr_file: IO[bytes]
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.start()
+
+    def start(self) -> None:
+        """
+        Start the worker process.
+        """
+        # The worker's own stderr goes to a file instead of a pipe to avoid blocking the
+        # process when nobody reads it; it is only used to report crashes.
+        self.stderr_file = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.stderr_file,
+        )
+
+    def stop(self) -> None:
+        """
+        Stop the worker process.
+        """
+        if self.process.poll() is None:
+            assert self.process.stdin is not None
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        self.stderr_file.close()
+
+    def restart(self) -> None:
+        """
+        Restart the worker process.
+        """
+        self.stop()
+        self.start()
+
+    def run(self, args: List[str], input: bytes) -> subprocess.CompletedProcess:
+        """
+        Send a request to the worker and wait for its response.
+        """
+        assert self.process.stdin is not None and self.process.stdout is not None
+        response = None
+        try:
+            write_request(self.process.stdin, args, input)
+            response = read_response(self.process.stdout)
+        except OSError:
+            pass
+        if response is None:
+            self.process.kill()
+            self.process.wait()
+            self.stderr_file.seek(0)
+            worker_stderr = self.stderr_file.read().decode(errors="replace")
+            self.restart()
+            raise TransitionToolWorkerError(
+                f"t8n worker '{' '.join(self.command)}' exited unexpectedly: {worker_stderr}"
+            )
+        returncode, stdout, stderr = response
+        return subprocess.CompletedProcess(
+            args=args, returncode=returncode, stdout=stdout, stderr=stderr
+        )
+
+
+class TransitionToolWorkerPool:
+    """
+    A pool of resident t8n worker processes that can be shared between threads.
+    """
+
+    workers: List[TransitionToolWorker]
+    idle_workers: "queue.Queue[TransitionToolWorker]"
+
+    def __init__(self, command: List[str], count: int = 1):
+        assert count > 0, "the worker pool must contain at least one worker"
+        self.workers = [TransitionToolWorker(command) for _ in range(count)]
+        self.idle_workers = queue.Queue()
+        for worker in self.workers:
+            self.idle_workers.put(worker)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of workers in the pool.
+        """
+        return len(self.workers)
+
+    def run(self, args: List[str], input: bytes) -> subprocess.CompletedProcess:
+        """
+        Run a t8n request on the next idle worker of the pool.
+        """
+        worker = self.idle_workers.get()
+        try:
+            return worker.run(args, input)
+        finally:
+            self.idle_workers.put(worker)
+
+    def shutdown(self) -> None:
+        """
+        Stop all the workers in the pool.
+        """
+        for worker in self.workers:
+            worker.stop()
+
+
+def run_execution_specs_t8n(
+    main: Callable[..., Optional[int]], args: List[str], input: str
+) -> Tuple[int, str, str]:
+    """
+    Calls the `main` entry point of `ethereum_spec_tools.evm_tools` with the given
+    command-line arguments (e.g. `t8n ...`) and input, returns its return code, its output
+    and the traceback of the exception it raised, if any.
+    """
+    out_file = StringIO()
+    stderr = ""
+    try:
+        returncode = main(args, out_file, StringIO(input))
+    except SystemExit as e:  # raised by argparse on invalid arguments
+        returncode = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        returncode = 1
+        stderr = traceback.format_exc()
+    return returncode or 0, out_file.getvalue(), stderr
+
+
+def serve(run: Callable[[List[str], bytes], Tuple[int, bytes, bytes]]) -> None:
+    """
+    Serve the framed requests read from stdin with the given function until stdin is
+    closed, writing the responses to stdout.
+    """
+    requests, responses = sys.stdin.buffer, sys.stdout.buffer
+    # Anything printed while serving a request must not corrupt the responses
+    sys.stdout = sys.stderr
+    while (request := read_request(requests)) is not None:
+        write_response(responses, *run(*request))
+
+
+def serve_execution_specs() -> None:
+    """
+    Worker mode of the execution-specs t8n: the specs are imported once, in the
+    interpreter running the worker, and serve all the requests.
+    """
+    from ethereum_spec_tools.evm_tools import main as evm_tools_main
+
+    def run(args: List[str], input: bytes) -> Tuple[int, bytes, bytes]:
+        returncode, stdout, stderr = run_execution_specs_t8n(
+            evm_tools_main, ["t8n"] + args, input.decode()
+        )
+        return returncode, stdout.encode(), stderr.encode()
+
+    serve(run)
+
+
+def serve_one_shot(command: List[str]) -> None:
+    """
+    Reference loop-wrapper: serve the requests by running a one-shot tool for each of them.
+    """
+
+    def run(args: List[str], input: bytes) -> Tuple[int, bytes, bytes]:
+        result = subprocess.run(
+            command + args,
+            input=input,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return result.returncode, result.stdout, result.stderr
+
+    serve(run)
+
+
+def main():
+    """
+    Serve framed t8n requests with the execution-specs t8n (`--execution-specs`) or by
+    calling a one-shot tool, whose command is given as command-line arguments, e.g.
+    `evm t8n`.
+    """
+    command = sys.argv[1:]
+    if not command:
+        print(
+            "usage: python -m evm_transition_tool.worker "
+            f"({EXECUTION_SPECS_FLAG} | <t8n-command>...)",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    if command == [EXECUTION_SPECS_FLAG]:
+        serve_execution_specs()
+    else:
+        serve_one_shot(command)
+
+
+if __name__ == "__main__":
+    main()
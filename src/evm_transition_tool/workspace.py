@@ -0,0 +1,99 @@
+"""
+Reusable working directories for transition tools that use the filesystem for their
+inputs and outputs.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+RAM_BACKED_DIRECTORY = "/dev/shm"
+
+
+def default_workspace_root() -> Optional[str]:
+    """
+    Returns the directory where workspaces are created by default: the RAM-backed
+    `/dev/shm` when available, otherwise the default temporary directory.
+    """
+    if os.path.isdir(RAM_BACKED_DIRECTORY) and os.access(RAM_BACKED_DIRECTORY, os.W_OK):
+        return RAM_BACKED_DIRECTORY
+    return None
+
+
+class TransitionToolWorkspace:
+    """
+    A working directory, with `input` and `output` subdirectories, that is reused by
+    consecutive transition tool calls.
+    """
+
+    name: str
+
+    def __init__(self, root: Optional[str] = None):
+        self.name = tempfile.mkdtemp(prefix="t8n-workspace-", dir=root)
+        os.mkdir(os.path.join(self.name, "input"))
+        os.mkdir(os.path.join(self.name, "output"))
+
+    def clear(self) -> None:
+        """
+        Removes the files left by the previous call, keeping the directory structure.
+        """
+        for directory in (self.name, os.path.join(self.name, "output")):
+            for entry in os.scandir(directory):
+                if entry.is_file():
+                    os.unlink(entry.path)
+                elif entry.name not in ("input", "output"):
+                    shutil.rmtree(entry.path)
+
+    def cleanup(self) -> None:
+        """
+        Removes the workspace.
+        """
+        shutil.rmtree(self.name, ignore_errors=True)
+
+
+class TransitionToolWorkspacePool:
+    """
+    Workspaces of a transition tool, one per concurrent call, created on demand.
+    """
+
+    root: Optional[str]
+    workspaces: List[TransitionToolWorkspace]
+    idle_workspaces: List[TransitionToolWorkspace]
+    lock: threading.Lock
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root if root is not None else default_workspace_root()
+        self.workspaces = []
+        self.idle_workspaces = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[TransitionToolWorkspace]:
+        """
+        Provides an empty workspace for the duration of a call.
+        """
+        with self.lock:
+            if self.idle_workspaces:
+                workspace = self.idle_workspaces.pop()
+            else:
+                workspace = TransitionToolWorkspace(self.root)
+                self.workspaces.append(workspace)
+        try:
+            yield workspace
+        finally:
+            workspace.clear()
+            with self.lock:
+                self.idle_workspaces.append(workspace)
+
+    def cleanup(self) -> None:
+        """
+        Removes all the workspaces.
+        """
+        with self.lock:
+            for workspace in self.workspaces:
+                workspace.cleanup()
+            self.workspaces = []
+            self.idle_workspaces = []
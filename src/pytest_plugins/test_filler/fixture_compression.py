@@ -0,0 +1,330 @@
+"""
+Compressed fixture output: fixture files compressed with gzip or zstd, optionally with a
+zstd dictionary trained on the fixtures, and the reading of the compressed files.
+
+example: Reading a fixture file
+    ```python
+    reader = FixtureFileReader(Path("fixtures"))
+    for fixture_path in find_fixture_files(Path("fixtures")):
+        fixtures = json_codec.decode(reader.read(fixture_path))
+    ```
+
+Compressed fixture files get the suffix of their compression (`.json.gz` or
+`.json.zst`). Each dictionary is written to the root of the output directory as
+`dictionary-<writer>.zdict`, and is identified by the id recorded in the frame of
+each file compressed with it.
+"""
+
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO, ByteString, Callable, Dict, List, Optional
+
+from evm_transition_tool.file_utils import (
+    DUMP_COMPRESSION_SUFFIXES,
+    decompress,
+    open_compressed,
+    zstandard,
+)
+
+FIXTURE_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 9}
+"""
+Compression level of the fixture files, which are written once and downloaded many
+times, per supported compression.
+"""
+
+DICTIONARY_GLOB = "dictionary-*.zdict"
+DICTIONARY_SAMPLES = 1000
+DICTIONARY_SIZE = 112 * 1024
+DICTIONARY_SAMPLE_SIZE = 100 * DICTIONARY_SIZE
+"""
+Maximum size of the writes the dictionary is trained on, which are held in memory until
+it is trained.
+"""
+
+
+def fixture_file_compression(fixture_path: Path) -> Optional[str]:
+    """
+    Returns the compression of a fixture file, from its suffix, or None if it is a
+    plain JSON file.
+    """
+    for compression, suffix in DUMP_COMPRESSION_SUFFIXES.items():
+        if fixture_path.name.endswith(f".json{suffix}"):
+            return compression
+    return None
+
+
+def is_fixture_file(path: Path) -> bool:
+    """
+    Returns whether the path is a JSON fixture file, compressed or not.
+    """
+    return path.suffix == ".json" or fixture_file_compression(path) is not None
+
+
+def find_fixture_files(directory: Path) -> List[Path]:
+    """
+    Returns the fixture files of a directory and its subdirectories, compressed or not.
+    """
+    return sorted(path for path in directory.rglob("*.json*") if is_fixture_file(path))
+
+
+def uncompressed_name(fixture_path: Path) -> str:
+    """
+    Returns the name of the fixture file without the suffix of its compression.
+    """
+    compression = fixture_file_compression(fixture_path)
+    if compression is None:
+        return fixture_path.name
+    return fixture_path.name[: -len(DUMP_COMPRESSION_SUFFIXES[compression])]
+
+
+class DeferredFixtureFile:
+    """
+    Fixture file whose writes are held in memory until the compressor has a dictionary
+    to compress it with.
+    """
+
+    compressor: "FixtureFileCompressor"
+    fixture_path: Path
+    chunks: List[bytes]
+    file: Optional[BinaryIO]
+    closed: bool
+    on_written: List[Callable[[], None]]
+
+    def __init__(self, compressor: "FixtureFileCompressor", fixture_path: Path):
+        self.compressor = compressor
+        self.fixture_path = fixture_path
+        self.chunks = []
+        self.file = None
+        self.closed = False
+        self.on_written = []
+
+    def write(self, data: bytes) -> int:
+        """
+        Writes to the file, or holds the data until the dictionary is trained.
+        """
+        if self.file is not None:
+            return self.file.write(data)
+        self.chunks.append(data)
+        self.compressor.add_sample(data)
+        return len(data)
+
+    def close(self) -> None:
+        """
+        Closes the file, or marks it to be closed once it is written.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.run_on_written()
+        else:
+            self.closed = True
+
+    def open(self) -> None:
+        """
+        Opens the compressed file and writes the data held so far.
+        """
+        self.file = self.compressor.open_file(self.fixture_path)
+        for chunk in self.chunks:
+            self.file.write(chunk)
+        self.chunks = []
+        if self.closed:
+            self.file.close()
+            self.run_on_written()
+
+    def run_on_written(self) -> None:
+        """
+        Runs the callbacks waiting for the file to be written.
+        """
+        callbacks, self.on_written = self.on_written, []
+        for callback in callbacks:
+            callback()
+
+
+class FixtureFileCompressor:
+    """
+    Opens the fixture files to write them compressed with `gzip` or `zstd`.
+
+    With `dictionary_name` (zstd only), a dictionary is trained on the first
+    `dictionary_samples` writes, i.e. fixtures, or on the first `dictionary_sample_size`
+    bytes if they are reached first, and used to compress all the files: the files opened
+    before it is trained are held in memory and written once it is, so that at most the
+    sample is held in memory. The
+    dictionary is trained with the writes made so far when the compressor is closed, if
+    there were not enough of them; if training fails, e.g. with too few fixtures, the
+    files are compressed without a dictionary.
+    """
+
+    output_dir: Path
+    compression: str
+    dictionary_name: Optional[str]
+    dictionary_samples: int
+    dictionary_sample_size: int
+    dictionary: Optional[bytes]
+    trained: bool
+    samples: List[ByteString]
+    sample_size: int
+    deferred_files: Dict[Path, DeferredFixtureFile]
+
+    def __init__(
+        self,
+        output_dir: Path,
+        compression: str,
+        dictionary_name: Optional[str] = None,
+        dictionary_samples: int = DICTIONARY_SAMPLES,
+        dictionary_sample_size: int = DICTIONARY_SAMPLE_SIZE,
+    ):
+        if dictionary_name is not None and compression != "zstd":
+            raise Exception("Compression dictionaries require zstd compression.")
+        if compression == "zstd" and zstandard is None:
+            raise Exception("zstd compression requires the `zstandard` package.")
+        self.output_dir = output_dir
+        self.compression = compression
+        self.dictionary_name = dictionary_name
+        self.dictionary_samples = dictionary_samples
+        self.dictionary_sample_size = dictionary_sample_size
+        self.dictionary = None
+        self.trained = False
+        self.samples = []
+        self.sample_size = 0
+        self.deferred_files = {}
+
+    def training(self) -> bool:
+        """
+        Returns whether writes are held until a dictionary is trained.
+        """
+        return self.dictionary_name is not None and not self.trained
+
+    def compressed_path(self, fixture_path: Path) -> Path:
+        """
+        Returns the path of the compressed file of a fixture file.
+        """
+        return fixture_path.with_name(
+            fixture_path.name + DUMP_COMPRESSION_SUFFIXES[self.compression]
+        )
+
+    def open(self, fixture_path: Path) -> BinaryIO:
+        """
+        Opens the compressed file of a fixture file for writing.
+        """
+        if not self.training():
+            return self.open_file(fixture_path)
+        deferred_file = DeferredFixtureFile(self, fixture_path)
+        self.deferred_files[fixture_path] = deferred_file
+        return deferred_file  # type: ignore
+
+    def open_file(self, fixture_path: Path) -> BinaryIO:
+        """
+        Opens the compressed file, with the dictionary if one was trained.
+        """
+        return open_compressed(
+            str(self.compressed_path(fixture_path)),
+            self.compression,
+            FIXTURE_COMPRESSION_LEVELS[self.compression],
+            self.dictionary,
+        )
+
+    def when_written(self, fixture_path: Path, callback: Callable[[], None]) -> None:
+        """
+        Runs the callback once the fixture file is written and closed: immediately,
+        unless the file is held until the dictionary is trained.
+        """
+        deferred_file = self.deferred_files.get(fixture_path)
+        if deferred_file is None or deferred_file.file is not None:
+            callback()
+        else:
+            deferred_file.on_written.append(callback)
+
+    def add_sample(self, data: bytes) -> None:
+        """
+        Adds a write to the training samples, training the dictionary once there are
+        enough of them or once they reach the maximum sample size.
+        """
+        self.samples.append(data)
+        self.sample_size += len(data)
+        if (
+            len(self.samples) >= self.dictionary_samples
+            or self.sample_size >= self.dictionary_sample_size
+        ):
+            self.train()
+
+    def train(self) -> None:
+        """
+        Trains the dictionary, writes it to the output directory and writes the files
+        held until then.
+        """
+        assert self.dictionary_name is not None
+        dictionary_id = (zlib.crc32(self.dictionary_name.encode()) & 0x7FFFFFFF) | 0x8000
+        try:
+            trained = zstandard.train_dictionary(
+                DICTIONARY_SIZE, self.samples, dict_id=dictionary_id
+            )
+        except zstandard.ZstdError:
+            self.dictionary = None
+        else:
+            self.dictionary = trained.as_bytes()
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            dictionary_path = self.output_dir / DICTIONARY_GLOB.replace("*", self.dictionary_name)
+            dictionary_path.write_bytes(self.dictionary)
+        self.trained = True
+        self.samples = []
+        self.sample_size = 0
+        deferred_files, self.deferred_files = self.deferred_files, {}
+        for deferred_file in deferred_files.values():
+            deferred_file.open()
+
+    def close(self) -> None:
+        """
+        Trains the dictionary, if it was not trained yet, and writes the files held until
+        then.
+        """
+        if self.training():
+            self.train()
+
+
+class FixtureFileReader:
+    """
+    Reads fixture files, decompressing the compressed files with the dictionaries of the
+    output directory they were written to.
+    """
+
+    dictionary_dir: Path
+    dictionaries: Dict[int, bytes]
+    lock: threading.Lock
+
+    def __init__(self, dictionary_dir: Path):
+        self.dictionary_dir = dictionary_dir
+        self.dictionaries = {}
+        self.lock = threading.Lock()
+
+    def get_dictionary(self, dictionary_id: int) -> bytes:
+        """
+        Returns the dictionary with the given id, reading the dictionaries of the
+        directory if it was not read yet.
+        """
+        with self.lock:
+            if dictionary_id not in self.dictionaries:
+                for dictionary_path in self.dictionary_dir.glob(DICTIONARY_GLOB):
+                    dictionary = dictionary_path.read_bytes()
+                    self.dictionaries[
+                        zstandard.ZstdCompressionDict(dictionary).dict_id()
+                    ] = dictionary
+            if dictionary_id not in self.dictionaries:
+                raise Exception(
+                    f"Compression dictionary {dictionary_id} not found in {self.dictionary_dir}."
+                )
+            return self.dictionaries[dictionary_id]
+
+    def read(self, fixture_path: Path) -> bytes:
+        """
+        Returns the JSON contents of a fixture file, compressed or not.
+        """
+        data = fixture_path.read_bytes()
+        compression = fixture_file_compression(fixture_path)
+        if compression is None:
+            return data
+        dictionary: Optional[bytes] = None
+        if compression == "zstd":
+            dictionary_id = zstandard.get_frame_parameters(data).dict_id
+            if dictionary_id:
+                dictionary = self.get_dictionary(dictionary_id)
+        return decompress(data, compression, dictionary)
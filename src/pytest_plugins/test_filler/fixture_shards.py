@@ -0,0 +1,175 @@
+"""
+Sharded fixture output: size-bounded shards of newline-delimited fixtures, and an index
+giving the location of each fixture so that it can be read without reading the rest of
+its shard.
+
+example: Reading a fixture
+    ```python
+    with FixtureShardReader(Path("fixtures/shards")) as reader:
+        for nodeid in reader.nodeids():
+            fixture = reader.read(nodeid)
+    ```
+
+Layout of the shards directory:
+
+- `shard-<writer>-<number>.jsonl`: one compact JSON fixture per line.
+- `index-<writer>.jsonl`: one JSON object per line and fixture, with the `nodeid` of
+    the test that generated the fixture, the `fixture` file name it has in the JSON
+    output (e.g. `shanghai/eip3855_push0/push0.json`), its `format`, and the `shard`,
+    `offset` and `length` (in bytes, excluding the newline) of its line.
+
+Each process that fills tests (e.g. each `pytest-xdist` worker) is a writer with its
+own shards and index, so that no file is written by more than one process.
+"""
+
+import mmap
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+from evm_transition_tool import json_codec
+
+SHARD_GLOB = "shard-*.jsonl"
+INDEX_GLOB = "index-*.jsonl"
+
+
+class FixtureShardWriter:
+    """
+    Appends fixtures to the shards of a writer, starting a new shard when the current
+    one would exceed `max_shard_size` bytes, and records them in the writer's index.
+    """
+
+    directory: Path
+    name: str
+    max_shard_size: int
+    shard_number: int
+    shard: Optional[IO[bytes]]
+    shard_size: int
+    index: Optional[IO[bytes]]
+
+    def __init__(self, directory: Path, name: str, max_shard_size: int):
+        self.directory = directory
+        self.name = name
+        self.max_shard_size = max_shard_size
+        self.shard_number = -1
+        self.shard = None
+        self.shard_size = 0
+        self.index = None
+
+    def shard_name(self) -> str:
+        """
+        Returns the file name of the current shard.
+        """
+        return f"shard-{self.name}-{self.shard_number:05}.jsonl"
+
+    def add(
+        self, nodeid: str, fixture_name: str, fixture_format: str, fixture: Dict[str, Any]
+    ) -> None:
+        """
+        Appends a fixture to the current shard.
+        """
+        line = json_codec.encode(fixture, ensure_ascii=True)
+        if self.index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.index = open(self.directory / f"index-{self.name}.jsonl", "wb")
+        if self.shard is None or (
+            self.shard_size > 0 and self.shard_size + len(line) + 1 > self.max_shard_size
+        ):
+            if self.shard is not None:
+                self.shard.close()
+            self.shard_number += 1
+            self.shard = open(self.directory / self.shard_name(), "wb")
+            self.shard_size = 0
+        self.shard.write(line + b"\n")
+        self.index.write(
+            json_codec.encode(
+                {
+                    "nodeid": nodeid,
+                    "fixture": fixture_name,
+                    "format": fixture_format,
+                    "shard": self.shard_name(),
+                    "offset": self.shard_size,
+                    "length": len(line),
+                }
+            )
+            + b"\n"
+        )
+        self.shard_size += len(line) + 1
+
+    def close(self) -> None:
+        """
+        Closes the current shard and the index.
+        """
+        for file in (self.shard, self.index):
+            if file is not None:
+                file.close()
+        self.shard = None
+        self.index = None
+
+
+class FixtureShardReader:
+    """
+    Reads fixtures from a shards directory, memory-mapping the shards so that reading a
+    fixture only reads its line.
+    """
+
+    directory: Path
+    entries: Dict[str, Dict[str, Any]]
+    shards: Dict[str, mmap.mmap]
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.entries = {}
+        self.shards = {}
+        for index_path in sorted(directory.glob(INDEX_GLOB)):
+            with open(index_path, "rb") as index:
+                for line in index:
+                    entry = json_codec.decode(line)
+                    self.entries[entry["nodeid"]] = entry
+
+    def __enter__(self) -> "FixtureShardReader":
+        """
+        Returns the reader.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Unmaps the shards.
+        """
+        self.close()
+
+    def nodeids(self) -> List[str]:
+        """
+        Returns the node ids of the tests whose fixtures are in the shards.
+        """
+        return list(self.entries)
+
+    def entry(self, nodeid: str) -> Dict[str, Any]:
+        """
+        Returns the index entry of the fixture generated by the given test.
+        """
+        return self.entries[nodeid]
+
+    def read_bytes(self, nodeid: str) -> bytes:
+        """
+        Returns the JSON of the fixture generated by the given test.
+        """
+        entry = self.entries[nodeid]
+        if entry["shard"] not in self.shards:
+            with open(self.directory / entry["shard"], "rb") as shard:
+                self.shards[entry["shard"]] = mmap.mmap(shard.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.shards[entry["shard"]][entry["offset"] : entry["offset"] + entry["length"]]
+
+    def read(self, nodeid: str) -> Dict[str, Any]:
+        """
+        Returns the fixture generated by the given test.
+        """
+        return json_codec.decode(self.read_bytes(nodeid))
+
+    def close(self) -> None:
+        """
+        Unmaps the shards.
+        """
+        for shard in self.shards.values():
+            shard.close()
+        self.shards = {}
@@ -0,0 +1,169 @@
+"""
+Incremental writing of the fixture files.
+"""
+
+import queue
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+
+from evm_transition_tool import json_codec
+
+INDENT = b"    "
+
+
+class JSONObjectWriter:
+    """
+    Writes a JSON object to a file one member at a time, so that only the member being
+    written is held in memory.
+
+    The output is byte-identical to `json_codec.encode(obj, indent=4, ensure_ascii=True)`
+    of the object with the same members. Each member is encoded when it is added but only
+    written when the next member is added, or when the writer is closed: adding a member
+    with the same key as the previous member replaces it, as when setting a key of a
+    `dict` twice.
+    """
+
+    file: BinaryIO
+    members: int
+    pending: Optional[Tuple[str, bytes]]
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.members = 0
+        self.pending = None
+
+    def add(self, key: str, value: Any) -> None:
+        """
+        Adds a member to the object.
+        """
+        if self.pending is not None and self.pending[0] != key:
+            self.write_pending()
+        encoded_value = json_codec.encode(value, indent=4, ensure_ascii=True)
+        self.pending = (key, encoded_value.replace(b"\n", b"\n" + INDENT))
+
+    def write_pending(self) -> None:
+        """
+        Writes the last added member.
+        """
+        if self.pending is None:
+            return
+        key, encoded_value = self.pending
+        self.file.write(
+            (b",\n" if self.members else b"{\n")
+            + INDENT
+            + json_codec.encode(key, ensure_ascii=True)
+            + b": "
+            + encoded_value
+        )
+        self.members += 1
+        self.pending = None
+
+    def close(self) -> None:
+        """
+        Writes the last member and the end of the object, and closes the file.
+        """
+        self.write_pending()
+        self.file.write(b"\n}" if self.members else b"{}")
+        self.file.close()
+
+
+class FixtureWriterThread:
+    """
+    Runs the writes of the fixture files on a background thread, so that the encoding
+    and writing of the fixtures is done off the test thread.
+
+    Tasks are run in the order they are submitted; submitting blocks while `max_queued`
+    tasks are waiting. After a task of a fixture file fails, the remaining tasks of the
+    file are skipped and the tests whose fixtures the file holds are failed: `pop_error`
+    returns, without waiting for the queued tasks, the failure of a test that is known
+    and was not reported yet. `close` waits for all the tasks and raises an exception
+    listing the failures that were not reported on their tests.
+    """
+
+    tasks: "queue.Queue[Optional[Tuple[Path, List[str], Callable[[], None]]]]"
+    thread: threading.Thread
+    errors: Dict[Path, Tuple[List[str], str]]
+    errors_lock: threading.Lock
+    reported: Set[Tuple[Path, str]]
+
+    def __init__(self, max_queued: int):
+        self.tasks = queue.Queue(maxsize=max_queued)
+        self.errors = {}
+        self.errors_lock = threading.Lock()
+        self.reported = set()
+        self.thread = threading.Thread(target=self.run, name="fixture-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, fixture_path: Path, nodeids: List[str], task: Callable[[], None]) -> None:
+        """
+        Queues a task writing the given fixture file, which holds the fixtures of the
+        tests with the given node ids.
+
+        The list of node ids is owned by the writer thread once submitted: pass a copy of
+        a list that is still added to. If the file already failed, the tests of the
+        skipped task are failed too.
+        """
+        self.tasks.put((fixture_path, nodeids, task))
+
+    def run(self) -> None:
+        """
+        Runs the queued tasks until `close` is called.
+        """
+        while True:
+            queued = self.tasks.get()
+            try:
+                if queued is None:
+                    return
+                fixture_path, nodeids, task = queued
+                if fixture_path in self.errors:
+                    with self.errors_lock:
+                        self.errors[fixture_path] = (nodeids, self.errors[fixture_path][1])
+                    continue
+                try:
+                    task()
+                except Exception as e:
+                    with self.errors_lock:
+                        self.errors[fixture_path] = (nodeids, str(e))
+            finally:
+                self.tasks.task_done()
+
+    def flush(self) -> None:
+        """
+        Waits for the queued tasks to finish.
+        """
+        self.tasks.join()
+
+    def pop_error(self, nodeid: str) -> Optional[str]:
+        """
+        Returns the failure of the fixture file holding the fixture of the given test, if
+        writing it failed and the failure was not returned for this test yet.
+
+        Does not wait for the queued tasks: a failure that is not known yet is left to
+        `close`.
+        """
+        with self.errors_lock:
+            errors = list(self.errors.items())
+        for fixture_path, (nodeids, error) in errors:
+            if nodeid in nodeids and (fixture_path, nodeid) not in self.reported:
+                self.reported.add((fixture_path, nodeid))
+                return f"Writing fixture file {fixture_path} failed: {error}"
+        return None
+
+    def close(self) -> None:
+        """
+        Waits for the queued tasks to finish and stops the thread.
+        """
+        self.tasks.put(None)
+        self.thread.join()
+        failures: List[str] = []
+        for fixture_path, (nodeids, error) in self.errors.items():
+            unreported = [
+                nodeid for nodeid in nodeids if (fixture_path, nodeid) not in self.reported
+            ]
+            if unreported:
+                failures.append(f"{fixture_path} (fixtures of {', '.join(unreported)}): {error}")
+            elif not nodeids:
+                failures.append(f"{fixture_path}: {error}")
+        if failures:
+            raise Exception("Writing fixture files failed:\n" + "\n".join(failures))
@@ -0,0 +1,201 @@
+"""
+Manifest of the fixtures generated by the tests, used by `fill --incremental` to skip the
+tests whose inputs did not change since the previous fill.
+"""
+
+import hashlib
+import os
+import sys
+import types
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from evm_transition_tool import json_codec
+
+
+def digest_files(paths: Iterable[Path]) -> str:
+    """
+    Returns a digest of the contents and names of the files, which does not depend on
+    the location of the repository.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(set(paths)):
+        digest.update(path.name.encode() + b"\0")
+        digest.update(path.read_bytes() if path.is_file() else b"")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def package_source_files(package: types.ModuleType) -> List[Path]:
+    """
+    Returns the Python source files of a package.
+    """
+    return [
+        path
+        for package_dir in getattr(package, "__path__", [])
+        for path in Path(package_dir).rglob("*.py")
+    ]
+
+
+def module_source_files(module: types.ModuleType, root: Path) -> List[Path]:
+    """
+    Returns the source file of a test module and the source files, under `root`, of the
+    modules it depends on: the modules it imports (directly or through another module
+    under `root`), e.g. the `spec.py` and `common.py` helpers of an EIP's tests, and the
+    `conftest.py` files of its directory and its parents.
+    """
+    root = root.absolute()
+    source_files: Set[Path] = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        module_file = getattr(current, "__file__", None)
+        if module_file is None:
+            continue
+        path = Path(module_file).absolute()
+        if path in source_files or root not in path.parents:
+            continue
+        source_files.add(path)
+        for value in vars(current).values():
+            if isinstance(value, types.ModuleType):
+                pending.append(value)
+            elif isinstance(getattr(value, "__module__", None), str):
+                imported = sys.modules.get(value.__module__)
+                if imported is not None:
+                    pending.append(imported)
+
+    directory = Path(module.__file__).absolute().parent  # type: ignore
+    while directory == root or root in directory.parents:
+        if (directory / "conftest.py").is_file():
+            source_files.add(directory / "conftest.py")
+        directory = directory.parent
+    return sorted(source_files)
+
+
+class FillManifest:
+    """
+    Records, for each test, a fingerprint of the inputs of the test and the fixture it
+    generated, so that the tests whose fingerprint did not change can re-emit their
+    previous fixture instead of being filled again.
+
+    The manifest is stored in `manifest_dir` as one JSON file per test module, mapping
+    the node ids of the tests of the module to their fingerprint, fixture format and
+    fixture. Tests are run module after module, so only the entries of the current
+    module are held in memory; they are written when the tests of another module start
+    to run and by `flush`. Entries are merged with the file's when it is written, as the
+    tests of a module may run in more than one process with `pytest-xdist`.
+    """
+
+    manifest_dir: Path
+    filler_path: Path
+    session_fingerprint: Dict[str, Any]
+    module_fingerprints: Dict[Path, str]
+    module_path: Optional[Path]
+    entries: Dict[str, Dict[str, Any]]
+    updated_entries: Dict[str, Dict[str, Any]]
+
+    def __init__(self, manifest_dir: Path, filler_path: Path, session_fingerprint: Dict[str, Any]):
+        self.manifest_dir = manifest_dir
+        self.filler_path = filler_path
+        self.session_fingerprint = session_fingerprint
+        self.module_fingerprints = {}
+        self.module_path = None
+        self.entries = {}
+        self.updated_entries = {}
+
+    def manifest_path(self, module_path: Path) -> Path:
+        """
+        Returns the path of the manifest file of a test module.
+        """
+        module_path = module_path.absolute()
+        filler_path = self.filler_path.absolute()
+        if filler_path in module_path.parents:
+            relative_path = module_path.relative_to(filler_path)
+        else:
+            relative_path = Path(*module_path.parts[1:])
+        return self.manifest_dir / relative_path.with_suffix(".json")
+
+    def read_entries(self, module_path: Path) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the entries of a test module from its manifest file.
+        """
+        try:
+            return json_codec.decode(self.manifest_path(module_path).read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def switch_module(self, module_path: Path) -> None:
+        """
+        Loads the entries of the given test module, writing the entries of the previous
+        module.
+        """
+        if module_path == self.module_path:
+            return
+        self.flush()
+        self.module_path = module_path
+        self.entries = self.read_entries(module_path)
+
+    def flush(self) -> None:
+        """
+        Writes the entries recorded since the manifest file of the current module was
+        read.
+        """
+        if self.module_path is None or not self.updated_entries:
+            return
+        manifest_path = self.manifest_path(self.module_path)
+        entries = {**self.read_entries(self.module_path), **self.updated_entries}
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}")
+        temp_path.write_bytes(json_codec.encode(entries))
+        os.replace(temp_path, manifest_path)
+        self.updated_entries = {}
+
+    def fingerprint(self, module: types.ModuleType, nodeid: str, **parameters: Any) -> str:
+        """
+        Returns the fingerprint of a test: a digest of the sources of the test module and
+        the modules it depends on, of the session fingerprint (e.g. the framework and
+        transition tool versions), and of the given parameters (e.g. the fork).
+        """
+        module_path = Path(module.__file__).absolute()  # type: ignore
+        if module_path not in self.module_fingerprints:
+            self.module_fingerprints[module_path] = digest_files(
+                module_source_files(module, self.filler_path)
+            )
+        return hashlib.sha256(
+            json_codec.encode(
+                {
+                    "module": self.module_fingerprints[module_path],
+                    "nodeid": nodeid,
+                    "session": self.session_fingerprint,
+                    "parameters": parameters,
+                },
+                sort_keys=True,
+            )
+        ).hexdigest()
+
+    def get(self, module_path: Path, nodeid: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the entry (`fixture_format` and `fixture`) recorded for the test, if its
+        fingerprint matches.
+        """
+        self.switch_module(module_path)
+        entry = self.entries.get(nodeid)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry
+
+    def record(
+        self,
+        module_path: Path,
+        nodeid: str,
+        fingerprint: str,
+        fixture_format: str,
+        fixture: Dict[str, Any],
+    ) -> None:
+        """
+        Records the fixture generated by a test.
+        """
+        self.switch_module(module_path)
+        entry = {"fingerprint": fingerprint, "fixture_format": fixture_format, "fixture": fixture}
+        self.entries[nodeid] = entry
+        self.updated_entries[nodeid] = entry
@@ -5,15 +5,31 @@ Top-level pytest configuration file providing:
 and that modifies pytest hooks in order to fill test specs for all tests and
 writes the generated fixtures to file.
 """
-import json
 import os
 import re
+import tempfile
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Literal, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import pytest
 
+import ethereum_test_forks
+import ethereum_test_tools
 from ethereum_test_forks import Fork, get_development_forks
 from ethereum_test_tools import (
     BaseTest,
@@ -27,8 +43,48 @@ from ethereum_test_tools import (
     Yul,
     fill_test,
 )
-from evm_transition_tool import FixtureFormats, TransitionTool
+from evm_transition_tool import (
+    DebugDumpBuffer,
+    DifferentialTransitionTool,
+    ExecutionSpecsInProcessTransitionTool,
+    FixtureFormats,
+    TraceFilter,
+    TransitionTool,
+    TransitionToolCache,
+    TransitionToolTimingReport,
+    TransitionToolWorkersNotSupported,
+    json_codec,
+)
 from pytest_plugins.spec_version_checker.spec_version_checker import EIPSpecTestItem
+from pytest_plugins.test_filler.fixture_compression import (
+    FixtureFileCompressor,
+    FixtureFileReader,
+    fixture_file_compression,
+    uncompressed_name,
+)
+from pytest_plugins.test_filler.fixture_shards import INDEX_GLOB, SHARD_GLOB, FixtureShardWriter
+from pytest_plugins.test_filler.fixture_writer import FixtureWriterThread, JSONObjectWriter
+from pytest_plugins.test_filler.manifest import FillManifest, digest_files, package_source_files
+
+CAPABILITY_CACHE_KEY = "evm_transition_tool/capabilities"
+
+test_failed_key = pytest.StashKey[bool]()
+"""
+Set on the test items whose setup or call failed.
+"""
+
+fill_fingerprint_key = pytest.StashKey[str]()
+"""
+Set on the test items to their fingerprint in the manifest, with --incremental.
+"""
+
+
+def parse_inclusive_range(value: str) -> Tuple[int, int]:
+    """
+    Parses a command-line inclusive range `MIN:MAX`, or a single value `N`.
+    """
+    start, _, end = value.partition(":")
+    return int(start, 0), int(end or start, 0)
 
 
 def pytest_addoption(parser):
@@ -53,6 +109,139 @@ def pytest_addoption(parser):
         default=None,
         help="Collect traces of the execution information from the transition tool.",
     )
+    evm_group.addoption(
+        "--trace-opcodes",
+        action="store",
+        dest="trace_opcodes",
+        type=str,
+        default=None,
+        help=(
+            "With --traces, only retain the execution steps of the given comma-separated "
+            "opcode names, e.g. `SSTORE,SLOAD`."
+        ),
+    )
+    evm_group.addoption(
+        "--trace-depth",
+        action="store",
+        dest="trace_depth",
+        type=parse_inclusive_range,
+        default=None,
+        help=(
+            "With --traces, only retain the execution steps at a call depth in the inclusive "
+            "range `MIN:MAX` (or a single depth `N`)."
+        ),
+    )
+    evm_group.addoption(
+        "--trace-pc",
+        action="store",
+        dest="trace_pc",
+        type=parse_inclusive_range,
+        default=None,
+        help=(
+            "With --traces, only retain the execution steps whose program counter is in the "
+            "inclusive range `MIN:MAX` (or a single pc `N`)."
+        ),
+    )
+    evm_group.addoption(
+        "--trace-max-steps",
+        action="store",
+        dest="trace_max_steps",
+        type=int,
+        default=None,
+        help="With --traces, maximum number of steps retained per transaction trace.",
+    )
+    evm_group.addoption(
+        "--t8n-in-process",
+        action="store_true",
+        dest="t8n_in_process",
+        default=False,
+        help=(
+            "Run the execution-specs t8n (`ethereum-spec-evm`) in-process instead of starting "
+            "the tool once per call. If specified, --evm-bin must be an `ethereum-spec-evm` "
+            "binary, it is only used to report the tool's version."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-diff-bin",
+        action="append",
+        dest="t8n_diff_bins",
+        type=Path,
+        default=None,
+        help=(
+            "Path to another evm executable that provides `t8n` and whose outputs are compared "
+            "to those of --evm-bin on every call; may be specified multiple times. Tests fail "
+            "on the first divergence. The fixtures are built from the outputs of --evm-bin."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-workers",
+        action="store",
+        dest="t8n_workers",
+        type=int,
+        default=0,
+        help=(
+            "Number of resident t8n worker processes per test session (per xdist worker) that "
+            "serve all t8n calls instead of starting the tool once per call. Only supported by "
+            "tools with a worker mode: ethereum-spec-evm (interpreters that keep the specs "
+            "imported) and Besu (t8n-server processes). Default: 0 (start one process per "
+            "call, one t8n-server for Besu)."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-prefork",
+        action="store",
+        dest="t8n_prefork",
+        type=int,
+        default=0,
+        help=(
+            "Number of t8n processes started ahead of the t8n calls and waiting for their input, "
+            "for each of the distinct t8n arguments (e.g. fork and block reward), to hide the "
+            "startup time of the tool when it is started once per call; at most 32 processes "
+            "wait per test session (per xdist worker). Ignored with --t8n-workers or --traces. "
+            "Default: 0."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-cache-dir",
+        action="store",
+        dest="t8n_cache_dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of a content-addressed cache of t8n results. Calls with identical "
+            "inputs, tool version and binary are served from the cache without running the tool. "
+            "The directory can be shared between runs and xdist workers. Default: disabled."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-cache-max-size",
+        action="store",
+        dest="t8n_cache_max_size",
+        type=int,
+        default=1024,
+        help="Maximum size of the t8n cache directory in MiB. Default: 1024.",
+    )
+    evm_group.addoption(
+        "--native-state-root",
+        action="store_true",
+        dest="native_state_root",
+        default=False,
+        help=(
+            "Compute genesis state roots in-process instead of calling the t8n tool with an "
+            "empty transaction list."
+        ),
+    )
+    evm_group.addoption(
+        "--native-state-root-check-interval",
+        action="store",
+        dest="native_state_root_check_interval",
+        type=int,
+        default=100,
+        help=(
+            "With --native-state-root, also compute every n-th genesis state root with the t8n "
+            "tool and fail if the results differ (0 disables the check). Default: 100."
+        ),
+    )
     evm_group.addoption(
         "--verify-fixtures",
         action="store_true",
@@ -76,6 +265,18 @@ def pytest_addoption(parser):
             "Default: The first (geth) 'evm' entry in PATH."
         ),
     )
+    evm_group.addoption(
+        "--verify-fixtures-workers",
+        action="store",
+        dest="verify_fixtures_workers",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of concurrent fixture verification processes per test session "
+            "(per xdist worker), run in the background while filling. Default: the number of "
+            "CPUs."
+        ),
+    )
 
     solc_group = parser.getgroup("solc", "Arguments defining the solc executable")
     solc_group.addoption(
@@ -122,6 +323,76 @@ def pytest_addoption(parser):
             "file. This can be used to increase the granularity of --verify-fixtures."
         ),
     )
+    test_group.addoption(
+        "--output-compression",
+        action="store",
+        dest="output_compression",
+        choices=["gzip", "zstd"],
+        default=None,
+        help=(
+            "Compress the fixture files with gzip or zstd (`.json.gz` or `.json.zst` files). "
+            "zstd requires the `zstandard` package."
+        ),
+    )
+    test_group.addoption(
+        "--output-compression-dictionary",
+        action="store_true",
+        dest="output_compression_dictionary",
+        default=False,
+        help=(
+            "With --output-compression=zstd, compress the fixture files with a dictionary "
+            "trained on the first fixtures, written to the output directory."
+        ),
+    )
+    test_group.addoption(
+        "--sharded-output",
+        action="store_true",
+        dest="sharded_output",
+        default=False,
+        help=(
+            "Write the fixtures to size-bounded shards of newline-delimited JSON, with an "
+            "index of the location of each fixture, in the `shards` directory of the output "
+            "directory, instead of writing JSON files."
+        ),
+    )
+    test_group.addoption(
+        "--max-shard-size",
+        action="store",
+        dest="max_shard_size",
+        type=int,
+        default=64,
+        help="With --sharded-output, maximum size in MiB of a shard. Default: 64.",
+    )
+    test_group.addoption(
+        "--output-queue-size",
+        action="store",
+        dest="output_queue_size",
+        type=int,
+        default=64,
+        help=(
+            "Maximum number of fixture writes queued for the background thread that encodes "
+            "and writes the fixture files; 0 writes them on the test thread. Default: 64."
+        ),
+    )
+    test_group.addoption(
+        "--incremental",
+        action="store_true",
+        dest="incremental",
+        default=False,
+        help=(
+            "Only fill the tests whose module, helper modules, conftest files, fork or the "
+            "framework, t8n and solc versions changed since the last incremental fill; "
+            "re-emit the fixtures of the other tests as recorded in the manifest."
+        ),
+    )
+    test_group.addoption(
+        "--manifest-dir",
+        action="store",
+        dest="manifest_dir",
+        type=Path,
+        default=Path("./.fill_manifest/"),
+        help="Directory of the --incremental manifest. Default: ./.fill_manifest/",
+    )
     test_group.addoption(
         "--enable-hive",
         action="store_true",
@@ -130,6 +401,17 @@ def pytest_addoption(parser):
         help="Output test fixtures with the hive-specific properties.",
     )
 
+    test_group.addoption(
+        "--no-genesis-cache",
+        action="store_false",
+        dest="genesis_cache",
+        default=True,
+        help=(
+            "Don't reuse the genesis (alloc, RLP and header) of previously filled tests that "
+            "share the same pre-allocation, genesis environment and fork."
+        ),
+    )
+
     debug_group = parser.getgroup("debug", "Arguments defining debug behavior")
     debug_group.addoption(
         "--evm-dump-dir",
@@ -139,6 +421,58 @@ def pytest_addoption(parser):
         default="",
         help="Path to dump the transition tool debug output.",
     )
+    debug_group.addoption(
+        "--evm-dump-compression",
+        action="store",
+        dest="evm_dump_compression",
+        choices=["gzip", "zstd"],
+        default=None,
+        help=(
+            "With --evm-dump-dir, dump each t8n input and output once, compressed, instead of "
+            "as several indented JSON files; the generated `t8n.sh` scripts decompress the "
+            "inputs. zstd requires the `zstandard` package."
+        ),
+    )
+    debug_group.addoption(
+        "--evm-dump-failed-only",
+        action="store_true",
+        dest="evm_dump_failed_only",
+        default=False,
+        help=(
+            "With --evm-dump-dir, hold the debug output of each test in memory and only write "
+            "it if the test fails."
+        ),
+    )
+    debug_group.addoption(
+        "--evm-dump-buffer-size",
+        action="store",
+        dest="evm_dump_buffer_size",
+        type=int,
+        default=256,
+        help=(
+            "With --evm-dump-failed-only, maximum size in MiB of the debug output held in "
+            "memory per test; the output of the earliest t8n calls of the test is discarded "
+            "first. Default: 256."
+        ),
+    )
+    debug_group.addoption(
+        "--t8n-timings",
+        action="store_true",
+        dest="t8n_timings",
+        default=False,
+        help=(
+            "Time each phase of the t8n calls (input serialization, tool execution, output "
+            "parsing) and print a summary at the end of the session."
+        ),
+    )
+    debug_group.addoption(
+        "--t8n-timings-report",
+        action="store",
+        dest="t8n_timings_report",
+        type=Path,
+        default=None,
+        help="Write the t8n call timings of all tests to this JSON file (implies --t8n-timings).",
+    )
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -167,20 +501,122 @@ def pytest_configure(config):
     )
     if config.option.collectonly:
         return
-    # Instantiate the transition tool here to check that the binary path/trace option is valid.
-    # This ensures we only raise an error once, if appropriate, instead of for every test.
-    t8n = TransitionTool.from_binary_path(
-        binary_path=config.getoption("evm_bin"), trace=config.getoption("evm_collect_traces")
-    )
-    if (
-        isinstance(config.getoption("numprocesses"), int)
-        and config.getoption("numprocesses") > 0
-        and "Besu" in str(t8n.detect_binary_pattern)
+    if config.getoption("t8n_timings_report"):
+        config.option.t8n_timings = True
+    if config.getoption("output_compression_dictionary") and (
+        config.getoption("output_compression") != "zstd"
     ):
         pytest.exit(
-            "The Besu t8n tool does not work well with the xdist plugin; use -n=0.",
+            "--output-compression-dictionary requires --output-compression=zstd.",
             returncode=pytest.ExitCode.USAGE_ERROR,
         )
+    if config.getoption("output_compression") and config.getoption("sharded_output"):
+        pytest.exit(
+            "Sharded fixtures can not be compressed: "
+            "Remove --output-compression or --sharded-output.",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
+    if config.getoption("sharded_output") and not hasattr(config, "workerinput"):
+        # Remove the shards of a previous session, which may have had more writers
+        shards_dir = Path(config.getoption("output")) / "shards"
+        for stale_path in list(shards_dir.glob(SHARD_GLOB)) + list(shards_dir.glob(INDEX_GLOB)):
+            stale_path.unlink()
+    if config.getoption("t8n_timings") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(TransitionToolTimingPlugin(config), "t8n-timings")
+    # Tool capabilities are probed once by the xdist controller and handed to the workers
+    if hasattr(config, "workerinput"):
+        TransitionTool.capability_cache.load(config.workerinput[CAPABILITY_CACHE_KEY])
+    elif config.cache is not None:
+        TransitionTool.capability_cache.load(config.cache.get(CAPABILITY_CACHE_KEY, {}))
+    # Instantiate the transition tool here to check that the binary path/trace option is valid.
+    # This ensures we only raise an error once, if appropriate, instead of for every test.
+    t8n = get_transition_tool(config, trace=config.getoption("evm_collect_traces"))
+    if not hasattr(config, "workerinput"):
+        t8n.version()
+        if config.cache is not None:
+            config.cache.set(CAPABILITY_CACHE_KEY, TransitionTool.capability_cache.dump())
+
+
+class TransitionToolTimingPlugin:
+    """
+    Aggregates the t8n call timings attached to the reports of the tests (including the
+    reports sent by xdist workers) and reports them at the end of the session.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.report = TransitionToolTimingReport()
+
+    def pytest_runtest_logreport(self, report):
+        """
+        Collects the timings attached to the teardown report of a test.
+        """
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "t8n_timings":
+                self.report.add_test(report.nodeid, value)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Prints the summary of the t8n call timings.
+        """
+        summary = self.report.summary()
+        terminalreporter.write_sep("=", "t8n call timings")
+        terminalreporter.write_line(
+            f"{summary['calls']} calls ({summary['cached_calls']} from cache), "
+            f"{summary['total']:.2f}s, {summary['input_size']} bytes in, "
+            f"{summary['output_size']} bytes out"
+        )
+        terminalreporter.write_line("Time per phase:")
+        for phase, duration in summary["time_per_phase"].items():
+            terminalreporter.write_line(f"  {phase:<10} {duration:10.2f}s")
+        terminalreporter.write_line("Time per fork:")
+        for fork_name, duration in summary["time_per_fork"].items():
+            terminalreporter.write_line(f"  {fork_name:<30} {duration:10.2f}s")
+        terminalreporter.write_line("Slowest tests:")
+        for test in summary["slowest_tests"]:
+            terminalreporter.write_line(
+                f"  {test['total']:10.2f}s {test['calls']:5} calls  {test['nodeid']}"
+            )
+
+    def pytest_sessionfinish(self, session):
+        """
+        Writes the machine-readable timing report, if requested.
+        """
+        report_path = self.config.getoption("t8n_timings_report")
+        if report_path:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, "wb") as f:
+                f.write(json_codec.encode(self.report.to_json(), indent=4))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    Send the transition tool capabilities probed by the xdist controller to a worker.
+    """
+    node.workerinput[CAPABILITY_CACHE_KEY] = TransitionTool.capability_cache.dump()
+
+
+def get_transition_tool(config, **kwargs) -> TransitionTool:
+    """
+    Instantiates the transition tool selected by the command-line options.
+    """
+    t8n: TransitionTool
+    if config.getoption("t8n_in_process"):
+        t8n = ExecutionSpecsInProcessTransitionTool(binary=config.getoption("evm_bin"), **kwargs)
+    else:
+        t8n = TransitionTool.from_binary_path(binary_path=config.getoption("evm_bin"), **kwargs)
+    if config.getoption("t8n_diff_bins"):
+        t8n = DifferentialTransitionTool(
+            reference=t8n,
+            others=[
+                TransitionTool.from_binary_path(binary_path=binary)
+                for binary in config.getoption("t8n_diff_bins")
+            ],
+        )
+    return t8n
 
 
 @pytest.hookimpl(trylast=True)
@@ -188,8 +624,7 @@ def pytest_report_header(config, start_path):
     """Add lines to pytest's console output header"""
     if config.option.collectonly:
         return
-    binary_path = config.getoption("evm_bin")
-    t8n = TransitionTool.from_binary_path(binary_path=binary_path)
+    t8n = get_transition_tool(config)
     solc_version_string = Yul("", binary=config.getoption("solc_bin")).version()
     return [f"{t8n.version()}, solc version {solc_version_string}"]
 
@@ -224,13 +659,73 @@ def t8n(request, evm_bin: Path) -> Generator[TransitionTool, None, None]:
     """
     Returns the configured transition tool.
     """
-    t8n = TransitionTool.from_binary_path(
-        binary_path=evm_bin, trace=request.config.getoption("evm_collect_traces")
-    )
+    t8n = get_transition_tool(request.config, trace=request.config.getoption("evm_collect_traces"))
+    if request.config.getoption("trace_opcodes") or any(
+        request.config.getoption(option) is not None for option in ("trace_depth", "trace_pc")
+    ):
+        trace_opcodes = request.config.getoption("trace_opcodes")
+        t8n.trace_filter = TraceFilter(
+            opcodes=frozenset(trace_opcodes.split(",")) if trace_opcodes else None,
+            depth=request.config.getoption("trace_depth"),
+            pc=request.config.getoption("trace_pc"),
+        )
+    t8n.trace_max_steps = request.config.getoption("trace_max_steps")
+    t8n.debug_dump_compression = request.config.getoption("evm_dump_compression")
+    if request.config.getoption("evm_dump_failed_only"):
+        t8n.debug_dump_buffer = DebugDumpBuffer(
+            request.config.getoption("evm_dump_buffer_size") * 1024 * 1024
+        )
+    if request.config.getoption("t8n_workers") > 0:
+        try:
+            t8n.start_workers(request.config.getoption("t8n_workers"))
+        except TransitionToolWorkersNotSupported as e:
+            pytest.exit(
+                f"{e} Remove --t8n-workers, or use --t8n-prefork to hide the startup time of "
+                "the tool.",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
+    elif request.config.getoption("t8n_prefork") > 0:
+        t8n.start_spawner(request.config.getoption("t8n_prefork"))
+    if request.config.getoption("t8n_cache_dir"):
+        t8n.cache = TransitionToolCache(
+            request.config.getoption("t8n_cache_dir"),
+            max_size=request.config.getoption("t8n_cache_max_size") * 1024 * 1024,
+        )
     yield t8n
     t8n.shutdown()
 
 
+@pytest.fixture(autouse=True)
+def evm_dump_buffer(request, t8n: TransitionTool) -> Generator[None, None, None]:
+    """
+    Writes the debug output of the test held in memory if the test failed, discards it
+    otherwise.
+    """
+    if t8n.debug_dump_buffer is None:
+        yield
+        return
+    t8n.debug_dump_buffer.clear()
+    yield
+    if request.node.stash.get(test_failed_key, False):
+        t8n.debug_dump_buffer.flush()
+    t8n.debug_dump_buffer.clear()
+
+
+@pytest.fixture(autouse=True)
+def t8n_timings(request, t8n: TransitionTool) -> Generator[None, None, None]:
+    """
+    Collects the timings of the t8n calls made by the test, if enabled, and attaches them
+    to the test's report.
+    """
+    if not request.config.getoption("t8n_timings"):
+        yield
+        return
+    t8n.timings = []
+    yield
+    timings, t8n.timings = t8n.timings, None
+    request.node.user_properties.append(("t8n_timings", [t.to_json() for t in timings]))
+
+
 @pytest.fixture(scope="session")
 def do_fixture_verification(request, t8n) -> bool:
     """
@@ -248,6 +743,12 @@ def do_fixture_verification(request, t8n) -> bool:
             "Remove --enable-hive to verify test fixtures.",
             returncode=pytest.ExitCode.USAGE_ERROR,
         )
+    if do_fixture_verification and request.config.getoption("sharded_output"):
+        pytest.exit(
+            "Sharded fixtures can not be verified using geth's evm tool: "
+            "Remove --sharded-output to verify test fixtures.",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
     return do_fixture_verification
 
 
@@ -282,6 +783,12 @@ def base_test_config(request) -> BaseTestConfig:
     """
     config = BaseTestConfig()
     config.enable_hive = request.config.getoption("enable_hive")
+    config.native_state_root = request.config.getoption("native_state_root")
+    config.native_state_root_check_interval = request.config.getoption(
+        "native_state_root_check_interval"
+    )
+    if request.config.getoption("genesis_cache"):
+        config.genesis_cache = {}
     return config
 
 
@@ -378,34 +885,72 @@ def get_fixture_collection_scope(fixture_name, config):
 class FixtureCollector:
     """
     Collects all fixtures generated by the test cases.
+
+    Fixtures are written to their file as they are added, so that only the fixture
+    being written is held in memory; the files are completed by `dump_fixtures`. The
+    fixtures are encoded and written by the fixture writer thread, if one is given.
+    With a fixture shard writer, the fixtures are appended to its shards instead. With a
+    fixture file compressor, the files are compressed.
     """
 
-    all_fixtures: Dict[Path, Dict[str, Any]]
+    fixture_writers: Dict[Path, JSONObjectWriter]
+    fixture_writer_thread: Optional[FixtureWriterThread]
+    fixture_shard_writer: Optional[FixtureShardWriter]
+    fixture_file_compressor: Optional[FixtureFileCompressor]
     output_dir: str
     flat_output: bool
     json_path_to_fixture_type: Dict[Path, FixtureFormats]
     json_path_to_test_item: Dict[Path, pytest.Item]
+    json_path_to_nodeids: Dict[Path, List[str]]
+    fill_manifest: Optional[FillManifest]
 
     def __init__(
         self,
         output_dir: str,
         flat_output: bool,
+        fill_manifest: Optional[FillManifest] = None,
+        fixture_writer_thread: Optional[FixtureWriterThread] = None,
+        fixture_shard_writer: Optional[FixtureShardWriter] = None,
+        fixture_file_compressor: Optional[FixtureFileCompressor] = None,
     ) -> None:
-        self.all_fixtures = {}
+        self.fixture_writers = {}
+        self.fixture_writer_thread = fixture_writer_thread
+        self.fixture_shard_writer = fixture_shard_writer
+        self.fixture_file_compressor = fixture_file_compressor
         self.output_dir = output_dir
         self.flat_output = flat_output
         self.json_path_to_fixture_type = {}
         self.json_path_to_test_item = {}
+        self.json_path_to_nodeids = {}
+        self.fill_manifest = fill_manifest
 
     def add_fixture(
         self, item, fixture: Optional[Union[Fixture, HiveFixture]], fixture_format: FixtureFormats
     ) -> None:
         """
-        Adds a fixture to the list of fixtures of a given test case.
+        Adds a fixture to the list of fixtures of a given test case, and records it in
+        the manifest with --incremental.
         """
         # TODO: remove this logic. if hive enabled set --from to Merge
         if fixture is None:
             return
+        fixture_json = fixture.to_json()
+        if self.fill_manifest is not None and fill_fingerprint_key in item.stash:
+            self.fill_manifest.record(
+                Path(item.path),
+                item.nodeid,
+                item.stash[fill_fingerprint_key],
+                fixture_format.value,
+                fixture_json,
+            )
+        self.add_fixture_json(item, fixture_json, fixture_format)
+
+    def add_fixture_json(
+        self, item, fixture_json: Dict[str, Any], fixture_format: FixtureFormats
+    ) -> None:
+        """
+        Writes the JSON of a fixture to the fixture file of a given test case.
+        """
 
         def get_single_test_name(item):
             test_name, test_parameters = convert_test_id_to_test_name_and_parameters(item.name)
@@ -435,34 +980,104 @@ class FixtureCollector:
             fixture_basename = get_fixture_basename_for_nested_output(self, item)
 
         fixture_path = self.output_dir / fixture_basename.with_suffix(".json")
-        if fixture_path not in self.all_fixtures:  # relevant when we group by test function
-            self.all_fixtures[fixture_path] = {}
+        new_file = fixture_path not in self.json_path_to_nodeids
+        if new_file:  # relevant when we group by test function
             self.json_path_to_fixture_type[fixture_path] = fixture_format
             self.json_path_to_test_item[fixture_path] = item
+            self.json_path_to_nodeids[fixture_path] = []
+        nodeids = self.json_path_to_nodeids[fixture_path]
+        if not nodeids or nodeids[-1] != item.nodeid:
+            nodeids.append(item.nodeid)
+        if new_file and self.fixture_shard_writer is None:
+            self.run_task(fixture_path, partial(self.open_fixture_file, fixture_path))
+
+        if self.fixture_shard_writer is not None:
+            self.run_task(
+                fixture_path,
+                partial(
+                    self.fixture_shard_writer.add,
+                    item.nodeid,
+                    fixture_basename.with_suffix(".json").as_posix(),
+                    fixture_format.value,
+                    fixture_json,
+                ),
+            )
+        else:
+            self.run_task(
+                fixture_path,
+                lambda: self.fixture_writers[fixture_path].add(item.nodeid, fixture_json),
+            )
+
+    def run_task(self, fixture_path: Path, task: Callable[[], None]) -> None:
+        """
+        Runs a task writing the given fixture file, on the fixture writer thread if there
+        is one.
+
+        The writer thread gets a copy of the node ids of the tests in the file, which are
+        still added to on the test thread.
+        """
+        if self.fixture_writer_thread is None:
+            task()
+        else:
+            self.fixture_writer_thread.submit(
+                fixture_path, list(self.json_path_to_nodeids[fixture_path]), task
+            )
 
-        self.all_fixtures[fixture_path][item.nodeid] = fixture.to_json()
+    def open_fixture_file(self, fixture_path: Path) -> None:
+        """
+        Creates a fixture file.
+        """
+        os.makedirs(fixture_path.parent, exist_ok=True)
+        file: BinaryIO
+        if self.fixture_file_compressor is not None:
+            file = self.fixture_file_compressor.open(fixture_path)
+        else:
+            file = open(fixture_path, "wb")
+        self.fixture_writers[fixture_path] = JSONObjectWriter(file)
+
+    def close_fixture_file(self, fixture_path: Path) -> None:
+        """
+        Completes a fixture file.
+        """
+        self.fixture_writers.pop(fixture_path).close()
 
     def dump_fixtures(self) -> None:
         """
-        Dumps all collected fixtures to their respective files.
+        Completes the fixture files.
         """
         os.makedirs(self.output_dir, exist_ok=True)
-        for fixture_path, fixtures in self.all_fixtures.items():
-            if not self.flat_output:
-                os.makedirs(fixture_path.parent, exist_ok=True)
-            with open(fixture_path, "w") as f:
-                json.dump(fixtures, f, indent=4)
+        if self.fixture_shard_writer is not None:
+            return  # the shards are completed at the end of the session
+        for fixture_path in self.json_path_to_nodeids:
+            self.run_task(fixture_path, partial(self.close_fixture_file, fixture_path))
 
-    def verify_fixture_files(self, evm_fixture_verification: TransitionTool) -> None:
+    def verify_fixture_files(self, fixture_verifier: "FixtureVerifier") -> None:
         """
-        Runs `evm [state|block]test` on each fixture.
+        Hands the fixture files to the verifier, which runs `evm [state|block]test` on
+        them, once they are written.
         """
         for fixture_path, fixture_format in self.json_path_to_fixture_type.items():
             item = self.json_path_to_test_item[fixture_path]
-            verify_fixtures_dump_dir = self._get_verify_fixtures_dump_dir(item)
-            evm_fixture_verification.verify_fixture(
-                fixture_format, fixture_path, verify_fixtures_dump_dir
+            file_path = fixture_path
+            if self.fixture_file_compressor is not None:
+                file_path = self.fixture_file_compressor.compressed_path(fixture_path)
+            add_to_verifier = partial(
+                fixture_verifier.add,
+                fixture_format,
+                file_path,
+                self.json_path_to_nodeids[fixture_path],
+                self._get_verify_fixtures_dump_dir(item),
             )
+            if self.fixture_file_compressor is not None:
+                # Files held until the compression dictionary is trained are not written yet
+                self.run_task(
+                    fixture_path,
+                    partial(
+                        self.fixture_file_compressor.when_written, fixture_path, add_to_verifier
+                    ),
+                )
+            else:
+                self.run_task(fixture_path, add_to_verifier)
 
     def _get_verify_fixtures_dump_dir(
         self,
@@ -482,11 +1097,299 @@ class FixtureCollector:
             return get_dump_dir_path(base_dump_dir, filler_path, item, level="test_function")
 
 
-@pytest.fixture(scope=get_fixture_collection_scope)
-def fixture_collector(
+class FixtureVerifier:
+    """
+    Verifies fixture files with `evm [state|block]test` in the background.
+
+    Fixture files are handed to a bounded pool of threads, each running one process at
+    a time, as soon as they are written; filling continues while they are verified.
+    Fixtures with debug output are verified one per invocation of the tool; the others
+    are grouped in batches of `verify_fixtures_batch_size` fixtures of the same format
+    per invocation, a batch being submitted once it is full. `verify` submits the
+    remaining fixtures and waits for all the results. Compressed fixture files are
+    verified from decompressed copies, as the tool only reads JSON files.
+    """
+
+    evm_fixture_verification: TransitionTool
+    fixture_reader: FixtureFileReader
+    executor: ThreadPoolExecutor
+    pending: Dict[FixtureFormats, List[Path]]
+    results: List[Future]
+    nodeids: Dict[Path, List[str]]
+
+    def __init__(
+        self,
+        evm_fixture_verification: TransitionTool,
+        max_workers: Optional[int],
+        fixture_reader: FixtureFileReader,
+    ):
+        self.evm_fixture_verification = evm_fixture_verification
+        self.fixture_reader = fixture_reader
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count(), thread_name_prefix="fixture-verifier"
+        )
+        self.pending = {}
+        self.results = []
+        self.nodeids = {}
+
+    def add(
+        self,
+        fixture_format: FixtureFormats,
+        fixture_path: Path,
+        nodeids: List[str],
+        debug_output_path: Optional[Path],
+    ) -> None:
+        """
+        Adds a fixture file, generated by the tests with the given node ids, to verify.
+        """
+        self.nodeids[fixture_path] = nodeids
+        if debug_output_path is not None:
+            self.submit(fixture_format, [fixture_path], debug_output_path)
+            return
+        pending = self.pending.setdefault(fixture_format, [])
+        pending.append(fixture_path)
+        if len(pending) >= self.evm_fixture_verification.verify_fixtures_batch_size:
+            self.submit(fixture_format, pending, None)
+            self.pending[fixture_format] = []
+
+    def submit(
+        self,
+        fixture_format: FixtureFormats,
+        fixture_paths: List[Path],
+        debug_output_path: Optional[Path],
+    ) -> None:
+        """
+        Submits a batch of fixture files to the verification threads.
+        """
+        self.results.append(
+            self.executor.submit(
+                self.verify_batch, fixture_format, fixture_paths, debug_output_path
+            )
+        )
+
+    def verify_batch(
+        self,
+        fixture_format: FixtureFormats,
+        fixture_paths: List[Path],
+        debug_output_path: Optional[Path],
+    ) -> Dict[Path, str]:
+        """
+        Verifies a batch of fixture files, returns the error of each failed fixture.
+
+        Compressed fixture files are decompressed to a temporary directory first.
+        """
+        with tempfile.TemporaryDirectory(prefix="verify-fixtures-") as temp_dir:
+            errors: Dict[Path, str] = {}
+            original_paths: Dict[Path, Path] = {}
+            for i, fixture_path in enumerate(fixture_paths):
+                if fixture_file_compression(fixture_path) is None:
+                    original_paths[fixture_path] = fixture_path
+                    continue
+                json_path = Path(temp_dir) / f"{i}_{uncompressed_name(fixture_path)}"
+                try:
+                    json_path.write_bytes(self.fixture_reader.read(fixture_path))
+                except Exception as e:
+                    errors[fixture_path] = f"Failed to decompress fixture: {e}"
+                    continue
+                original_paths[json_path] = fixture_path
+            if original_paths:
+                verify_errors = self.verify_json_files(
+                    fixture_format, list(original_paths), debug_output_path
+                )
+                for json_path, error in verify_errors.items():
+                    errors[original_paths[json_path]] = error
+            return errors
+
+    def verify_json_files(
+        self,
+        fixture_format: FixtureFormats,
+        fixture_paths: List[Path],
+        debug_output_path: Optional[Path],
+    ) -> Dict[Path, str]:
+        """
+        Verifies a batch of JSON fixture files, returns the error of each failed fixture.
+        """
+        if debug_output_path is None:
+            try:
+                return self.evm_fixture_verification.verify_fixtures(fixture_format, fixture_paths)
+            except Exception as e:
+                return {fixture_path: str(e) for fixture_path in fixture_paths}
+        errors: Dict[Path, str] = {}
+        for fixture_path in fixture_paths:
+            try:
+                self.evm_fixture_verification.verify_fixture(
+                    fixture_format, fixture_path, debug_output_path
+                )
+            except Exception as e:
+                errors[fixture_path] = str(e)
+        return errors
+
+    def verify(self) -> None:
+        """
+        Verifies the remaining fixture files and waits for the verification of all the
+        fixture files.
+
+        Raises an exception listing the failed fixtures and the tests that generated them.
+        """
+        for fixture_format, fixture_paths in self.pending.items():
+            if fixture_paths:
+                self.submit(fixture_format, fixture_paths, None)
+        self.pending = {}
+        errors: Dict[Path, str] = {}
+        for result in self.results:
+            errors.update(result.result())
+        self.results = []
+        self.executor.shutdown()
+        if errors:
+            raise Exception(
+                "Fixture verification failed:\n"
+                + "\n".join(
+                    f"{fixture_path} (generated by "
+                    f"{', '.join(self.nodeids.get(fixture_path, []))}): {error}"
+                    for fixture_path, error in errors.items()
+                )
+            )
+
+
+@pytest.fixture(scope="session")
+def fixture_verifier(
     request,
     do_fixture_verification: bool,
     evm_fixture_verification: TransitionTool,
+) -> Generator[Optional[FixtureVerifier], None, None]:
+    """
+    Returns the verifier of the fixture files written during the session, if enabled.
+
+    Verification failures are reported at the end of the session.
+    """
+    if not do_fixture_verification:
+        yield None
+        return
+    fixture_verifier = FixtureVerifier(
+        evm_fixture_verification,
+        request.config.getoption("verify_fixtures_workers"),
+        FixtureFileReader(Path(request.config.getoption("output"))),
+    )
+    yield fixture_verifier
+    fixture_verifier.verify()
+
+
+@pytest.fixture(scope="session")
+def fill_manifest(
+    request, t8n: TransitionTool, filler_path: Path
+) -> Generator[Optional[FillManifest], None, None]:
+    """
+    Returns the manifest of the fixtures generated by the tests, with --incremental.
+    """
+    if not request.config.getoption("incremental"):
+        yield None
+        return
+    fill_manifest = FillManifest(
+        request.config.getoption("manifest_dir"),
+        filler_path,
+        session_fingerprint={
+            "framework": digest_files(
+                package_source_files(ethereum_test_tools)
+                + package_source_files(ethereum_test_forks)
+            ),
+            "t8n": t8n.version(),
+            "solc": Yul("", binary=request.config.getoption("solc_bin")).version(),
+            "enable_hive": request.config.getoption("enable_hive"),
+        },
+    )
+    yield fill_manifest
+    fill_manifest.flush()
+
+
+@pytest.fixture(scope="session")
+def fixture_writer_thread(
+    request, fixture_verifier: Optional[FixtureVerifier]
+) -> Generator[Optional[FixtureWriterThread], None, None]:
+    """
+    Returns the thread that writes the fixture files in the background, unless disabled
+    with `--output-queue-size=0`.
+
+    Write failures fail the tests whose fixtures could not be written, at their teardown
+    if the failure is known by then (see `pytest_runtest_makereport`); the remaining
+    failures, e.g. of the tests written to a file before it failed, are reported at the
+    end of the session. Depends on the
+    fixture verifier, so that all the files are written (and handed to the verifier) before the
+    verifier waits for the remaining verifications.
+    """
+    max_queued = request.config.getoption("output_queue_size")
+    if max_queued <= 0:
+        yield None
+        return
+    fixture_writer_thread = FixtureWriterThread(max_queued)
+    yield fixture_writer_thread
+    fixture_writer_thread.close()
+
+
+@pytest.fixture(scope="session")
+def fixture_shard_writer(
+    request, fixture_writer_thread: Optional[FixtureWriterThread]
+) -> Generator[Optional[FixtureShardWriter], None, None]:
+    """
+    Returns the writer of the fixture shards of this process, with --sharded-output.
+    """
+    if not request.config.getoption("sharded_output"):
+        yield None
+        return
+    if hasattr(request.config, "workerinput"):
+        writer_name = request.config.workerinput["workerid"]
+    else:
+        writer_name = "main"
+    fixture_shard_writer = FixtureShardWriter(
+        Path(request.config.getoption("output")) / "shards",
+        writer_name,
+        max_shard_size=request.config.getoption("max_shard_size") * 1024 * 1024,
+    )
+    yield fixture_shard_writer
+    if fixture_writer_thread is None:
+        fixture_shard_writer.close()
+    else:
+        fixture_writer_thread.submit(
+            fixture_shard_writer.directory, [], fixture_shard_writer.close
+        )
+
+
+@pytest.fixture(scope="session")
+def fixture_file_compressor(
+    request, fixture_writer_thread: Optional[FixtureWriterThread]
+) -> Generator[Optional[FixtureFileCompressor], None, None]:
+    """
+    Returns the compressor of the fixture files of this process, with
+    --output-compression.
+
+    With --output-compression-dictionary, each process trains its own dictionary.
+    """
+    compression = request.config.getoption("output_compression")
+    if compression is None:
+        yield None
+        return
+    dictionary_name: Optional[str] = None
+    if request.config.getoption("output_compression_dictionary"):
+        if hasattr(request.config, "workerinput"):
+            dictionary_name = request.config.workerinput["workerid"]
+        else:
+            dictionary_name = "main"
+    output_dir = Path(request.config.getoption("output"))
+    fixture_file_compressor = FixtureFileCompressor(output_dir, compression, dictionary_name)
+    yield fixture_file_compressor
+    if fixture_writer_thread is None:
+        fixture_file_compressor.close()
+    else:
+        fixture_writer_thread.submit(output_dir, [], fixture_file_compressor.close)
+
+
+@pytest.fixture(scope=get_fixture_collection_scope)
+def fixture_collector(
+    request,
+    fixture_verifier: Optional[FixtureVerifier],
+    fill_manifest: Optional[FillManifest],
+    fixture_writer_thread: Optional[FixtureWriterThread],
+    fixture_shard_writer: Optional[FixtureShardWriter],
+    fixture_file_compressor: Optional[FixtureFileCompressor],
 ):
     """
     Returns the configured fixture collector instance used for all tests
@@ -495,11 +1398,15 @@ def fixture_collector(
     fixture_collector = FixtureCollector(
         output_dir=request.config.getoption("output"),
         flat_output=request.config.getoption("flat_output"),
+        fill_manifest=fill_manifest,
+        fixture_writer_thread=fixture_writer_thread,
+        fixture_shard_writer=fixture_shard_writer,
+        fixture_file_compressor=fixture_file_compressor,
     )
     yield fixture_collector
     fixture_collector.dump_fixtures()
-    if do_fixture_verification:
-        fixture_collector.verify_fixture_files(evm_fixture_verification)
+    if fixture_verifier is not None:
+        fixture_collector.verify_fixture_files(fixture_verifier)
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -690,6 +1597,61 @@ def pytest_make_parametrize_id(config, val, argname):
     return f"{argname}_{val}"
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Pytest hook called to create the report of each phase of a test; records whether the
+    test failed before its teardown.
+
+    With the fixture writer thread, the teardown fails if writing the fixture file of the
+    test is known to have failed. The teardown does not wait for the fixture to be
+    written, so that writing overlaps with the next tests: the failures found after the
+    teardown are reported at the end of the session.
+    """
+    fixture_writer_thread = (getattr(item, "funcargs", None) or {}).get("fixture_writer_thread")
+    outcome = yield
+    report = outcome.get_result()
+    if report.when in ("setup", "call") and report.failed:
+        item.stash[test_failed_key] = True
+    if report.when == "teardown" and report.passed and fixture_writer_thread is not None:
+        error = fixture_writer_thread.pop_error(item.nodeid)
+        if error is not None:
+            report.outcome = "failed"
+            report.longrepr = error
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """
+    Pytest hook called to call a test function.
+
+    With --incremental, the test function is not called if the fingerprint of the test
+    matches the manifest: the fixture recorded in the manifest is emitted instead. Tests
+    are always filled when debug output or traces are requested, as those are side
+    effects of filling.
+    """
+    fill_manifest = pyfuncitem.funcargs.get("fill_manifest")
+    if fill_manifest is None or "fixture_format" not in pyfuncitem.funcargs:
+        return None
+    fingerprint = fill_manifest.fingerprint(
+        pyfuncitem.module,
+        pyfuncitem.nodeid,
+        fork=pyfuncitem.funcargs["fork"].name(),
+        fixture_format=pyfuncitem.funcargs["fixture_format"].value,
+    )
+    pyfuncitem.stash[fill_fingerprint_key] = fingerprint
+    config = pyfuncitem.config
+    if config.getoption("base_dump_dir") or config.getoption("evm_collect_traces"):
+        return None
+    entry = fill_manifest.get(Path(pyfuncitem.path), pyfuncitem.nodeid, fingerprint)
+    if entry is None:
+        return None
+    pyfuncitem.funcargs["fixture_collector"].add_fixture_json(
+        pyfuncitem, entry["fixture"], FixtureFormats(entry["fixture_format"])
+    )
+    return True
+
+
 def pytest_runtest_call(item):
     """
     Pytest hook called in the context of test execution.
@@ -0,0 +1,127 @@
+"""
+Test the compressed fixture output.
+"""
+
+from functools import partial
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from evm_transition_tool import json_codec
+from pytest_plugins.test_filler.fixture_compression import (
+    DICTIONARY_GLOB,
+    FixtureFileCompressor,
+    FixtureFileReader,
+    find_fixture_files,
+)
+from pytest_plugins.test_filler.fixture_writer import JSONObjectWriter
+
+
+def fixtures(file_number: int, count: int = 4):  # noqa: D103
+    return {
+        f"tests/test_{file_number}.py::test_{file_number}[fork_Cancun-n_{n}]": {
+            "_info": {"comment": "`fill` fixture"},
+            "network": "Cancun",
+            "pre": {f"0x{n:040x}": {"balance": f"0x{file_number:x}", "code": "0x6000" * n}},
+        }
+        for n in range(count)
+    }
+
+
+def write_fixture_files(
+    compressor: FixtureFileCompressor, output_dir: Path, files: int, written: List[int]
+) -> None:
+    """
+    Writes fixture files with the compressor, recording the files that were written.
+    """
+    for file_number in range(files):
+        fixture_path = output_dir / "cancun" / f"test_{file_number}.json"
+        fixture_path.parent.mkdir(parents=True, exist_ok=True)
+        writer = JSONObjectWriter(compressor.open(fixture_path))
+        for nodeid, fixture in fixtures(file_number).items():
+            writer.add(nodeid, fixture)
+        writer.close()
+        compressor.when_written(fixture_path, partial(written.append, file_number))
+
+
+@pytest.mark.parametrize("compression,suffix", [("gzip", ".gz"), ("zstd", ".zst")])
+def test_compressed_fixture_files(tmp_path: Path, compression: str, suffix: str):
+    """
+    Test that the compressed fixture files decompress to the uncompressed JSON, and that
+    they are written immediately without a dictionary.
+    """
+    written: List[int] = []
+    compressor = FixtureFileCompressor(tmp_path, compression)
+    write_fixture_files(compressor, tmp_path, 2, written)
+    assert written == [0, 1]
+    compressor.close()
+
+    fixture_paths = find_fixture_files(tmp_path)
+    assert fixture_paths == [tmp_path / "cancun" / f"test_{n}.json{suffix}" for n in range(2)]
+    reader = FixtureFileReader(tmp_path)
+    for file_number, fixture_path in enumerate(fixture_paths):
+        assert reader.read(fixture_path) == json_codec.encode(
+            fixtures(file_number), indent=4, ensure_ascii=True
+        )
+
+
+def test_compression_dictionary(tmp_path: Path):
+    """
+    Test that the files are held until the dictionary is trained, that they are
+    compressed with it, and that they can be read with the dictionary.
+    """
+    written: List[int] = []
+    compressor = FixtureFileCompressor(tmp_path, "zstd", "gw0", dictionary_samples=200)
+    write_fixture_files(compressor, tmp_path, 30, written)
+    assert written == []
+    assert not list(tmp_path.rglob("*.zst"))
+    write_fixture_files(compressor, tmp_path / "more", 30, written)
+    assert written == list(range(30)) + list(range(30))
+    compressor.close()
+
+    assert [path.name for path in tmp_path.glob(DICTIONARY_GLOB)] == ["dictionary-gw0.zdict"]
+    reader = FixtureFileReader(tmp_path)
+    fixture_paths = find_fixture_files(tmp_path)
+    assert len(fixture_paths) == 60
+    for fixture_path in fixture_paths:
+        file_number = int(fixture_path.name.split("_")[1].split(".")[0])
+        assert json_codec.decode(reader.read(fixture_path)) == fixtures(file_number)
+    with pytest.raises(Exception, match="not found"):
+        FixtureFileReader(tmp_path / "cancun").read(fixture_paths[0])
+
+
+def test_compression_dictionary_sample_size(tmp_path: Path):
+    """
+    Test that the dictionary is trained once the writes reach the maximum sample size,
+    so that only the sample is held in memory.
+    """
+    written: List[int] = []
+    compressor = FixtureFileCompressor(
+        tmp_path, "zstd", "gw0", dictionary_samples=10**6, dictionary_sample_size=26 * 1024
+    )
+    write_fixture_files(compressor, tmp_path, 30, written)
+    assert compressor.trained
+    assert compressor.dictionary is not None
+    assert written == list(range(30))
+    compressor.close()
+    reader = FixtureFileReader(tmp_path)
+    for file_number, fixture_path in enumerate(
+        tmp_path / "cancun" / f"test_{n}.json.zst" for n in range(30)
+    ):
+        assert json_codec.decode(reader.read(fixture_path)) == fixtures(file_number)
+
+
+def test_compression_dictionary_too_few_fixtures(tmp_path: Path):
+    """
+    Test that the files are written without a dictionary when training fails.
+    """
+    written: List[int] = []
+    compressor = FixtureFileCompressor(tmp_path, "zstd", "main")
+    write_fixture_files(compressor, tmp_path, 1, written)
+    assert written == []
+    compressor.close()
+    assert written == [0]
+    assert not list(tmp_path.glob(DICTIONARY_GLOB))
+    (fixture_path,) = find_fixture_files(tmp_path)
+    assert json_codec.decode(FixtureFileReader(tmp_path).read(fixture_path)) == fixtures(0)
@@ -0,0 +1,57 @@
+"""
+Test the sharded fixture output.
+"""
+
+from pathlib import Path
+
+from evm_transition_tool import json_codec
+from pytest_plugins.test_filler.fixture_shards import FixtureShardReader, FixtureShardWriter
+
+
+def fixture(n: int):  # noqa: D103
+    return {"_info": {"comment": "é" * n}, "network": "Cancun", "blocks": [{"n": n}]}
+
+
+def test_fixture_shards(tmp_path: Path):
+    """
+    Test that the fixtures of every writer can be read back, and that a new shard is
+    started when the current one would exceed the maximum shard size.
+    """
+    # The first shard of the first writer is filled by its first two fixtures
+    max_shard_size = sum(len(json_codec.encode(fixture(n), ensure_ascii=True)) + 1 for n in (0, 2))
+    writers = [FixtureShardWriter(tmp_path, name, max_shard_size) for name in ("gw0", "gw1")]
+    for n in range(6):
+        writers[n % 2].add(
+            f"test_a[fork_Cancun-n_{n}]", "cancun/test_a.json", "blockchain_test", fixture(n)
+        )
+    for writer in writers:
+        writer.close()
+
+    assert sorted(path.name for path in tmp_path.glob("shard-gw0-*.jsonl")) == [
+        "shard-gw0-00000.jsonl",
+        "shard-gw0-00001.jsonl",
+    ]
+    with FixtureShardReader(tmp_path) as reader:
+        assert sorted(reader.nodeids()) == [f"test_a[fork_Cancun-n_{n}]" for n in range(6)]
+        for n in range(6):
+            nodeid = f"test_a[fork_Cancun-n_{n}]"
+            entry = reader.entry(nodeid)
+            assert (entry["fixture"], entry["format"]) == ("cancun/test_a.json", "blockchain_test")
+            assert entry["shard"].startswith(f"shard-gw{n % 2}-")
+            assert reader.read(nodeid) == fixture(n)
+
+    shard_lines = (tmp_path / "shard-gw0-00000.jsonl").read_bytes().splitlines()
+    assert [json_codec.decode(line) for line in shard_lines] == [fixture(0), fixture(2)]
+
+
+def test_fixture_shard_single_fixture_over_max_size(tmp_path: Path):
+    """
+    Test that a fixture larger than the maximum shard size gets a shard of its own.
+    """
+    writer = FixtureShardWriter(tmp_path, "main", max_shard_size=1)
+    writer.add("test_a", "test_a.json", "blockchain_test", fixture(1))
+    writer.add("test_b", "test_b.json", "blockchain_test", fixture(2))
+    writer.close()
+    with FixtureShardReader(tmp_path) as reader:
+        assert [reader.entry(nodeid)["offset"] for nodeid in ("test_a", "test_b")] == [0, 0]
+        assert reader.read("test_b") == fixture(2)
@@ -0,0 +1,120 @@
+"""
+Test the incremental writing of the fixture files.
+"""
+
+import io
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from evm_transition_tool import json_codec
+from pytest_plugins.test_filler.fixture_writer import FixtureWriterThread, JSONObjectWriter
+
+
+class RetainedBytesIO(io.BytesIO):
+    """
+    Keeps the written bytes available after the file is closed.
+    """
+
+    def close(self):  # noqa: D102
+        self.contents = self.getvalue()
+        super().close()
+
+
+@pytest.mark.parametrize(
+    "members",
+    [
+        {},
+        {"test_a[fork_Cancun]": {}},
+        {
+            "test_a[fork_Cancun]": {"_info": {"comment": "é\n"}, "blocks": [{"a": [1, []]}]},
+            "test_a[fork_Shanghai]": {"pre": {"0x00": {"storage": {}}}, "network": "Shanghai"},
+        },
+    ],
+)
+def test_json_object_writer(members: Dict[str, Any]):
+    """
+    Test that the output is byte-identical to the encoding of the whole object.
+    """
+    file = RetainedBytesIO()
+    writer = JSONObjectWriter(file)
+    for key, value in members.items():
+        writer.add(key, value)
+    writer.close()
+    assert file.contents == json_codec.encode(members, indent=4, ensure_ascii=True)
+
+
+def test_json_object_writer_replaces_member():
+    """
+    Test that adding a member with the same key as the previous member replaces it.
+    """
+    file = RetainedBytesIO()
+    writer = JSONObjectWriter(file)
+    writer.add("a", 1)
+    writer.add("b", 2)
+    writer.add("b", 3)
+    writer.close()
+    assert file.contents == json_codec.encode({"a": 1, "b": 3}, indent=4, ensure_ascii=True)
+
+
+def test_fixture_writer_thread():
+    """
+    Test that tasks run in order, that the tasks of a file are skipped after one of
+    them failed, and that failures are reported with the tests of the file when the
+    thread is closed.
+    """
+    done: List[str] = []
+
+    def fail():
+        raise OSError("No space left on device")
+
+    writer_thread = FixtureWriterThread(max_queued=1)
+    writer_thread.submit(Path("a.json"), ["test_a"], lambda: done.append("a1"))
+    writer_thread.submit(Path("b.json"), ["test_b1", "test_b2"], fail)
+    writer_thread.submit(Path("b.json"), ["test_b1", "test_b2"], lambda: done.append("b2"))
+    writer_thread.submit(Path("a.json"), ["test_a"], lambda: done.append("a2"))
+    try:
+        writer_thread.close()
+    except Exception as e:
+        assert str(e) == (
+            "Writing fixture files failed:\n"
+            "b.json (fixtures of test_b1, test_b2): No space left on device"
+        )
+    else:
+        raise AssertionError("expected the write failure to be reported")
+    assert done == ["a1", "a2"]
+
+
+def test_fixture_writer_thread_errors_by_test():
+    """
+    Test that a write failure is returned once for each test whose fixture is in the
+    failed file, including the tests of the tasks skipped after the failure, and that
+    only the failures not returned for their tests are reported when the thread is
+    closed.
+    """
+
+    def fail():
+        raise OSError("No space left on device")
+
+    writer_thread = FixtureWriterThread(max_queued=1)
+    assert writer_thread.pop_error("test_1") is None
+    writer_thread.submit(Path("a.json"), ["test_1", "test_2"], fail)
+    writer_thread.flush()
+    assert writer_thread.pop_error("test_2") == (
+        "Writing fixture file a.json failed: No space left on device"
+    )
+    assert writer_thread.pop_error("test_2") is None
+    assert writer_thread.pop_error("test_other") is None
+    writer_thread.submit(Path("a.json"), ["test_1", "test_2", "test_3"], lambda: None)
+    writer_thread.flush()
+    assert writer_thread.pop_error("test_3") is not None
+    try:
+        writer_thread.close()
+    except Exception as e:
+        assert str(e) == (
+            "Writing fixture files failed:\n"
+            "a.json (fixtures of test_1): No space left on device"
+        )
+    else:
+        raise AssertionError("expected the write failure to be reported")
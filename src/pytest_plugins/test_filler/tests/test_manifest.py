@@ -0,0 +1,97 @@
+"""
+Test the manifest of the fixtures used by `fill --incremental`.
+"""
+
+import importlib
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from pytest_plugins.test_filler.manifest import FillManifest, module_source_files
+
+PACKAGE = "manifest_test_eip"
+
+SOURCES = {
+    "conftest.py": "",
+    f"{PACKAGE}/__init__.py": "",
+    f"{PACKAGE}/conftest.py": "",
+    f"{PACKAGE}/spec.py": "class Spec:\n    VALUE = 1\n",
+    f"{PACKAGE}/common.py": "from .spec import Spec\n\n\ndef helper():\n    return Spec.VALUE\n",
+    f"{PACKAGE}/unused.py": "",
+    f"{PACKAGE}/test_eip.py": textwrap.dedent(
+        """\
+        import pytest
+
+        from .common import helper
+
+
+        def test_eip():
+            assert helper() == 1
+        """
+    ),
+}
+
+
+@pytest.fixture
+def test_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Returns a test module that imports a helper module, which imports a spec module.
+    """
+    for name, source in SOURCES.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module(f"{PACKAGE}.test_eip")
+    for module_name in list(sys.modules):
+        if module_name.startswith(PACKAGE):
+            del sys.modules[module_name]
+
+
+def test_module_source_files(tmp_path: Path, test_module):
+    """
+    Test that the helper modules imported directly or indirectly by a test module, and
+    the conftest files of its directory and parents, are part of its sources.
+    """
+    assert [
+        str(path.relative_to(tmp_path)) for path in module_source_files(test_module, tmp_path)
+    ] == [
+        "conftest.py",
+        f"{PACKAGE}/common.py",
+        f"{PACKAGE}/conftest.py",
+        f"{PACKAGE}/spec.py",
+        f"{PACKAGE}/test_eip.py",
+    ]
+
+
+def test_manifest(tmp_path: Path, test_module):
+    """
+    Test that recorded fixtures are returned while the fingerprint of the test does not
+    change, and that a change to a helper module changes the fingerprint.
+    """
+    module_path = Path(test_module.__file__)
+    nodeid = f"{PACKAGE}/test_eip.py::test_eip[fork_Cancun]"
+    fixture = {"_info": {"comment": "fixture"}, "network": "Cancun"}
+
+    def new_manifest() -> FillManifest:
+        return FillManifest(tmp_path / "manifest", tmp_path, session_fingerprint={"t8n": "1"})
+
+    manifest = new_manifest()
+    fingerprint = manifest.fingerprint(test_module, nodeid, fork="Cancun")
+    assert manifest.get(module_path, nodeid, fingerprint) is None
+    manifest.record(module_path, nodeid, fingerprint, "blockchain_test", fixture)
+    manifest.flush()
+    assert (tmp_path / "manifest" / PACKAGE / "test_eip.json").is_file()
+
+    manifest = new_manifest()
+    assert manifest.fingerprint(test_module, nodeid, fork="Cancun") == fingerprint
+    assert manifest.fingerprint(test_module, nodeid, fork="Shanghai") != fingerprint
+    entry = manifest.get(module_path, nodeid, fingerprint)
+    assert entry is not None
+    assert (entry["fixture_format"], entry["fixture"]) == ("blockchain_test", fixture)
+
+    (tmp_path / PACKAGE / "unused.py").write_text("# not imported by the test")
+    assert new_manifest().fingerprint(test_module, nodeid, fork="Cancun") == fingerprint
+    (tmp_path / PACKAGE / "spec.py").write_text("class Spec:\n    VALUE = 2\n")
+    assert new_manifest().fingerprint(test_module, nodeid, fork="Cancun") != fingerprint
@@ -8,6 +8,9 @@ from pathlib import Path
 
 import pytest
 
+from pytest_plugins.test_filler.fixture_compression import FixtureFileReader, find_fixture_files
+from pytest_plugins.test_filler.fixture_shards import FixtureShardReader
+
 
 def get_all_files_in_directory(base_dir):  # noqa: D103
     base_path = Path(base_dir)
@@ -84,6 +87,17 @@ test_count = test_count_merge + test_count_shanghai
             [2, 2, 2, 6],
             id="default-args",
         ),
+        pytest.param(
+            ["--output-queue-size", "0"],
+            [
+                Path("fixtures/merge/module_merge/merge_one.json"),
+                Path("fixtures/merge/module_merge/merge_two.json"),
+                Path("fixtures/shanghai/module_shanghai/shanghai_one.json"),
+                Path("fixtures/shanghai/module_shanghai/shanghai_two.json"),
+            ],
+            [2, 2, 2, 6],
+            id="no-writer-thread",
+        ),
         pytest.param(
             ["--flat-output"],
             [
@@ -264,3 +278,105 @@ def test_fixture_output_based_on_command_line_args(
     assert set(all_files) == set(
         expected_fixture_files
     ), f"Unexpected files in directory: {set(all_files) - set(expected_fixture_files)}"
+
+
+def test_incremental_fill(testdir):
+    """
+    Test that with --incremental, the fixtures of the tests of unchanged modules are
+    re-emitted from the manifest, and the tests of changed modules are filled again.
+    """
+    tests_dir = testdir.mkdir("tests")
+    tests_dir.mkdir("merge").join("test_module_merge.py").write(test_module_merge)
+    shanghai_test_module = tests_dir.mkdir("shanghai").join("test_module_shanghai.py")
+    shanghai_test_module.write(test_module_shanghai)
+    testdir.copy_example(name="pytest.ini")
+
+    result = testdir.runpytest("--incremental")
+    result.assert_outcomes(passed=test_count)
+    filled_fixtures = {
+        fixture_file: fixture_file.read_bytes()
+        for fixture_file in Path("fixtures").rglob("*.json")
+    }
+    manifest_files = sorted(Path(".fill_manifest").rglob("*.json"))
+    assert manifest_files == [
+        Path(".fill_manifest/merge/test_module_merge.json"),
+        Path(".fill_manifest/shanghai/test_module_shanghai.json"),
+    ]
+
+    # Mark the recorded fixtures to tell the re-emitted fixtures from the filled ones
+    for manifest_file in manifest_files:
+        entries = json.loads(manifest_file.read_text())
+        assert len(entries) == (test_count_merge if "merge" in str(manifest_file) else 8)
+        for entry in entries.values():
+            entry["fixture"]["from_manifest"] = True
+        manifest_file.write_text(json.dumps(entries))
+    shanghai_test_module.write(test_module_shanghai + "\n# changed\n")
+
+    result = testdir.runpytest("--incremental")
+    result.assert_outcomes(passed=test_count)
+    for fixture_file, filled_fixture in filled_fixtures.items():
+        fixtures = json.loads(fixture_file.read_text())
+        if "merge" in str(fixture_file):
+            assert all(fixture.pop("from_manifest") for fixture in fixtures.values())
+            assert fixtures == json.loads(filled_fixture)
+        else:
+            assert fixture_file.read_bytes() == filled_fixture
+
+
+@pytest.mark.parametrize("args", [[], ["--output-queue-size=0"], ["-n", "2"]])
+def test_sharded_output(testdir, args):
+    """
+    Test that with --sharded-output, each fixture can be read from the shards, and is
+    equal to the fixture written to the JSON files without it.
+    """
+    tests_dir = testdir.mkdir("tests")
+    tests_dir.mkdir("merge").join("test_module_merge.py").write(test_module_merge)
+    tests_dir.mkdir("shanghai").join("test_module_shanghai.py").write(test_module_shanghai)
+    testdir.copy_example(name="pytest.ini")
+
+    result = testdir.runpytest("--output=json_fixtures")
+    result.assert_outcomes(passed=test_count)
+    result = testdir.runpytest("--sharded-output", *args)
+    result.assert_outcomes(passed=test_count)
+    assert not list(Path("fixtures").rglob("*.json"))
+
+    with FixtureShardReader(Path("fixtures") / "shards") as reader:
+        assert len(reader.nodeids()) == test_count
+        for nodeid in reader.nodeids():
+            entry = reader.entry(nodeid)
+            fixtures = json.loads((Path("json_fixtures") / entry["fixture"]).read_text())
+            assert reader.read(nodeid) == fixtures[nodeid]
+
+
+@pytest.mark.parametrize(
+    "args,suffix",
+    [
+        (["--output-compression=gzip"], ".gz"),
+        (["--output-compression=zstd"], ".zst"),
+        (["--output-compression=zstd", "--output-compression-dictionary", "-n", "2"], ".zst"),
+    ],
+)
+def test_compressed_output(testdir, args, suffix):
+    """
+    Test that with --output-compression, each fixture file is compressed and decompresses
+    to the file written without it.
+    """
+    tests_dir = testdir.mkdir("tests")
+    tests_dir.mkdir("merge").join("test_module_merge.py").write(test_module_merge)
+    tests_dir.mkdir("shanghai").join("test_module_shanghai.py").write(test_module_shanghai)
+    testdir.copy_example(name="pytest.ini")
+
+    result = testdir.runpytest("--output=json_fixtures")
+    result.assert_outcomes(passed=test_count)
+    result = testdir.runpytest(*args)
+    result.assert_outcomes(passed=test_count)
+
+    json_fixture_files = sorted(Path("json_fixtures").rglob("*.json"))
+    fixture_files = find_fixture_files(Path("fixtures"))
+    assert fixture_files == [
+        Path("fixtures") / f"{path.relative_to('json_fixtures')}{suffix}"
+        for path in json_fixture_files
+    ]
+    reader = FixtureFileReader(Path("fixtures"))
+    for json_fixture_file, fixture_file in zip(json_fixture_files, fixture_files):
+        assert json.loads(reader.read(fixture_file)) == json.loads(json_fixture_file.read_text())
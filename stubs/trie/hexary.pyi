@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import ContextManager, Dict
 
 
 class HexaryTrie:
@@ -7,3 +7,4 @@ class HexaryTrie:
 
     def __init__(self, db: Dict) -> None: ...
     def set(self, key: bytes, value: bytes) -> None: ...
+    def squash_changes(self) -> ContextManager["HexaryTrie"]: ...